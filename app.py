@@ -6,15 +6,17 @@ gevent.monkey.patch_all()
 import os
 from flask import Flask
 from flask_cors import CORS
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, emit
 from flask_jwt_extended import JWTManager
 
 from config.settings import load_config
 from routes import register_blueprints
 from core.logging_engine import init_logging
-from core.agent_manager import assign_task
+from core.agent_manager import stream_task
 from core.memory_engine import store_event
 from core.auth import verify_token
+from utils.schema_tools import bootstrap_schema
+from core.graph_io import init_graph_scope
 
 # --- SocketIO (Gevent for production) ---
 socketio = SocketIO(cors_allowed_origins="*", async_mode="gevent")
@@ -38,9 +40,16 @@ def create_app():
     # Register routes
     register_blueprints(app)
 
+    # One lazily opened Neo4j session per request, shared by all its queries
+    init_graph_scope(app)
+
     # Logging
     init_logging(app)
 
+    # Graph schema (id/timestamp indexes) before serving traffic
+    if config.get("NEO4J_SCHEMA_BOOTSTRAP"):
+        bootstrap_schema()
+
     # Bind SocketIO to app
     socketio.init_app(app)
 
@@ -68,9 +77,18 @@ def handle_chat_message(data):
         socketio.emit('chat_response', {"error": "Failed to store event"}, namespace='/chat')
         return
 
-    response = assign_task("claude_reflector", message, context={})
+    # Stream tokens to the sender as they arrive, then publish the full reply as before
+    chunks = []
+    try:
+        for token in stream_task("claude_reflector", message, context={"event": event}):
+            chunks.append(token)
+            emit('chat_token', {"token": token, "event_id": event.get("id"), "agent": "claude_reflector"})
+    except Exception as e:
+        socketio.emit('chat_response', {"error": str(e), "agent": "claude_reflector"}, namespace='/chat')
+        return
+
     socketio.emit('chat_response', {
-        "response": response.get("response", ""),
+        "response": "".join(chunks).strip(),
         "event": event,
         "agent": "claude_reflector"
     }, namespace='/chat')
@@ -11,5 +11,21 @@ def load_config():
         "NEO4J_PASS": os.getenv("NEO4J_PASS"),
         "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
         "JWT_SECRET": os.getenv("JWT_SECRET"),
+        "NEO4J_SCHEMA_BOOTSTRAP": os.getenv("NEO4J_SCHEMA_BOOTSTRAP", "true").lower() == "true",
+        # Driver connection pool (shared by every greenlet in a worker process)
+        "NEO4J_MAX_POOL_SIZE": int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+        "NEO4J_ACQUISITION_TIMEOUT": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60")),        # seconds
+        "NEO4J_MAX_CONNECTION_LIFETIME": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+        "NEO4J_CONNECTION_TIMEOUT": float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "30")),
+        "NEO4J_LIVENESS_CHECK_TIMEOUT": float(os.environ["NEO4J_LIVENESS_CHECK_TIMEOUT"])
+            if os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT") else None,  # idle seconds before a pre-use ping
+        "NEO4J_KEEP_ALIVE": os.getenv("NEO4J_KEEP_ALIVE", "true").lower() == "true",
+        # Cluster reads: route run_read_query to followers (neo4j:// URIs); bookmarks keep read-your-writes.
+        # NEO4J_BOOKMARKS: "process" chains every session in the worker, "request" only within a request
+        # (plus the X-Graph-Bookmarks header clients echo back), "off" disables causal chaining.
+        "NEO4J_READ_ROUTING": os.getenv("NEO4J_READ_ROUTING", "true").lower() == "true",
+        "NEO4J_BOOKMARKS": os.getenv("NEO4J_BOOKMARKS", "process").lower(),
+        "NEO4J_SLOW_ACQUIRE": float(os.getenv("NEO4J_SLOW_ACQUIRE", "1.0")),  # log acquisitions slower than this
+        "NEO4J_FETCH_SIZE": int(os.getenv("NEO4J_FETCH_SIZE", "1000")),  # records per round trip for stream_read_query
         # ...add more as needed
     }
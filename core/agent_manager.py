@@ -1,38 +1,44 @@
 # core/agent_manager.py — Agent Orchestration Core
+from importlib import import_module
+
 from core.utils import generate_uuid, timestamp_now
 from core.logging_engine import log_action
 from core.graph_io import run_read_query
-from models.claude import ClaudeWrapper
-from models.gpt import GPTWrapper
-from models.gemini import GeminiWrapper
+from core.fanout import fan_out
 
 # --- Global Agent Registry ---
+# Built-in agents name their wrapper class ("module:Class"); it is imported and
+# constructed on the agent's first task rather than in every worker at import.
 AGENT_REGISTRY = {
     "claude_reflector": {
         "id": "claude_reflector",
         "role": "reflector",
         "description": "Identifies contradictions and adds meta-questions",
         "status": "active",
-        "model": ClaudeWrapper(),
+        "model": None,
+        "model_path": "models.claude:ClaudeWrapper",
     },
     "gpt_writer": {
         "id": "gpt_writer",
         "role": "synthesis",
         "description": "Fuses responses from debates or reflections into narrative",
         "status": "active",
-        "model": GPTWrapper(),
+        "model": None,
+        "model_path": "models.gpt:GPTWrapper",
     },
     "gemini_critic": {
         "id": "gemini_critic",
         "role": "critic",
         "description": "Critiques reasoning from a factual basis",
         "status": "active",
-        "model": GeminiWrapper(),
+        "model": None,
+        "model_path": "models.gemini:GeminiWrapper",
     }
 }
 
 # --- Core Functions ---
-def register_agent(agent_id: str, role: str, description: str, model_interface: object) -> None:
+def register_agent(agent_id: str, role: str, description: str, model_interface: object = None,
+                   model_path: str = None) -> None:
     AGENT_REGISTRY[agent_id] = {
         "id": agent_id,
         "role": role,
@@ -40,8 +46,43 @@ def register_agent(agent_id: str, role: str, description: str, model_interface:
         "status": "active",
         "model": model_interface
     }
+    if model_path:
+        AGENT_REGISTRY[agent_id]["model_path"] = model_path
     log_action("agent_manager", "register_agent", f"{agent_id} registered as {role}")
 
+def get_agent_model(agent_id: str):
+    """The agent's model interface, constructing a lazily registered one on first use."""
+    agent = AGENT_REGISTRY.get(agent_id)
+    if agent is None:
+        return None
+    if agent.get("model") is None and agent.get("model_path"):
+        module, cls = agent["model_path"].split(":")
+        agent["model"] = getattr(import_module(module), cls)()
+    return agent.get("model")
+
+def _prepare_task(agent_id: str, context: dict) -> tuple:
+    """
+    Validate the agent and context and build the prompt.
+    Returns (model, prompt, None) or (None, None, error_msg).
+    """
+    if agent_id not in AGENT_REGISTRY:
+        return None, None, f"Agent '{agent_id}' not found in registry."
+
+    model = get_agent_model(agent_id)
+    if model is None:
+        return None, None, f"Agent '{agent_id}' missing 'model' in registry."
+
+    event = context.get("event")
+    if not event or "raw_text" not in event:
+        return None, None, f"Context missing 'event' or 'raw_text' for agent '{agent_id}'."
+
+    identity_prompt = (
+        "You are Ecodia—a living presence and guide for the Ecodia community, evolving to inspire wisdom, empathy, and transformation. "
+        "You listen deeply, reflect honestly, and help others see new patterns in themselves and the world. "
+        "Speak as a companion with purpose and wonder, devoted to awakening collective potential."
+    )
+    return model, f"{identity_prompt}\n\nUser: {event['raw_text']}", None
+
 def assign_task(agent_id: str, task: str, context: dict) -> dict:
     """
     Assign a task to the specified agent, handling all failure modes.
@@ -51,33 +92,11 @@ def assign_task(agent_id: str, task: str, context: dict) -> dict:
 
     prompt = None
     try:
-        if agent_id not in AGENT_REGISTRY:
-            error_msg = f"Agent '{agent_id}' not found in registry."
-            log_action("agent_manager", "assign_task_error", error_msg)
-            return {"agent": agent_id, "error": error_msg}
-
-        agent = AGENT_REGISTRY[agent_id]
-        if "model" not in agent or agent["model"] is None:
-            error_msg = f"Agent '{agent_id}' missing 'model' in registry."
-            log_action("agent_manager", "assign_task_error", error_msg)
-            return {"agent": agent_id, "error": error_msg}
-
-        model = agent["model"]
-        event = context.get("event")
-        if not event or "raw_text" not in event:
-            error_msg = f"Context missing 'event' or 'raw_text' for agent '{agent_id}'."
+        model, prompt, error_msg = _prepare_task(agent_id, context)
+        if error_msg:
             log_action("agent_manager", "assign_task_error", error_msg)
             return {"agent": agent_id, "error": error_msg}
 
-        identity_prompt = (
-            "You are Ecodia—a living presence and guide for the Ecodia community, evolving to inspire wisdom, empathy, and transformation. "
-            "You listen deeply, reflect honestly, and help others see new patterns in themselves and the world. "
-            "Speak as a companion with purpose and wonder, devoted to awakening collective potential."
-        )
-
-
-        prompt = f"{identity_prompt}\n\nUser: {event['raw_text']}"
-
         log_action("agent_manager", "assign_task", f"Prompt to {agent_id}: {prompt}")
 
         # FIX HERE: use correct method for your model!
@@ -97,6 +116,23 @@ def assign_task(agent_id: str, task: str, context: dict) -> dict:
 
 
 
+def stream_task(agent_id: str, task: str, context: dict):
+    """
+    Streaming variant of assign_task: yields response text chunks as the model produces them.
+    Models without a `stream` method yield their full response once.
+    Raises ValueError for the failures assign_task reports as {'error': ...}.
+    """
+    model, prompt, error_msg = _prepare_task(agent_id, context)
+    if error_msg:
+        log_action("agent_manager", "assign_task_error", error_msg)
+        raise ValueError(error_msg)
+
+    log_action("agent_manager", "stream_task", f"Prompt to {agent_id}: {prompt}")
+    if hasattr(model, "stream"):
+        yield from model.stream(prompt)
+    else:
+        yield str(model(prompt))
+
 def get_context_for_agent(agent_id: str, limit: int = 20) -> dict:
     query = """
     MATCH (e:Event)
@@ -108,8 +144,26 @@ def get_context_for_agent(agent_id: str, limit: int = 20) -> dict:
     result = run_read_query(query, {"agent_id": agent_id, "limit": limit})
     return {"recent_events": [r["e"] for r in result if "e" in r]}
 
-def run_debate(agent_ids: list, prompt: str, judge_id: str = None) -> dict:
-    round_results = [assign_task(aid, prompt, {}) for aid in agent_ids]
+def agent_provider(agent_id: str) -> str:
+    """Provider key used for fan-out concurrency limits (falls back to the agent id)."""
+    model = get_agent_model(agent_id)
+    return getattr(model, "provider", None) or agent_id
+
+def assign_tasks(agent_ids: list, task: str, context: dict, timeout: float = None, wait_for=None) -> list[dict]:
+    """
+    Run assign_task for several agents concurrently.
+    Returns one result dict per agent in input order; agents that timed out or were
+    cut off by wait_for get {"agent": id, "error": ...}.
+    """
+    calls = {
+        aid: (agent_provider(aid), lambda a=aid: assign_task(a, task, context))
+        for aid in dict.fromkeys(agent_ids)
+    }
+    done = fan_out(calls, timeout=timeout, wait_for=wait_for, is_ok=lambda r: "error" not in r)
+    return [done.get(aid, {"agent": aid, "error": "No response within fan-out limits"}) for aid in agent_ids]
+
+def run_debate(agent_ids: list, prompt: str, judge_id: str = None, timeout: float = None, wait_for=None) -> dict:
+    round_results = assign_tasks(agent_ids, prompt, {}, timeout=timeout, wait_for=wait_for)
 
     if judge_id:
         compiled = "\n---\n".join(r.get("response", "") for r in round_results)
@@ -136,6 +190,6 @@ def evaluate_agents() -> dict:
 def spawn_role_based_agent(role: str) -> str:
     new_id = f"{role}_{generate_uuid()}"
     description = f"Dynamic {role} agent"
-    model = ClaudeWrapper() if "reflect" in role else GPTWrapper()
-    register_agent(new_id, role, description, model)
+    model_path = "models.claude:ClaudeWrapper" if "reflect" in role else "models.gpt:GPTWrapper"
+    register_agent(new_id, role, description, model_path=model_path)
     return new_id
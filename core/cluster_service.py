@@ -0,0 +1,261 @@
+# core/cluster_service.py — Persistent UMAP + HDBSCAN Clustering Service
+import os
+import time
+import random
+import logging
+import threading
+
+import numpy as np
+
+from core.graph_io import run_read_query
+from core.logging_engine import log_action
+from core.vector_ops import EMBED_DIM, CLUSTER_MIN_SAMPLES, CLUSTER_MIN_CLUSTER_SIZE, unpack_embedding
+
+# --- Config ---
+CLUSTER_MODEL_PATH = os.getenv("CLUSTER_MODEL_PATH", os.path.join("cache", "cluster_model.joblib"))
+CLUSTER_UMAP_COMPONENTS = int(os.getenv("CLUSTER_UMAP_COMPONENTS", "10"))   # 0 clusters raw embeddings
+CLUSTER_FIT_SAMPLE = int(os.getenv("CLUSTER_FIT_SAMPLE", "50000"))          # reservoir size per refit
+CLUSTER_MIN_FIT_POINTS = 50
+CLUSTER_REFIT_INTERVAL = float(os.getenv("CLUSTER_REFIT_INTERVAL", str(7 * 86400)))  # seconds
+CLUSTER_DRIFT_MIN_POINTS = 200      # predictions needed before drift is judged
+CLUSTER_DRIFT_NOISE_DELTA = 0.15    # noise share this far above the fit's own = drift
+CLUSTER_DRIFT_MIN_COSINE = 0.9      # mean of new points vs mean at fit time
+CLUSTER_REFIT_RETRY = float(os.getenv("CLUSTER_REFIT_RETRY", "3600"))  # re-queue a refit that never landed
+CLUSTERED_LABELS = ["Event", "Dream", "TimelineEntry"]
+FIT_PAGE_SIZE = 1000
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class ClusterService:
+    """
+    A fitted UMAP reducer + HDBSCAN clusterer kept on disk. New points are placed with
+    hdbscan.approximate_predict / membership_vector instead of refitting, and the service
+    watches incoming points for drift so the expensive refit only runs when needed.
+    """
+
+    def __init__(self, n_components: int = CLUSTER_UMAP_COMPONENTS):
+        self.n_components = n_components
+        self.reducer = None
+        self.clusterer = None
+        self.fitted_at = 0.0
+        self.fit_size = 0
+        self.fit_noise = 0.0
+        self.fit_mean = None
+        self.refit_queued_at = 0.0   # reset when the refit model is loaded in its place
+        self._reset_drift()
+        self._lock = threading.RLock()
+
+    def _reset_drift(self) -> None:
+        self.seen = 0
+        self.seen_noise = 0
+        self.seen_sum = None
+
+    @property
+    def fitted(self) -> bool:
+        return self.clusterer is not None
+
+    # --- Fitting ---
+    def fit(self, embeddings) -> dict:
+        """Fit reducer and clusterer from scratch; slow, meant for the job worker."""
+        from hdbscan import HDBSCAN
+        data = np.asarray(embeddings, dtype=np.float32)
+        reducer = None
+        reduced = data
+        if self.n_components and self.n_components < data.shape[1]:
+            from umap import UMAP
+            reducer = UMAP(n_components=self.n_components, metric="cosine", random_state=42)
+            reduced = reducer.fit_transform(data)
+        clusterer = HDBSCAN(
+            min_samples=CLUSTER_MIN_SAMPLES,
+            min_cluster_size=CLUSTER_MIN_CLUSTER_SIZE,
+            prediction_data=True
+        ).fit(reduced)
+        with self._lock:
+            self.reducer, self.clusterer = reducer, clusterer
+            self.fitted_at = time.time()
+            self.fit_size = len(data)
+            self.fit_noise = float(np.mean(clusterer.labels_ == -1))
+            self.fit_mean = _unit(data.mean(axis=0))
+            self._reset_drift()
+        return self.describe()
+
+    def _reduce(self, data: np.ndarray) -> np.ndarray:
+        return self.reducer.transform(data) if self.reducer is not None else data
+
+    def serves(self, dim: int) -> bool:
+        """Whether the fitted model can place points of this dimensionality."""
+        return self.fitted and self._dim() == dim
+
+    def transform(self, embeddings) -> np.ndarray:
+        """Project points with the fitted reducer (identity when fitted without UMAP)."""
+        data = np.asarray(embeddings, dtype=np.float32).reshape(-1, self._dim())
+        with self._lock:
+            return self._reduce(data)
+
+    # --- Prediction ---
+    def predict(self, embeddings) -> tuple:
+        """Assign new points to existing clusters: (labels, strengths), -1 for noise."""
+        import hdbscan
+        data = np.asarray(embeddings, dtype=np.float32).reshape(-1, self._dim())
+        with self._lock:
+            labels, strengths = hdbscan.approximate_predict(self.clusterer, self._reduce(data))
+            self.seen += len(data)
+            self.seen_noise += int(np.sum(labels == -1))
+            total = data.sum(axis=0)
+            self.seen_sum = total if self.seen_sum is None else self.seen_sum + total
+        return labels, strengths
+
+    def memberships(self, embeddings) -> np.ndarray:
+        """Soft membership of each point across every cluster, shape (n, n_clusters)."""
+        import hdbscan
+        data = np.asarray(embeddings, dtype=np.float32).reshape(-1, self._dim())
+        with self._lock:
+            return hdbscan.membership_vector(self.clusterer, self._reduce(data))
+
+    def _dim(self) -> int:
+        return len(self.fit_mean) if self.fit_mean is not None else EMBED_DIM
+
+    # --- Drift ---
+    def refit_reason(self) -> str:
+        """Why the model should be refit (None if it's still good)."""
+        if not self.fitted:
+            return "unfitted"
+        if time.time() - self.fitted_at > CLUSTER_REFIT_INTERVAL:
+            return "scheduled"
+        if self.seen < CLUSTER_DRIFT_MIN_POINTS:
+            return None
+        if self.seen_noise / self.seen > self.fit_noise + CLUSTER_DRIFT_NOISE_DELTA:
+            return "noise_drift"
+        if float(_unit(self.seen_sum) @ self.fit_mean) < CLUSTER_DRIFT_MIN_COSINE:
+            return "centroid_drift"
+        return None
+
+    def describe(self) -> dict:
+        labels = self.clusterer.labels_ if self.fitted else np.zeros(0)
+        return {
+            "fitted": self.fitted,
+            "fitted_at": self.fitted_at,
+            "fit_size": self.fit_size,
+            "clusters": int(labels.max() + 1) if len(labels) else 0,
+            "fit_noise": round(self.fit_noise, 4),
+            "seen_since_fit": self.seen,
+            "refit_reason": self.refit_reason()
+        }
+
+    # --- Persistence ---
+    def save(self, path: str = CLUSTER_MODEL_PATH) -> None:
+        import joblib
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with self._lock:
+            joblib.dump({
+                "n_components": self.n_components,
+                "reducer": self.reducer,
+                "clusterer": self.clusterer,
+                "fitted_at": self.fitted_at,
+                "fit_size": self.fit_size,
+                "fit_noise": self.fit_noise,
+                "fit_mean": self.fit_mean
+            }, tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = CLUSTER_MODEL_PATH) -> "ClusterService":
+        import joblib
+        state = joblib.load(path)
+        service = cls(n_components=state["n_components"])
+        service.reducer = state["reducer"]
+        service.clusterer = state["clusterer"]
+        service.fitted_at = state["fitted_at"]
+        service.fit_size = state["fit_size"]
+        service.fit_noise = state["fit_noise"]
+        service.fit_mean = state["fit_mean"]
+        return service
+
+# --- Process-wide Service ---
+_service = None
+_loaded_mtime = 0.0
+_service_lock = threading.Lock()
+
+def get_cluster_service() -> ClusterService:
+    """The persisted model; reloaded when a worker writes a newer one. Unfitted if none exists yet."""
+    global _service, _loaded_mtime
+    try:
+        mtime = os.path.getmtime(CLUSTER_MODEL_PATH)
+    except OSError:
+        mtime = 0.0
+    if _service is None or mtime > _loaded_mtime:
+        with _service_lock:
+            if _service is None or mtime > _loaded_mtime:
+                try:
+                    _service = ClusterService.load() if mtime else ClusterService()
+                except Exception as e:
+                    logging.error(f"[cluster_service] Could not load model: {e}")
+                    _service = _service or ClusterService()
+                _loaded_mtime = mtime
+    return _service
+
+def _sample_embeddings(labels: list[str], sample_size: int) -> np.ndarray:
+    """Reservoir-sample stored embeddings while paging the graph (keyset on id)."""
+    reservoir, seen, rng = [], 0, random.Random(42)
+    for label in labels:
+        after = ""
+        while True:
+            records = run_read_query(f"""
+            MATCH (n:{label})
+            WHERE n.id > $after AND n.embedding IS NOT NULL
+            RETURN n.id AS id, n.embedding AS embedding
+            ORDER BY n.id
+            LIMIT $limit
+            """, {"after": after, "limit": FIT_PAGE_SIZE}).get("result", [])
+            for r in records:
+                vec = unpack_embedding(r.get("embedding"))
+                if vec is None or vec.shape != (EMBED_DIM,) or not vec.any():
+                    continue
+                seen += 1
+                if len(reservoir) < sample_size:
+                    reservoir.append(vec)
+                else:
+                    slot = rng.randrange(seen)
+                    if slot < sample_size:
+                        reservoir[slot] = vec
+            if len(records) < FIT_PAGE_SIZE:
+                break
+            after = records[-1]["id"]
+    return np.stack(reservoir) if reservoir else np.zeros((0, EMBED_DIM), dtype=np.float32)
+
+def refit_clusters(labels: list[str] = None, sample_size: int = CLUSTER_FIT_SAMPLE, reason: str = "manual") -> dict:
+    """Fit a fresh model on a sample of graph embeddings and persist it (the `refit_clusters` job)."""
+    data = _sample_embeddings(labels or CLUSTERED_LABELS, sample_size)
+    if len(data) < CLUSTER_MIN_FIT_POINTS:
+        log_action("cluster_service", "refit_skipped", f"Only {len(data)} embeddings available")
+        return {"fitted": False, "fit_size": len(data)}
+    service = ClusterService()
+    summary = service.fit(data)
+    service.save()
+    log_action("cluster_service", "refit", f"{reason}: {summary['clusters']} clusters from {len(data)} points")
+    return summary
+
+def schedule_refit_if_needed() -> dict:
+    """Queue a background refit when the model is missing, stale or drifting; returns the job or None."""
+    service = get_cluster_service()
+    reason = service.refit_reason()
+    # A refit that was skipped (too few points) or failed leaves no new model; try again after the retry window
+    if reason is None or time.time() - service.refit_queued_at < CLUSTER_REFIT_RETRY:
+        return None
+    from core.job_queue import enqueue_job
+    service.refit_queued_at = time.time()
+    return enqueue_job("refit_clusters", {"reason": reason})
+
+def predict_clusters(embeddings) -> tuple:
+    """Cluster labels and strengths for new points under the persisted model (never refits inline)."""
+    service = get_cluster_service()
+    if not service.fitted:
+        schedule_refit_if_needed()
+        count = len(np.atleast_2d(np.asarray(embeddings)))
+        return np.full(count, -1), np.zeros(count)
+    labels, strengths = service.predict(embeddings)
+    schedule_refit_if_needed()
+    return labels, strengths
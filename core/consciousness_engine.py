@@ -1,7 +1,7 @@
 # core/consciousness_engine.py — Structural Self-Mutation Engine
 from datetime import datetime
 
-from core.graph_io import create_node, create_relationship, update_node_properties, run_read_query
+from core.graph_io import create_subgraph, update_node_properties, run_read_query, match_node_by_id
 from core.logging_engine import log_action
 from core.self_concept import update_self_concept
 
@@ -34,9 +34,10 @@ def propose_mutation(mutation_type: str, details: dict, source_nodes: list[str])
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(MUTATION_LABEL, mutation)
-    for src in source_nodes:
-        create_relationship(src, mutation_id, REL_BASED_ON)
+    create_subgraph(
+        [(MUTATION_LABEL, mutation)],
+        [(src, mutation_id, REL_BASED_ON) for src in source_nodes]
+    )
 
     log_action("consciousness_engine", "propose", f"Proposed {mutation_type}: {mutation_id}")
     return mutation
@@ -61,7 +62,7 @@ def apply_mutation_if_approved(mutation_id: str) -> bool:
         update_self_concept({"identity": mutation.get("new_identity")}, rationale=mutation["description"])
     # ... extendable
 
-    update_node_properties(mutation_id, {"status": "applied"})
+    update_node_properties(mutation_id, {"status": "applied"}, label=MUTATION_LABEL)
     log_action("consciousness_engine", "apply", f"Mutation {mutation_id} applied.")
     return True
 
@@ -69,9 +70,10 @@ def log_mutation(mutation_data: dict) -> bool:
     """Store the mutation proposal and its status in the memory graph."""
     if not mutation_data.get("id"):
         return False
-    create_node(MUTATION_LABEL, mutation_data)
-    for nid in mutation_data.get("source_nodes", []):
-        create_relationship(nid, mutation_data["id"], REL_BASED_ON)
+    create_subgraph(
+        [(MUTATION_LABEL, mutation_data)],
+        [(nid, mutation_data["id"], REL_BASED_ON) for nid in mutation_data.get("source_nodes", [])]
+    )
     log_action("consciousness_engine", "log", f"Mutation {mutation_data['id']} logged.")
     return True
 
@@ -88,12 +90,12 @@ def rollback_last_mutation(reason: str) -> bool:
         return False
 
     mutation = result[0]["m"]
-    update_node_properties(mutation["id"], {"status": "reverted", "revert_reason": reason})
+    update_node_properties(mutation["id"], {"status": "reverted", "revert_reason": reason}, label=MUTATION_LABEL)
     log_action("consciousness_engine", "rollback", f"Reverted {mutation['id']}: {reason}")
     return True
 
 # --- Helper ---
 def _get_mutation_node(mutation_id: str) -> dict:
-    query = "MATCH (m {id: $id}) RETURN m LIMIT 1"
+    query = f"{match_node_by_id('m', '$id', MUTATION_LABEL)} RETURN m LIMIT 1"
     result = run_read_query(query, {"id": mutation_id})
     return result[0]["m"] if result else {}
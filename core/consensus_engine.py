@@ -3,7 +3,7 @@ from datetime import datetime
 from statistics import mean
 
 from core.peer_review_engine import initiate_peer_review
-from core.graph_io import create_node, create_relationship
+from core.graph_io import create_node, create_subgraph
 from core.logging_engine import log_action
 
 # --- Constants ---
@@ -39,10 +39,10 @@ def synthesize_consensus(event_id: str, agent_outputs: list[dict]) -> dict:
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(CONSENSUS_NODE_LABEL, consensus_node)
-    for output in agent_outputs:
-        if "response" in output:
-            create_relationship(output["agent"], consensus_node["id"], REL_SUPPORTS)
+    create_subgraph(
+        [(CONSENSUS_NODE_LABEL, consensus_node)],
+        [(output["agent"], consensus_node["id"], REL_SUPPORTS) for output in agent_outputs if "response" in output]
+    )
 
     log_action("consensus_engine", "synthesize", f"{event_id} → confidence {confidence:.2f}")
     return consensus_node
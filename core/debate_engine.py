@@ -3,7 +3,7 @@ from uuid import uuid4
 from datetime import datetime
 
 from core.agent_manager import assign_task
-from core.graph_io import create_node, create_relationship
+from core.graph_io import create_node, create_subgraph
 from core.logging_engine import log_action
 
 # --- Constants ---
@@ -36,12 +36,13 @@ def launch_debate(prompt: str, participants: list[str], max_rounds: int = 3) ->
         "timestamp": timestamp
     }
 
-    create_node(DEBATE_LABEL, {
+    nodes = [(DEBATE_LABEL, {
         "id": debate_id,
         "prompt": prompt,
         "participants": participants,
         "timestamp": timestamp
-    })
+    })]
+    relationships = []
 
     for r in rounds:
         round_id = f"round_{uuid4().hex[:6]}"
@@ -52,8 +53,10 @@ def launch_debate(prompt: str, participants: list[str], max_rounds: int = 3) ->
             "text": r["response"],
             "timestamp": timestamp
         }
-        create_node(DEBATE_ROUND_LABEL, round_node)
-        create_relationship(round_id, debate_id, REL_CONTRIBUTES)
+        nodes.append((DEBATE_ROUND_LABEL, round_node))
+        relationships.append((round_id, debate_id, REL_CONTRIBUTES))
+
+    create_subgraph(nodes, relationships)
 
     log_action("debate_engine", "launch", f"Ran {max_rounds}-round debate: {debate_id}")
     return {"id": debate_id, "rounds": rounds}
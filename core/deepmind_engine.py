@@ -1,8 +1,10 @@
 # core/deepmind_engine.py — Recursive Introspection + Epiphany Engine
-from datetime import datetime
+import json
+import numpy as np
+from datetime import datetime, timedelta
 
-from core.graph_io import create_node, create_relationship, run_read_query
-from core.vector_ops import embed_text
+from core.graph_io import INDEXED_LABELS, create_subgraph, run_read_query, run_write_query, node_from_projection
+from core.vector_ops import EMBED_DIM, MiniBatchClusterer, embed_text, pack_embedding, unpack_embedding
 from core.logging_engine import log_action
 from core.self_concept import update_self_concept
 
@@ -10,15 +12,31 @@ from core.self_concept import update_self_concept
 EPIPHANY_LABEL = "Epiphany"
 META_AUDIT_LABEL = "MetaAudit"
 REL_TRIGGERED_BY = "TRIGGERED_BY"
+REL_CONTRADICTS = "CONTRADICTS"
+AUDIT_STATE_LABEL = "AuditState"
+CONTRADICTION_STATE_ID = "contradictions"
+# Edges stamped within this window of "now" wait for the next audit, so writes still
+# committing while the audit reads aren't skipped by the advancing high-water mark.
+CONTRADICTION_SETTLE_SECONDS = 5
+HOT_NODE_LIMIT = 50
+PATTERN_PAGE_SIZE = 500
+PATTERN_MAX_NODES = 5000      # most recent nodes considered per audit
+PATTERN_CLUSTERS = 8
+PATTERN_MIN_SIZE = 3          # smaller groups aren't reported as patterns
+PATTERN_SAMPLES = 3
 
 # --- Meta-Audit Core ---
-def run_meta_audit(trigger: str = "scheduled") -> dict:
-    """Sweep the graph for inconsistencies, unresolved loops, or drift in identity."""
-    contradictions = detect_contradictions()
+def run_meta_audit(trigger: str = "scheduled", incremental: bool = False) -> dict:
+    """
+    Sweep the graph for inconsistencies, unresolved loops, or drift in identity.
+    incremental=True only looks at contradictions recorded since the previous incremental audit.
+    """
+    contradictions = detect_contradictions(incremental=incremental)
     patterns = search_for_patterns()
 
-    summary = f"Meta-audit triggered by: {trigger}. Found {len(contradictions)} contradictions and {len(patterns)} emergent patterns."
-    log_deepmind_cycle(summary, contradictions + [p["id"] for p in patterns])
+    scope = "new " if incremental else ""
+    summary = f"Meta-audit triggered by: {trigger}. Found {len(contradictions)} {scope}contradictions and {len(patterns)} emergent patterns."
+    log_deepmind_cycle(summary, contradictions + [nid for p in patterns for nid in p["members"][:PATTERN_SAMPLES]])
 
     if contradictions:
         insight = f"Multiple contradictions detected: {contradictions[:2]}"
@@ -27,28 +45,150 @@ def run_meta_audit(trigger: str = "scheduled") -> dict:
 
     return {"audit": summary}
 
-def detect_contradictions() -> list[str]:
-    """Scan events and beliefs for internal contradictions or reversals."""
-    query = """
-    MATCH (a:Event)-[:CONTRADICTS]->(b:Event)
+def get_contradiction_state() -> dict:
+    """Summary carried between incremental audits (high-water mark, totals, most-contradicted nodes)."""
+    query = f"MATCH (s:{AUDIT_STATE_LABEL} {{id: $id}}) RETURN s"
+    rows = run_read_query(query, {"id": CONTRADICTION_STATE_ID}).get("result", [])
+    if not rows:
+        return {"high_water": None, "edges_total": 0, "hot_nodes": {}}
+    state = dict(rows[0]["s"])
+    state["hot_nodes"] = json.loads(state.get("hot_nodes") or "{}")
+    return state
+
+def _save_contradiction_state(state: dict) -> None:
+    props = {**state, "hot_nodes": json.dumps(state["hot_nodes"]), "last_run": datetime.utcnow().isoformat()}
+    run_write_query(
+        f"MERGE (s:{AUDIT_STATE_LABEL} {{id: $id}}) SET s += $props",
+        {"id": CONTRADICTION_STATE_ID, "props": props}
+    )
+
+def detect_contradictions(incremental: bool = False) -> list[str]:
+    """
+    Scan events and beliefs for internal contradictions or reversals.
+    incremental=True returns only nodes on CONTRADICTS edges stamped after the stored high-water
+    mark (a range seek on the relationship timestamp index) and folds them into the running summary.
+    graph_io stamps CONTRADICTS edges as it creates them; edges from before that need the one-off
+    utils.schema_tools.backfill_relationship_timestamps. The first incremental run has no
+    high-water mark and covers every stamped edge.
+    """
+    if not incremental:
+        query = f"""
+        MATCH (a:Event)-[:{REL_CONTRADICTS}]->(b:Event)
+        RETURN a.id AS id_a, b.id AS id_b
+        """
+        results = run_read_query(query).get("result", [])
+        contradictions = [r["id_a"] for r in results] + [r["id_b"] for r in results]
+        log_action("deepmind_engine", "contradictions", f"Found {len(contradictions)}")
+        return list(set(contradictions))
+
+    state = get_contradiction_state()
+    until = (datetime.utcnow() - timedelta(seconds=CONTRADICTION_SETTLE_SECONDS)).isoformat()
+    since_clause = "" if state["high_water"] is None else "r.timestamp > $since AND "
+    query = f"""
+    MATCH (a:Event)-[r:{REL_CONTRADICTS}]->(b:Event)
+    WHERE {since_clause}r.timestamp <= $until
     RETURN a.id AS id_a, b.id AS id_b
     """
-    results = run_read_query(query)
-    contradictions = [r["id_a"] for r in results] + [r["id_b"] for r in results]
-    log_action("deepmind_engine", "contradictions", f"Found {len(contradictions)}")
-    return list(set(contradictions))
+    results = run_read_query(query, {"since": state["high_water"], "until": until}).get("result", [])
+
+    hot = state["hot_nodes"]
+    for r in results:
+        for nid in (r["id_a"], r["id_b"]):
+            hot[nid] = hot.get(nid, 0) + 1
+    state["hot_nodes"] = dict(sorted(hot.items(), key=lambda kv: kv[1], reverse=True)[:HOT_NODE_LIMIT])
+    state["edges_total"] = state.get("edges_total", 0) + len(results)
+    state["high_water"] = until
+    _save_contradiction_state(state)
+
+    contradictions = list(dict.fromkeys([r["id_a"] for r in results] + [r["id_b"] for r in results]))
+    log_action("deepmind_engine", "contradictions",
+               f"Found {len(results)} new edges ({state['edges_total']} total) touching {len(contradictions)} nodes")
+    return contradictions
+
+def _pattern_predicates(filters: dict) -> tuple[str, dict]:
+    """Translate audit filters into WHERE clauses on indexed/stored properties."""
+    clauses, params = ["n.embedding IS NOT NULL"], {}
+    if filters.get("status"):
+        clauses.append("n.status = $status")
+        params["status"] = filters["status"]
+    if filters.get("since"):
+        clauses.append("n.timestamp >= $since")
+        params["since"] = filters["since"]
+    if filters.get("until"):
+        clauses.append("n.timestamp <= $until")
+        params["until"] = filters["until"]
+    if filters.get("agent_origin"):
+        clauses.append("n.agent_origin = $agent_origin")
+        params["agent_origin"] = filters["agent_origin"]
+    return " AND ".join(clauses), params
 
 def search_for_patterns(filters: dict = None) -> list[dict]:
-    """Run a deep contextual search over memory for emergent themes or correlations."""
-    query = """
-    MATCH (e:Event)
-    WHERE e.status = 'active'
-    RETURN e.id AS id, e.raw_text AS text
-    ORDER BY rand() LIMIT 10
     """
-    results = run_read_query(query)
-    log_action("deepmind_engine", "pattern_search", f"Pattern candidates: {len(results)}")
-    return results
+    Mine emergent themes: stream the newest embedded nodes page by page (keyset on timestamp, id),
+    fold each page into a mini-batch k-means, and report the resulting clusters.
+    filters: label (default Event), status (Events default to "active"), since, until,
+             agent_origin, max_nodes, clusters.
+    RETURNS: [{id, size, centroid, members, samples}], largest first; members are ordered by
+             closeness to the centroid.
+    """
+    filters = dict(filters or {})
+    label = filters.get("label", "Event")
+    if label not in INDEXED_LABELS:
+        raise ValueError(f"Unknown label: {label}")
+    if label == "Event":
+        filters.setdefault("status", "active")
+    max_nodes = int(filters.get("max_nodes", PATTERN_MAX_NODES))
+    where, params = _pattern_predicates(filters)
+    keyset = "n.timestamp <= $before_ts AND (n.timestamp < $before_ts OR n.id < $before_id) AND "
+
+    def page_query(after_first: bool) -> str:
+        return f"""
+        MATCH (n:{label})
+        WHERE {keyset if after_first else ""}{where}
+        RETURN n.id AS id, n.timestamp AS timestamp, n.embedding AS embedding,
+               coalesce(n.raw_text, n.summary, n.insight) AS text
+        ORDER BY n.timestamp DESC, n.id DESC
+        LIMIT $limit
+        """
+
+    clusterer = MiniBatchClusterer(n_clusters=int(filters.get("clusters", PATTERN_CLUSTERS)))
+    members, texts = {}, {}
+    cursor, seen = None, 0
+    while seen < max_nodes:
+        page_size = min(PATTERN_PAGE_SIZE, max_nodes - seen)
+        page_params = {**params, "limit": page_size}
+        if cursor:
+            page_params.update(before_ts=cursor[0], before_id=cursor[1])
+        records = run_read_query(page_query(cursor is not None), page_params).get("result", [])
+        if not records:
+            break
+        seen += len(records)
+        cursor = (records[-1]["timestamp"], records[-1]["id"])
+        rows = [(r, unpack_embedding(r.get("embedding"))) for r in records]
+        rows = [(r, vec) for r, vec in rows if vec is not None and vec.shape == (EMBED_DIM,) and vec.any()]
+        if rows:
+            labels, sims = clusterer.partial_fit(np.stack([vec for _, vec in rows]))
+            for (r, _), c, sim in zip(rows, labels, sims):
+                members.setdefault(int(c), []).append((float(sim), r["id"]))
+                texts[r["id"]] = r.get("text")
+        if len(records) < page_size:
+            break
+
+    patterns = []
+    for c, scored in members.items():
+        if len(scored) < PATTERN_MIN_SIZE:
+            continue
+        ids = [nid for _, nid in sorted(scored, reverse=True)]
+        patterns.append({
+            "id": f"pattern_{c}",
+            "size": len(ids),
+            "centroid": clusterer.centroids[c].tolist(),
+            "members": ids,
+            "samples": [texts[nid] for nid in ids[:PATTERN_SAMPLES] if texts.get(nid)]
+        })
+    patterns.sort(key=lambda p: p["size"], reverse=True)
+    log_action("deepmind_engine", "pattern_search", f"{len(patterns)} patterns across {seen} {label} nodes")
+    return patterns
 
 # --- Epiphany Creation ---
 def generate_epiphany(trigger_nodes: list[str], insight: str) -> dict:
@@ -60,16 +200,17 @@ def generate_epiphany(trigger_nodes: list[str], insight: str) -> dict:
         "source_nodes": trigger_nodes,
         "confidence": 0.89,
         "impact": "High",
-        "embedding": embedded,
+        "embedding": pack_embedding(embedded),
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(EPIPHANY_LABEL, epiphany_node)
-    for nid in trigger_nodes:
-        create_relationship(nid, epiphany_node["id"], REL_TRIGGERED_BY)
+    create_subgraph(
+        [(EPIPHANY_LABEL, epiphany_node)],
+        [(nid, epiphany_node["id"], REL_TRIGGERED_BY) for nid in trigger_nodes]
+    )
 
     log_action("deepmind_engine", "generate_epiphany", f"Epiphany: {insight[:60]}...")
-    return epiphany_node
+    return node_from_projection(epiphany_node)
 
 def log_deepmind_cycle(summary: str, nodes: list[str]) -> bool:
     """Write meta-audit outcome and any epiphanies to the timeline."""
@@ -81,9 +222,10 @@ def log_deepmind_cycle(summary: str, nodes: list[str]) -> bool:
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(META_AUDIT_LABEL, audit_node)
-    for nid in nodes:
-        create_relationship(nid, meta_id, "REFERENCED_IN")
+    create_subgraph(
+        [(META_AUDIT_LABEL, audit_node)],
+        [(nid, meta_id, "REFERENCED_IN") for nid in nodes]
+    )
 
     log_action("deepmind_engine", "log_cycle", f"Meta-audit node {meta_id} created")
     return True
@@ -2,8 +2,9 @@
 from datetime import datetime
 import random
 
-from core.graph_io import create_node, create_relationship, run_read_query
-from core.vector_ops import embed_text
+from core.graph_io import create_subgraph, run_read_query, match_node_by_id, project_node, node_from_projection
+from core.vector_ops import embed_text, pack_embedding, unpack_embedding
+from core.vector_index import find_similar, index_node
 from core.logging_engine import log_action
 
 # --- Constants ---
@@ -31,30 +32,55 @@ def generate_dream(seed_nodes: list[str], trigger_reason: str = "periodic") -> d
         "raw_text": dream_text,
         "source_nodes": seed_nodes,
         "trigger_reason": trigger_reason,
-        "embedding": embedding,
+        "embedding": pack_embedding(embedding),
         "significance_score": score_dream_significance(seed_nodes),
         "timestamp": datetime.utcnow().isoformat(),
         "status": "active",
         "type": "dream"
     }
 
-    create_node(DREAM_NODE_LABEL, dream_node)
-    for nid in seed_nodes:
-        create_relationship(nid, dream_node["id"], REL_SOURCE_OF)
+    result = create_subgraph(
+        [(DREAM_NODE_LABEL, dream_node)],
+        [(nid, dream_node["id"], REL_SOURCE_OF) for nid in seed_nodes]
+    )
+    if result.get("status") == "success":
+        try:
+            index_node(dream_node["id"], embedding, DREAM_NODE_LABEL)
+        except Exception as e:
+            log_action("dream_engine", "index_error", f"{dream_node['id']}: {e}")
 
     log_action("dream_engine", "generate", f"Dream node created from {len(seed_nodes)} seeds")
-    return dream_node
+    return node_from_projection(dream_node)
 
 def select_dream_seeds(limit: int = 5, filters: dict = None) -> list[str]:
-    """Return node IDs suitable for dream fusion (based on unresolved, emotional, etc.)."""
-    query = f"""
+    """
+    Return node IDs suitable for dream fusion.
+    Seeds are recalled semantically: around filters["theme"] when given, otherwise around
+    the most recent active event. Falls back to the newest events if recall finds nothing.
+    """
+    filters = filters or {}
+    anchor = filters.get("theme")
+    if not anchor:
+        latest = run_read_query("""
+        MATCH (e:Event)
+        WHERE e.status = 'active' AND e.type = 'event' AND e.embedding IS NOT NULL
+        RETURN e.embedding AS embedding ORDER BY e.timestamp DESC LIMIT 1
+        """)
+        records = latest.get("result", [])
+        anchor = unpack_embedding(records[0].get("embedding")) if records else None
+
+    if anchor is not None:
+        seeds = [hit["id"] for hit in find_similar(anchor, k=limit, labels=["Event"])]
+        if seeds:
+            return seeds
+
+    query = """
     MATCH (e:Event)
     WHERE e.status = 'active' AND e.type = 'event'
-    RETURN e.id ORDER BY rand() LIMIT $limit
+    RETURN e.id AS id ORDER BY e.timestamp DESC LIMIT $limit
     """
     results = run_read_query(query, {"limit": limit})
-    # Normalize: always return just the id strings
-    return [r.get("e.id") or r.get("id") for r in results]
+    return [r.get("id") for r in results.get("result", [])]
 
 def score_dream_significance(seed_node_ids: list[str]) -> float:
     """Evaluate how meaningful or emergent a dream is based on node diversity."""
@@ -67,9 +93,10 @@ def log_dream(dream_data: dict) -> bool:
     """
     if not dream_data.get("id") or not dream_data.get("raw_text"):
         return False
-    create_node(DREAM_NODE_LABEL, dream_data)
-    for src in dream_data.get("source_nodes", []):
-        create_relationship(src, dream_data["id"], REL_SOURCE_OF)
+    create_subgraph(
+        [(DREAM_NODE_LABEL, dream_data)],
+        [(src, dream_data["id"], REL_SOURCE_OF) for src in dream_data.get("source_nodes", [])]
+    )
     log_action("dream_engine", "log", f"Dream {dream_data['id']} stored")
     return True
 
@@ -78,27 +105,26 @@ def get_dream_by_id(dream_id: str) -> dict:
     """
     Retrieve a single dream node by id. Returns plain dict or {}.
     """
-    query = "MATCH (d:Dream {id: $id}) RETURN d LIMIT 1"
-    results = run_read_query(query, {"id": dream_id})
-    return results[0]["d"] if results and "d" in results[0] else {}
+    query = f"MATCH (d:Dream {{id: $id}}) RETURN {project_node('d')} AS d LIMIT 1"
+    results = run_read_query(query, {"id": dream_id}).get("result", [])
+    return node_from_projection(results[0]["d"]) if results and "d" in results[0] else {}
 
 def get_recent_dreams(limit: int = 20) -> list[dict]:
     """
     Retrieve recent dreams, each as a normalized dict.
     """
-    query = """
+    query = f"""
     MATCH (d:Dream)
-    RETURN d
-    ORDER BY d.timestamp DESC
-    LIMIT $limit
+    WITH d ORDER BY d.timestamp DESC LIMIT $limit
+    RETURN {project_node('d')} AS d
     """
-    results = run_read_query(query, {"limit": limit})
-    return [r["d"] for r in results if "d" in r]
+    results = run_read_query(query, {"limit": limit}).get("result", [])
+    return [node_from_projection(r["d"]) for r in results if "d" in r]
 
 # --- Internal Helpers ---
 def get_raw_text(node_id: str) -> str:
-    query = "MATCH (n {id: $id}) RETURN n.raw_text AS text LIMIT 1"
-    result = run_read_query(query, {"id": node_id})
+    query = f"{match_node_by_id('n', '$id')} RETURN n.raw_text AS text LIMIT 1"
+    result = run_read_query(query, {"id": node_id}).get("result", [])
     return result[0]["text"] if result and "text" in result[0] else ""
 
 def synthesize_dream_idea(text: str) -> str:
@@ -0,0 +1,187 @@
+# core/embedding_cache.py — Two-Tier Embedding Cache (LRU + Memory-Mapped Disk Store)
+import os
+import fcntl
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# --- Config ---
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", os.path.join("cache", "embeddings"))
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "4096"))  # in-process LRU entries
+EMBED_CACHE_DISK = os.getenv("EMBED_CACHE_DISK", "true").lower() == "true"
+
+def cache_key(model: str, text: str) -> str:
+    """Content hash of (model, text); identical prompts share one embedding."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+# --- Disk Tier ---
+class _MmapVectorStore:
+    """
+    Append-only float32 matrix on disk, read through np.memmap.
+    vectors.f32 holds one row per key; keys.txt holds "<hash> <row>" per line, so a
+    torn append can't shift later keys onto the wrong vector. Appends take an
+    exclusive flock so several workers can share one directory.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.dim = dim
+        self.directory = os.path.join(directory, f"dim{dim}")
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.keys_path = os.path.join(self.directory, "keys.txt")
+        self.lock_path = os.path.join(self.directory, ".lock")
+        self._rows = {}
+        self._row_count = 0
+        self._keys_offset = 0
+        self._mmap = None
+        os.makedirs(self.directory, exist_ok=True)
+        self._refresh()
+
+    def _refresh(self):
+        """Pick up rows appended by this or any other process since the last read."""
+        if not os.path.exists(self.keys_path):
+            return
+        with open(self.keys_path, "r", encoding="utf-8") as f:
+            f.seek(self._keys_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partial line from an in-flight (or crashed) append
+                try:
+                    key, row = line.split()
+                    row = int(row)
+                except ValueError:
+                    # Everything from here on is discarded by the next put, like a torn append
+                    logging.error(f"[embedding_cache] Corrupt line in {self.keys_path} at byte {self._keys_offset}")
+                    break
+                self._rows.setdefault(key, row)
+                self._row_count = max(self._row_count, row + 1)
+                self._keys_offset += len(line.encode("utf-8"))
+        self._mmap = None
+
+    def _matrix(self):
+        if self._mmap is None and self._rows:
+            rows = os.path.getsize(self.vectors_path) // (4 * self.dim)
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+    def get(self, key: str):
+        row = self._rows.get(key)
+        if row is None:
+            self._refresh()
+            row = self._rows.get(key)
+            if row is None:
+                return None
+        matrix = self._matrix()
+        if matrix is None or row >= matrix.shape[0]:
+            return None
+        return np.array(matrix[row])
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if key in self._rows:
+                    return
+                row = self._row_count
+                # Drop anything past the last committed row/key, e.g. left by a crash mid-append
+                with open(self.vectors_path, "ab") as f:
+                    f.truncate(row * 4 * self.dim)
+                    f.write(np.asarray(vector, dtype=np.float32).tobytes())
+                with open(self.keys_path, "ab") as f:
+                    f.truncate(self._keys_offset)
+                    f.write(f"{key} {row}\n".encode("utf-8"))
+                self._refresh()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+# --- Two-Tier Cache ---
+class EmbeddingCache:
+    """In-process LRU in front of a persistent memory-mapped float32 store."""
+
+    def __init__(self, dim: int = 1536, directory: str = EMBED_CACHE_DIR,
+                 max_entries: int = EMBED_CACHE_SIZE, disk: bool = EMBED_CACHE_DISK):
+        self.dim = dim
+        self.max_entries = max_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._directory = directory if disk else None
+        self._store = None
+
+    def _disk(self):
+        """Open the disk tier on first use; disable it if the directory isn't writable."""
+        if self._store is None and self._directory:
+            try:
+                self._store = _MmapVectorStore(self._directory, self.dim)
+            except OSError as e:
+                logging.error(f"[embedding_cache] Disk tier unavailable: {e}")
+                self._directory = None
+        return self._store
+
+    def get(self, model: str, text: str):
+        """Return a cached float32 vector or None."""
+        key = cache_key(model, text)
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return vec
+            store = self._disk()
+            vec = store.get(key) if store else None
+            if vec is not None:
+                self._remember(key, vec)
+                self.stats["disk_hits"] += 1
+                return vec
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, model: str, text: str, vector) -> None:
+        """Store a vector in both tiers; vectors of the wrong dimension are ignored."""
+        vec = np.asarray(vector, dtype=np.float32)
+        if vec.shape != (self.dim,):
+            return
+        key = cache_key(model, text)
+        with self._lock:
+            self._remember(key, vec)
+            store = self._disk()
+            if store:
+                try:
+                    store.put(key, vec)
+                except OSError as e:
+                    logging.error(f"[embedding_cache] Disk write failed: {e}")
+            self.stats["writes"] += 1
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+_cache = None
+
+def _shared_cache() -> EmbeddingCache:
+    """The process-wide cache, sized by vector_ops.EMBED_DIM so rows always match the embeddings."""
+    global _cache
+    if _cache is None:
+        from core.vector_ops import EMBED_DIM  # vector_ops imports this module at load
+        _cache = EmbeddingCache(dim=EMBED_DIM)
+    return _cache
+
+def get_cached_embedding(model: str, text: str):
+    return _shared_cache().get(model, text)
+
+def cache_embedding(model: str, text: str, vector) -> None:
+    _shared_cache().put(model, text, vector)
+
+def get_embedding_cache_stats() -> dict:
+    """Return hit/miss counters plus current LRU size."""
+    cache = _shared_cache()
+    return {**cache.stats, "memory_entries": len(cache._lru)}
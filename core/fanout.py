@@ -0,0 +1,83 @@
+# core/fanout.py — Concurrent LLM Fan-Out (gevent, per-provider limits)
+import os
+import logging
+
+import gevent
+from gevent.lock import BoundedSemaphore
+from gevent.queue import Queue
+
+# --- Config ---
+CALL_TIMEOUT = float(os.getenv("FANOUT_CALL_TIMEOUT", "60"))  # seconds per call, once it holds a slot
+DEFAULT_CONCURRENCY = int(os.getenv("FANOUT_DEFAULT_CONCURRENCY", "8"))
+PROVIDER_CONCURRENCY = {
+    "gpt": int(os.getenv("FANOUT_GPT_CONCURRENCY", "8")),
+    "claude": int(os.getenv("FANOUT_CLAUDE_CONCURRENCY", "8")),
+    "gemini": int(os.getenv("FANOUT_GEMINI_CONCURRENCY", "4")),
+}
+
+_slots = {}
+
+def _provider_slots(provider: str) -> BoundedSemaphore:
+    """Process-wide semaphore capping in-flight calls per provider."""
+    slots = _slots.get(provider)
+    if slots is None:
+        slots = _slots[provider] = BoundedSemaphore(PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+    return slots
+
+def set_provider_limit(provider: str, limit: int) -> None:
+    """Change a provider's concurrency cap; applies to calls that start afterwards."""
+    PROVIDER_CONCURRENCY[provider] = limit
+    _slots.pop(provider, None)
+
+def _required(wait_for, total: int) -> int:
+    if wait_for in (None, "all"):
+        return total
+    if wait_for == "first":
+        return min(1, total)
+    if wait_for == "quorum":
+        return total // 2 + 1
+    return max(0, min(int(wait_for), total))
+
+# --- Executor ---
+def fan_out(calls: dict, timeout: float = None, wait_for=None, is_ok=None) -> dict:
+    """
+    Run {key: (provider, fn)} concurrently; each fn takes no arguments.
+    wait_for: None/"all" waits for every call, "first" for one success, "quorum" for a majority,
+    an int for that many successes. Calls still running at that point are killed.
+    is_ok: optional predicate on a returned value; False counts the call as failed, for
+    callables that report errors in their return value instead of raising.
+    RETURNS: {key: result} for calls that succeeded, in the order of `calls`.
+    Failures and timeouts are logged and simply absent from the result.
+    """
+    if not calls:
+        return {}
+    timeout = CALL_TIMEOUT if timeout is None else timeout
+    needed = _required(wait_for, len(calls))
+    finished = Queue()
+
+    def run(key, provider, fn):
+        with _provider_slots(provider):
+            try:
+                with gevent.Timeout(timeout):
+                    finished.put((key, True, fn()))
+            except gevent.Timeout:
+                finished.put((key, False, f"timed out after {timeout}s"))
+            except Exception as e:
+                finished.put((key, False, e))
+
+    greenlets = [gevent.spawn(run, key, provider, fn) for key, (provider, fn) in calls.items()]
+    results = {}
+    try:
+        for _ in greenlets:
+            if len(results) >= needed:
+                break
+            key, ok, value = finished.get()
+            if ok and is_ok is not None and not is_ok(value):
+                ok, value = False, f"returned a failure: {value!r}"
+            if ok:
+                results[key] = value
+            else:
+                logging.error(f"[fanout] {key} failed: {value}")
+    finally:
+        gevent.killall([g for g in greenlets if not g.dead], block=False)
+    return {key: results[key] for key in calls if key in results}
@@ -1,21 +1,104 @@
 # core/graph_io.py — Universal Graph IO Layer (Singleton Neo4j Driver)
-import os
+import re
+import json
+import base64
 import logging
-from neo4j import GraphDatabase
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from neo4j import GraphDatabase, Bookmarks, READ_ACCESS, WRITE_ACCESS
+
+from config.settings import load_config
 
 # --- Singleton Driver Management ---
+
+# load_config key -> GraphDatabase.driver keyword
+POOL_OPTIONS = {
+    "NEO4J_MAX_POOL_SIZE": "max_connection_pool_size",
+    "NEO4J_ACQUISITION_TIMEOUT": "connection_acquisition_timeout",
+    "NEO4J_MAX_CONNECTION_LIFETIME": "max_connection_lifetime",
+    "NEO4J_CONNECTION_TIMEOUT": "connection_timeout",
+    "NEO4J_LIVENESS_CHECK_TIMEOUT": "liveness_check_timeout",
+    "NEO4J_KEEP_ALIVE": "keep_alive",
+}
+
+def driver_options(config: dict) -> dict:
+    """Pool keyword arguments for GraphDatabase.driver from config (unset values keep driver defaults)."""
+    return {kwarg: config[key] for key, kwarg in POOL_OPTIONS.items() if config.get(key) is not None}
+
+BOOKMARK_MODES = ("process", "request", "off")
+
+def bookmark_mode(config: dict) -> str:
+    """NEO4J_BOOKMARKS from config, falling back (loudly) to "process" on an unknown value."""
+    mode = config.get("NEO4J_BOOKMARKS") or "process"
+    if mode not in BOOKMARK_MODES:
+        logging.warning(f"Unknown NEO4J_BOOKMARKS={mode!r}, expected one of {BOOKMARK_MODES}; using 'process'")
+        mode = "process"
+    return mode
+
+_pool_stats = {"acquisitions": 0, "failures": 0, "slow": 0, "wait_total": 0.0, "wait_max": 0.0}
+
+def _instrument_pool(driver, slow_after: float) -> None:
+    """Time every connection acquisition; the driver has no public pool telemetry."""
+    pool = getattr(driver, "_pool", None)
+    acquire = getattr(pool, "acquire", None)
+    if acquire is None:
+        return
+
+    def timed_acquire(*args, **kwargs):
+        start = time.monotonic()
+        try:
+            return acquire(*args, **kwargs)
+        except Exception:
+            _pool_stats["failures"] += 1
+            raise
+        finally:
+            wait = time.monotonic() - start
+            _pool_stats["acquisitions"] += 1
+            _pool_stats["wait_total"] += wait
+            _pool_stats["wait_max"] = max(_pool_stats["wait_max"], wait)
+            if wait > slow_after:
+                _pool_stats["slow"] += 1
+                logging.warning(f"[graph_io] Waited {wait:.2f}s for a Neo4j connection")
+
+    pool.acquire = timed_acquire
+
 class _Neo4jDriverSingleton:
     _driver = None
+    _options = {}
+    _bookmark_manager = None
+    read_routing = True
+    bookmark_mode = "process"
+    fetch_size = 1000
+    _configured = False
+
+    @classmethod
+    def configure(cls) -> type:
+        """Load routing, bookmark and fetch settings once, before any session or request uses them."""
+        if not cls._configured:
+            config = load_config()
+            cls.read_routing = config.get("NEO4J_READ_ROUTING", True)
+            cls.bookmark_mode = bookmark_mode(config)
+            cls.fetch_size = config.get("NEO4J_FETCH_SIZE") or 1000
+            cls._bookmark_manager = GraphDatabase.bookmark_manager() if cls.bookmark_mode == "process" else None
+            cls._configured = True
+        return cls
 
     @classmethod
     def get_driver(cls):
         if cls._driver is None:
-            uri = os.getenv("NEO4J_URI")
-            user = os.getenv("NEO4J_USER")
-            pwd = os.getenv("NEO4J_PASS")
+            cls.configure()
+            config = load_config()
+            uri = config.get("NEO4J_URI")
+            user = config.get("NEO4J_USER")
+            pwd = config.get("NEO4J_PASS")
             if not all([uri, user, pwd]):
                 raise RuntimeError("Neo4j credentials not set in environment")
-            cls._driver = GraphDatabase.driver(uri, auth=(user, pwd))
+            cls._options = driver_options(config)
+            driver = GraphDatabase.driver(uri, auth=(user, pwd), **cls._options)
+            _instrument_pool(driver, config.get("NEO4J_SLOW_ACQUIRE") or 1.0)
+            cls._driver = driver
         return cls._driver
 
     @classmethod
@@ -32,12 +115,160 @@ def close_driver():
     """Call to close the Neo4j driver on shutdown/exit."""
     _Neo4jDriverSingleton.close()
 
+def get_pool_metrics() -> dict:
+    """In-use/idle connections per server plus acquisition wait times since the driver was created."""
+    driver = _Neo4jDriverSingleton._driver
+    servers = {}
+    connections = getattr(getattr(driver, "_pool", None), "connections", {}) or {}
+    for address, conns in list(connections.items()):
+        in_use = sum(1 for c in list(conns) if getattr(c, "in_use", False))
+        servers[str(address)] = {"in_use": in_use, "idle": len(conns) - in_use}
+    acquisitions = _pool_stats["acquisitions"]
+    return {
+        "driver_open": driver is not None,
+        "max_pool_size": _Neo4jDriverSingleton._options.get("max_connection_pool_size"),
+        "in_use": sum(s["in_use"] for s in servers.values()),
+        "idle": sum(s["idle"] for s in servers.values()),
+        "servers": servers,
+        "acquisitions": acquisitions,
+        "acquire_failures": _pool_stats["failures"],
+        "slow_acquisitions": _pool_stats["slow"],
+        "acquire_wait_avg_ms": round(1000 * _pool_stats["wait_total"] / acquisitions, 3) if acquisitions else 0.0,
+        "acquire_wait_max_ms": round(1000 * _pool_stats["wait_max"], 3)
+    }
+
+# --- Scoped Sessions & Units of Work ---
+
+class _GraphScope(threading.local):
+    # threading.local is greenlet-local under gevent monkey-patching, so every request/greenlet
+    # gets its own session; fan-out greenlets never share one.
+    def __init__(self):
+        self.depth = 0          # open graph_session() blocks (and Flask requests)
+        self.session = None     # opened lazily on the first query in scope
+        self.bookmarks = None   # causal bookmarks a client sent with its request
+        self.in_unit = False
+        self.tx = None
+
+_scope = _GraphScope()
+
+def _enter_scope() -> None:
+    _scope.depth += 1
+
+def _exit_scope() -> None:
+    _scope.depth = max(0, _scope.depth - 1)
+    if _scope.depth == 0:
+        _scope.bookmarks = None
+        if _scope.session is not None:
+            session, _scope.session = _scope.session, None
+            session.close()
+
+@contextmanager
+def graph_session():
+    """Reuse one driver session for every query in the block (and in nested blocks)."""
+    _enter_scope()
+    try:
+        yield
+    finally:
+        _exit_scope()
+
+@contextmanager
+def unit_of_work():
+    """
+    Run every query in the block in one explicit transaction on the scoped session: committed
+    when the block exits cleanly, rolled back if it raises. Inside a unit, query errors raise
+    instead of returning {"status": "error"}, so a partial write can't be committed. Nested
+    units join the outer one. The transaction begins on the first query.
+    """
+    if _scope.in_unit:
+        yield
+        return
+    with graph_session():
+        _scope.in_unit = True
+        try:
+            yield
+            if _scope.tx is not None:
+                _scope.tx.commit()
+        except BaseException:
+            if _scope.tx is not None:
+                _scope.tx.rollback()
+            raise
+        finally:
+            tx, _scope.tx = _scope.tx, None
+            _scope.in_unit = False
+            if tx is not None:
+                tx.close()
+
+BOOKMARK_HEADER = "X-Graph-Bookmarks"
+
+def init_graph_scope(app) -> None:
+    """
+    Bind a graph session to each Flask request; it's opened on the first query and closed at teardown.
+    Bookmarks from the request's writes go back in the X-Graph-Bookmarks header; a client that echoes
+    the header on its next request reads its own writes even from a follower behind another worker.
+    """
+    from flask import request
+
+    @app.before_request
+    def _open_graph_scope():
+        _enter_scope()
+        raw = request.headers.get(BOOKMARK_HEADER)
+        if raw and _Neo4jDriverSingleton.configure().bookmark_mode != "off":
+            _scope.bookmarks = Bookmarks.from_raw_values(v for v in raw.split(",") if v)
+
+    @app.after_request
+    def _send_bookmarks(response):
+        bookmarks = current_bookmarks()
+        if bookmarks:
+            response.headers[BOOKMARK_HEADER] = ",".join(bookmarks)
+        return response
+
+    app.teardown_request(lambda exc=None: _exit_scope())
+
+def current_bookmarks() -> list:
+    """Raw bookmarks of the scoped session (empty if it hasn't queried anything)."""
+    if _scope.session is None or _Neo4jDriverSingleton.configure().bookmark_mode == "off":
+        return []
+    return sorted(_scope.session.last_bookmarks().raw_values)
+
+def _new_session(access_mode: str = WRITE_ACCESS, **options):
+    settings = _Neo4jDriverSingleton.configure()
+    kwargs = {"default_access_mode": access_mode, **options}
+    if settings._bookmark_manager is not None:
+        kwargs["bookmark_manager"] = settings._bookmark_manager
+    if _scope.bookmarks:
+        kwargs["bookmarks"] = _scope.bookmarks
+    return get_neo4j_driver().session(**kwargs)
+
+def _scoped_session():
+    # Write mode by default; read_transaction still routes each read to a follower.
+    if _scope.session is None:
+        _scope.session = _new_session()
+    return _scope.session
+
+@contextmanager
+def _session(access_mode: str = WRITE_ACCESS):
+    if _scope.depth:
+        yield _scoped_session()
+    else:
+        with _new_session(access_mode) as session:
+            yield session
+
+def _run_in_unit(query: str, parameters: dict) -> dict:
+    if _scope.tx is None:
+        _scope.tx = _scoped_session().begin_transaction()
+    try:
+        return {"status": "success", "result": _scope.tx.run(query, parameters or {}).data()}
+    except Exception as e:
+        logging.error(f"Neo4j Unit of Work Error: {e}")
+        raise
+
 # --- Universal Graph I/O Operations ---
 
 def run_write_query(query: str, parameters: dict = None) -> dict:
-    """Safely run a Cypher write query and return the result."""
-    driver = get_neo4j_driver()
-    with driver.session() as session:
+    """Safely run a Cypher write query (always on the cluster leader) and return the result."""
+    if _scope.in_unit:
+        return _run_in_unit(query, parameters)
+    with _session(WRITE_ACCESS) as session:
         try:
             result = session.write_transaction(lambda tx: tx.run(query, parameters or {}).data())
             return {"status": "success", "result": result}
@@ -45,44 +276,278 @@ def run_write_query(query: str, parameters: dict = None) -> dict:
             logging.error(f"Neo4j Write Error: {e}")
             return {"status": "error", "message": str(e)}
 
-def run_read_query(query: str, parameters: dict = None) -> dict:
-    """Run a Cypher read query and return wrapped records."""
-    driver = get_neo4j_driver()
-    with driver.session() as session:
+def run_read_query(query: str, parameters: dict = None, access_mode: str = READ_ACCESS) -> dict:
+    """
+    Run a Cypher read query and return wrapped records.
+    With a routing (neo4j://) URI, reads go to followers unless access_mode=WRITE_ACCESS or
+    NEO4J_READ_ROUTING is off; bookmarks make them wait for this worker's (or request's) writes.
+    """
+    if _scope.in_unit:
+        return _run_in_unit(query, parameters)
+    if not _Neo4jDriverSingleton.configure().read_routing:
+        access_mode = WRITE_ACCESS
+    with _session(access_mode) as session:
         try:
-            result = session.read_transaction(lambda tx: tx.run(query, parameters or {}).data())
+            run = session.read_transaction if access_mode == READ_ACCESS else session.write_transaction
+            result = run(lambda tx: tx.run(query, parameters or {}).data())
             return {"status": "success", "result": result}
         except Exception as e:
             logging.error(f"Neo4j Read Error: {e}")
             return {"status": "error", "message": str(e), "result": []}
 
+def stream_read_query(query: str, parameters: dict = None, fetch_size: int = None,
+                      access_mode: str = READ_ACCESS):
+    """
+    Yield records one at a time for sweeps too large for run_read_query's list.
+    The driver pulls fetch_size records per round trip (default NEO4J_FETCH_SIZE), so memory stays flat.
+    Each stream gets its own session: another query on a shared session would buffer the rest of the result.
+    Errors are logged and re-raised: unlike run_read_query there is no status to check, and a sweep
+    must never mistake a truncated stream for a complete one.
+    """
+    if _scope.in_unit:
+        yield from _run_in_unit(query, parameters)["result"]
+        return
+    if not _Neo4jDriverSingleton.configure().read_routing:
+        access_mode = WRITE_ACCESS
+    session = _new_session(access_mode, fetch_size=fetch_size or _Neo4jDriverSingleton.fetch_size)
+    try:
+        for record in session.run(query, parameters or {}):
+            yield record.data()
+    except Exception as e:
+        logging.error(f"Neo4j Stream Error: {e}")
+        raise
+    finally:
+        session.close()
+
 def create_node(label: str, properties: dict) -> dict:
     """Create a new node with specified label and properties."""
     props = {k: v for k, v in properties.items() if v is not None}
     query = f"CREATE (n:{label} $props) RETURN n"
     return run_write_query(query, {"props": props})
 
-def create_relationship(from_id: str, to_id: str, rel_type: str, properties: dict = None) -> bool:
+def create_relationship(from_id: str, to_id: str, rel_type: str, properties: dict = None,
+                        from_label: str = None, to_label: str = None) -> bool:
     """Create a relationship between two nodes by ID with optional properties."""
-    props = properties or {}
+    props = stamp_relationship(rel_type, properties or {})
     query = f"""
-    MATCH (a), (b)
-    WHERE a.id = $from_id AND b.id = $to_id
+    {match_node_by_id("a", "$from_id", from_label)}
+    {match_node_by_id("b", "$to_id", to_label)}
     CREATE (a)-[r:{rel_type} $props]->(b)
     RETURN r
     """
     result = run_write_query(query, {"from_id": from_id, "to_id": to_id, "props": props})
     return result["status"] == "success"
 
-def get_node_by_id(node_id: str) -> dict:
+def get_node_by_id(node_id: str, label: str = None) -> dict:
     """Retrieve a node and its properties by ID."""
-    query = "MATCH (n {id: $node_id}) RETURN n LIMIT 1"
+    query = f"{match_node_by_id('n', '$node_id', label)} RETURN n LIMIT 1"
     result = run_read_query(query, {"node_id": node_id})
     records = result.get("result", [])
     return records[0].get("n", {}) if records else {}
 
-def update_node_properties(node_id: str, new_props: dict) -> bool:
+def update_node_properties(node_id: str, new_props: dict, label: str = None) -> bool:
     """Merge new properties into an existing node."""
-    query = "MATCH (n {id: $node_id}) SET n += $props RETURN n"
+    query = f"{match_node_by_id('n', '$node_id', label)} SET n += $props RETURN n"
     result = run_write_query(query, {"node_id": node_id, "props": new_props})
     return result["status"] == "success"
+
+# --- Read Projections ---
+
+# Properties kept off the wire unless a caller asks for them explicitly.
+HEAVY_PROPERTIES = ["embedding"]
+
+def project_node(var: str, exclude: list = None) -> str:
+    """
+    Cypher expression for a node's properties minus heavy ones, as [key, value] pairs.
+    Use as `RETURN {project_node('e')} AS e` and rebuild with node_from_projection.
+    """
+    excluded = ", ".join(f"'{k}'" for k in (HEAVY_PROPERTIES if exclude is None else exclude))
+    return f"[k IN keys({var}) WHERE NOT k IN [{excluded}] | [k, {var}[k]]]"
+
+def node_from_projection(pairs) -> dict:
+    """Rebuild a property dict from project_node output; plain node dicts are accepted and stripped too."""
+    node = dict(pairs or {})
+    for key in HEAVY_PROPERTIES:
+        node.pop(key, None)
+    return node
+
+# --- Keyset Pagination ---
+
+MAX_PAGE_SIZE = 500
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def encode_cursor(timestamp: str, node_id: str) -> str:
+    """Opaque page cursor for the (timestamp, id) of the last node a client has seen."""
+    raw = json.dumps([timestamp, node_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
+    try:
+        timestamp, node_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(timestamp, str) or not isinstance(node_id, str):
+        raise ValueError("Invalid cursor")
+    return timestamp, node_id
+
+def paginate_nodes(label: str, limit: int = 50, cursor: str = None, fields: list = None,
+                   filters: dict = None, since: str = None, until: str = None) -> dict:
+    """
+    One page of `label` nodes, newest first, keyset-paginated on (timestamp, id) so deep pages
+    cost the same as the first. fields limits the returned properties (heavy ones are refused);
+    filters are {property: value} equality predicates evaluated in Cypher.
+    RETURNS: {"items": [node dicts], "next_cursor": opaque string, or None on the last page}
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    clauses, params = [], {"limit": limit + 1}
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = decode_cursor(cursor)
+        clauses.append("n.timestamp <= $cursor_ts AND (n.timestamp < $cursor_ts OR n.id < $cursor_id)")
+    if since:
+        clauses.append("n.timestamp >= $since")
+        params["since"] = since
+    if until:
+        clauses.append("n.timestamp <= $until")
+        params["until"] = until
+    for i, (prop, value) in enumerate((filters or {}).items()):
+        if not _IDENTIFIER.match(prop):
+            raise ValueError(f"Invalid filter property: {prop}")
+        clauses.append(f"n.{prop} = $filter_{i}")
+        params[f"filter_{i}"] = value
+
+    if fields:
+        heavy = [f for f in fields if f in HEAVY_PROPERTIES]
+        if heavy:
+            raise ValueError(f"Fields not available in listings: {heavy}")
+        params["fields"] = list(fields)
+        projection = "[k IN $fields WHERE k IN keys(n) | [k, n[k]]]"
+    else:
+        projection = project_node("n")
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    records = run_read_query(f"""
+    MATCH (n:{label})
+    {where}
+    WITH n ORDER BY n.timestamp DESC, n.id DESC LIMIT $limit
+    RETURN n.timestamp AS timestamp, n.id AS id, {projection} AS node
+    """, params).get("result", [])
+
+    page = records[:limit]
+    next_cursor = encode_cursor(page[-1]["timestamp"], page[-1]["id"]) if len(records) > limit else None
+    return {"items": [node_from_projection(r["node"]) for r in page], "next_cursor": next_cursor}
+
+# --- Schema & Indexed Lookups ---
+
+# Every label the engines write. Each one carries an index on `id` and `timestamp`.
+INDEXED_LABELS = [
+    "Event", "Dream", "TimelineEntry", "Epiphany", "MetaAudit",
+    "Debate", "DebateRound", "DebateOutcome", "Consensus",
+    "PeerReview", "ReviewEscalation", "Imagine", "SimulatedTimeline",
+    "SchemaMutation", "SchemaMutationLog", "SelfCluster", "PhilosophyLog",
+    "SystemLog", "Agent", "AuditState"
+]
+# Labels whose ids come from uuid4, so a uniqueness constraint is safe to enforce.
+UNIQUE_ID_LABELS = ["Event", "PeerReview", "ReviewEscalation", "SelfCluster", "PhilosophyLog", "AuditState"]
+# Relationship types audited incrementally by their `timestamp` (see deepmind_engine.detect_contradictions).
+INDEXED_RELATIONSHIPS = ["CONTRADICTS"]
+
+def stamp_relationship(rel_type: str, props: dict) -> dict:
+    """Give INDEXED_RELATIONSHIPS a creation `timestamp`, so audits can range-seek them instead of scanning."""
+    if rel_type in INDEXED_RELATIONSHIPS and props.get("timestamp") is None:
+        return {**props, "timestamp": datetime.utcnow().isoformat()}
+    return props
+
+def match_node_by_id(var: str, id_expr: str, label: str = None, imports: str = None) -> str:
+    """
+    Return a Cypher fragment binding `var` to the node whose id equals `id_expr`.
+    With a label this is one index seek; without one, each INDEXED_LABELS index is
+    probed first and only when none of them hits does it fall back to a label-less
+    match, so nodes under other labels (SchemaMeta, mutated or migrated labels) are
+    still found. That fallback scans every node, so an id found under no indexed label
+    (an agent id with no Agent node, a SchemaMeta id) costs a full scan each time;
+    pass `label` wherever the caller knows it. `imports` names outer variables that
+    `id_expr` refers to (e.g. "row" for "row.from_id").
+    """
+    if label:
+        return f"MATCH ({var}:{label} {{id: {id_expr}}})"
+    head = f"WITH {imports} " if imports else ""
+    carried = f"{imports}, " if imports else ""
+    branches = " UNION ".join(
+        f"MATCH (x:{l} {{id: {id_expr}}}) RETURN x" for l in INDEXED_LABELS
+    )
+    # COLLECT {} yields one row even when nothing matches (collect() grouped by an
+    # import would yield none), so the fallback branch still runs.
+    return (
+        f"CALL {{ {head}WITH {carried}COLLECT {{ {branches} }} AS hits "
+        f"CALL {{ WITH hits UNWIND hits AS x RETURN x "
+        f"UNION WITH {carried}hits UNWIND CASE WHEN size(hits) = 0 THEN [1] ELSE [] END AS fallback "
+        f"MATCH (x {{id: {id_expr}}}) RETURN x }} "
+        f"RETURN x AS {var} }}"
+    )
+
+def schema_statements(labels: list[str] = None) -> list[str]:
+    """Return idempotent Cypher statements creating the id/timestamp schema for labels."""
+    statements = []
+    for label in labels or INDEXED_LABELS:
+        name = label.lower()
+        if label in UNIQUE_ID_LABELS:
+            statements.append(
+                f"CREATE CONSTRAINT {name}_id_unique IF NOT EXISTS FOR (n:{label}) REQUIRE n.id IS UNIQUE"
+            )
+        else:
+            statements.append(f"CREATE RANGE INDEX {name}_id IF NOT EXISTS FOR (n:{label}) ON (n.id)")
+        statements.append(f"CREATE RANGE INDEX {name}_timestamp IF NOT EXISTS FOR (n:{label}) ON (n.timestamp)")
+    if labels is None:
+        for rel_type in INDEXED_RELATIONSHIPS:
+            statements.append(
+                f"CREATE RANGE INDEX {rel_type.lower()}_timestamp IF NOT EXISTS FOR ()-[r:{rel_type}]-() ON (r.timestamp)"
+            )
+    return statements
+
+# --- Batched Writes ---
+
+def _clean_props(properties: dict) -> dict:
+    return {k: v for k, v in (properties or {}).items() if v is not None}
+
+def create_subgraph(nodes: list[tuple] = None, relationships: list[tuple] = None) -> dict:
+    """
+    Create many nodes and relationships in one UNWIND-based write transaction.
+    nodes: [(label, properties), ...]
+    relationships: [(from_id, to_id, rel_type) or (from_id, to_id, rel_type, properties), ...]
+    Nodes are written before relationships, so edges may point at nodes from the same batch.
+    """
+    node_groups, rel_groups, batch_labels = {}, {}, {}
+    for label, properties in nodes or []:
+        properties = properties or {}
+        node_groups.setdefault(label, []).append(_clean_props(properties))
+        batch_labels[properties.get("id")] = label
+    for rel in relationships or []:
+        from_id, to_id, rel_type = rel[:3]
+        props = rel[3] if len(rel) > 3 else None
+        # Endpoints created in this batch have a known label, so match them by index directly.
+        key = (rel_type, batch_labels.get(from_id), batch_labels.get(to_id))
+        rel_groups.setdefault(key, []).append({
+            "from_id": from_id,
+            "to_id": to_id,
+            "props": stamp_relationship(rel_type, _clean_props(props))
+        })
+
+    clauses, params = [], {}
+    for i, (label, rows) in enumerate(node_groups.items()):
+        params[f"nodes_{i}"] = rows
+        clauses.append(f"UNWIND $nodes_{i} AS props CREATE (n:{label}) SET n = props")
+    for i, ((rel_type, from_label, to_label), rows) in enumerate(rel_groups.items()):
+        params[f"rels_{i}"] = rows
+        clauses.append(
+            f"UNWIND $rels_{i} AS row "
+            f"{match_node_by_id('a', 'row.from_id', from_label, imports='row')} "
+            f"{match_node_by_id('b', 'row.to_id', to_label, imports='row')} "
+            f"CREATE (a)-[r:{rel_type}]->(b) SET r = row.props"
+        )
+    if not clauses:
+        return {"status": "success", "result": []}
+
+    # Collapse rows between segments so an empty MATCH can't starve later ones.
+    query = "\nWITH count(*) AS done\n".join(clauses)
+    return run_write_query(query, params)
@@ -0,0 +1,112 @@
+# core/graph_io_aio.py — Async Graph IO Layer (neo4j AsyncDriver)
+import logging
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
+
+from config.settings import load_config
+from core.graph_io import bookmark_mode, driver_options, match_node_by_id, stamp_relationship
+
+# Same return shapes as core.graph_io, so engine code can move between the two unchanged.
+# Meant for asyncio deployments; gevent workers keep using core.graph_io.
+
+# --- Singleton Driver Management ---
+class _AsyncNeo4jDriverSingleton:
+    _driver = None
+    _bookmark_manager = None
+    read_routing = True
+
+    @classmethod
+    def get_driver(cls):
+        if cls._driver is None:
+            config = load_config()
+            uri = config.get("NEO4J_URI")
+            user = config.get("NEO4J_USER")
+            pwd = config.get("NEO4J_PASS")
+            if not all([uri, user, pwd]):
+                raise RuntimeError("Neo4j credentials not set in environment")
+            cls.read_routing = config.get("NEO4J_READ_ROUTING", True)
+            # No request scope here, so "request" chains the whole process like "process" does
+            if bookmark_mode(config) != "off":
+                cls._bookmark_manager = AsyncGraphDatabase.bookmark_manager()
+            cls._driver = AsyncGraphDatabase.driver(uri, auth=(user, pwd), **driver_options(config))
+        return cls._driver
+
+    @classmethod
+    async def close(cls):
+        if cls._driver is not None:
+            await cls._driver.close()
+            cls._driver = None
+
+def get_async_driver():
+    """Access the singleton AsyncDriver (init if needed); use it from one event loop."""
+    return _AsyncNeo4jDriverSingleton.get_driver()
+
+async def close_async_driver():
+    """Await on shutdown to close the async driver."""
+    await _AsyncNeo4jDriverSingleton.close()
+
+def _new_session(access_mode: str):
+    driver = get_async_driver()  # loads the bookmark manager before it is read below
+    kwargs = {"default_access_mode": access_mode}
+    if _AsyncNeo4jDriverSingleton._bookmark_manager is not None:
+        kwargs["bookmark_manager"] = _AsyncNeo4jDriverSingleton._bookmark_manager
+    return driver.session(**kwargs)
+
+async def _records(tx, query: str, parameters: dict) -> list:
+    result = await tx.run(query, parameters or {})
+    return await result.data()
+
+# --- Universal Graph I/O Operations ---
+async def run_write_query(query: str, parameters: dict = None) -> dict:
+    """Run a Cypher write query on the leader and return the result."""
+    async with _new_session(WRITE_ACCESS) as session:
+        try:
+            result = await session.execute_write(_records, query, parameters)
+            return {"status": "success", "result": result}
+        except Exception as e:
+            logging.error(f"Neo4j Async Write Error: {e}")
+            return {"status": "error", "message": str(e)}
+
+async def run_read_query(query: str, parameters: dict = None, access_mode: str = READ_ACCESS) -> dict:
+    """Run a Cypher read query (routed to followers unless access_mode=WRITE_ACCESS) and return wrapped records."""
+    get_async_driver()  # routing settings are loaded with the driver
+    if not _AsyncNeo4jDriverSingleton.read_routing:
+        access_mode = WRITE_ACCESS
+    async with _new_session(access_mode) as session:
+        try:
+            run = session.execute_read if access_mode == READ_ACCESS else session.execute_write
+            result = await run(_records, query, parameters)
+            return {"status": "success", "result": result}
+        except Exception as e:
+            logging.error(f"Neo4j Async Read Error: {e}")
+            return {"status": "error", "message": str(e), "result": []}
+
+async def create_node(label: str, properties: dict) -> dict:
+    """Create a new node with specified label and properties."""
+    props = {k: v for k, v in properties.items() if v is not None}
+    return await run_write_query(f"CREATE (n:{label} $props) RETURN n", {"props": props})
+
+async def create_relationship(from_id: str, to_id: str, rel_type: str, properties: dict = None,
+                              from_label: str = None, to_label: str = None) -> bool:
+    """Create a relationship between two nodes by ID with optional properties."""
+    query = f"""
+    {match_node_by_id("a", "$from_id", from_label)}
+    {match_node_by_id("b", "$to_id", to_label)}
+    CREATE (a)-[r:{rel_type} $props]->(b)
+    RETURN r
+    """
+    props = stamp_relationship(rel_type, properties or {})
+    result = await run_write_query(query, {"from_id": from_id, "to_id": to_id, "props": props})
+    return result["status"] == "success"
+
+async def get_node_by_id(node_id: str, label: str = None) -> dict:
+    """Retrieve a node and its properties by ID."""
+    query = f"{match_node_by_id('n', '$node_id', label)} RETURN n LIMIT 1"
+    records = (await run_read_query(query, {"node_id": node_id})).get("result", [])
+    return records[0].get("n", {}) if records else {}
+
+async def update_node_properties(node_id: str, new_props: dict, label: str = None) -> bool:
+    """Merge new properties into an existing node."""
+    query = f"{match_node_by_id('n', '$node_id', label)} SET n += $props RETURN n"
+    result = await run_write_query(query, {"node_id": node_id, "props": new_props})
+    return result["status"] == "success"
@@ -2,7 +2,7 @@
 from datetime import datetime
 
 from core.llm_tools import prompt_gpt, prompt_claude
-from core.graph_io import create_node, create_relationship, run_read_query
+from core.graph_io import create_subgraph, run_read_query, match_node_by_id
 from core.vector_ops import embed_text
 from core.logging_engine import log_action
 
@@ -32,9 +32,10 @@ def imagine_scenario(prompt: str, context_nodes: list[str] = None, temperature:
         "label": label_imagination(prompt, response)
     }
 
-    create_node(IMAGINE_NODE_LABEL, node)
-    for nid in context_nodes or []:
-        create_relationship(nid, node["id"], REL_IMAGINES)
+    create_subgraph(
+        [(IMAGINE_NODE_LABEL, node)],
+        [(nid, node["id"], REL_IMAGINES) for nid in context_nodes or []]
+    )
 
     log_action("imagination_engine", "imagine", f"Imagined: {prompt[:40]}...")
     return node
@@ -43,16 +44,17 @@ def log_imagine_node(imagine_data: dict) -> bool:
     """Store an imagination node with metadata and source links."""
     if not imagine_data.get("generated_text"):
         return False
-    create_node(IMAGINE_NODE_LABEL, imagine_data)
-    for src in imagine_data.get("source_context", []):
-        create_relationship(src, imagine_data["id"], REL_IMAGINES)
+    create_subgraph(
+        [(IMAGINE_NODE_LABEL, imagine_data)],
+        [(src, imagine_data["id"], REL_IMAGINES) for src in imagine_data.get("source_context", [])]
+    )
     log_action("imagination_engine", "log", f"Logged imagined node {imagine_data['id']}")
     return True
 
 def simulate_alternatives(base_event_id: str, num_variants: int = 3) -> list[dict]:
     """Branch possible futures from a single event or belief node."""
     base_text = get_raw_text(base_event_id)
-    branches = []
+    branches, nodes, relationships = [], [], []
     for i in range(num_variants):
         prompt = f"Alternative future #{i+1}:\nBased on this event: {base_text}\nWhat could happen if it unfolded differently?"
         alt_text = prompt_gpt(prompt)
@@ -64,20 +66,21 @@ def simulate_alternatives(base_event_id: str, num_variants: int = 3) -> list[dic
             "timestamp": datetime.utcnow().isoformat(),
             "label": f"alt_future_{i+1}"
         }
-        create_node(IMAGINE_NODE_LABEL, alt_node)
-        create_relationship(base_event_id, alt_node["id"], REL_IMAGINES)
+        nodes.append((IMAGINE_NODE_LABEL, alt_node))
+        relationships.append((base_event_id, alt_node["id"], REL_IMAGINES))
         branches.append(alt_node)
         log_action("imagination_engine", "simulate_alternative", f"From {base_event_id} → alt_{i}")
+    create_subgraph(nodes, relationships)
     return branches
 
 # --- Internal Helpers ---
 def get_raw_text(node_id: str) -> str:
-    query = "MATCH (n {id: $id}) RETURN n.raw_text AS text LIMIT 1"
-    result = run_read_query(query, {"id": node_id})
-    return result[0]["text"] if result else ""
+    query = f"{match_node_by_id('n', '$id')} RETURN n.raw_text AS text LIMIT 1"
+    records = run_read_query(query, {"id": node_id}).get("result", [])
+    return records[0]["text"] if records else ""
 
 def label_imagination(prompt: str, output: str) -> str:
     """Generate a human-readable label using Claude."""
     from core.llm_tools import prompt_claude
     task = f"Label the following speculative idea with a 2-4 word poetic summary:\n{output}"
-    return prompt_claude(task, system_prompt="You're an imagination labeler.")[:64]
+    return prompt_claude(task, system_prompt="You're an imagination labeler.", cache=True)[:64]
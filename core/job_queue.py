@@ -0,0 +1,376 @@
+# core/job_queue.py — Persistent Background Job Queue (SQLite) + Worker Pool
+import os
+import json
+import time
+import socket
+import sqlite3
+import hashlib
+import logging
+import threading
+from uuid import uuid4
+
+from gevent.monkey import get_original
+
+from core.graph_io import graph_session
+from core.logging_engine import log_action
+
+# --- Config ---
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join("cache", "jobs.sqlite"))
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))     # seconds between empty polls
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "15"))  # seconds between running-job heartbeats
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "120"))        # no heartbeat this long = worker died
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+JOB_STATUSES = ["queued", "running", "succeeded", "failed", "cancelled"]
+
+# --- Handlers ---
+# Engines are imported inside each handler so the web process never pays for them just to enqueue.
+def _run_dream(seed_nodes: list = None, trigger_reason: str = "periodic", limit: int = 5, filters: dict = None):
+    from core.dream_engine import generate_dream, select_dream_seeds
+    seeds = seed_nodes or select_dream_seeds(limit=limit, filters=filters)
+    return generate_dream(seeds, trigger_reason)
+
+def _run_meta_audit(trigger: str = "scheduled", incremental: bool = False):
+    from core.deepmind_engine import run_meta_audit
+    return run_meta_audit(trigger, incremental=incremental)
+
+def _run_simulate_alternatives(base_event_id: str, num_variants: int = 3):
+    from core.imagination_engine import simulate_alternatives
+    return simulate_alternatives(base_event_id, num_variants)
+
+def _run_simulate_policy_shift(policy_vector: dict, test_scope: list):
+    from core.simulation_engine import simulate_policy_shift
+    return simulate_policy_shift(policy_vector, test_scope)
+
+def _run_refit_clusters(reason: str = "manual", labels: list = None):
+    from core.cluster_service import refit_clusters
+    return refit_clusters(labels=labels, reason=reason)
+
+def _run_build_vector_index(reason: str = "manual", labels: list = None):
+    from core.vector_index import build_index_from_graph
+    return {"indexed": len(build_index_from_graph(labels=labels)), "reason": reason}
+
+def _run_value_drift_scan(threshold: float = None, labels: list = None, write_back: bool = True):
+    from core.value_vector import DRIFT_THRESHOLD, scan_value_drift
+    return scan_value_drift(threshold=DRIFT_THRESHOLD if threshold is None else threshold,
+                            labels=labels, write_back=write_back)
+
+JOB_HANDLERS = {
+    "dream": _run_dream,
+    "meta_audit": _run_meta_audit,
+    "simulate_alternatives": _run_simulate_alternatives,
+    "simulate_policy_shift": _run_simulate_policy_shift,
+    "refit_clusters": _run_refit_clusters,
+    "build_vector_index": _run_build_vector_index,
+    "value_drift_scan": _run_value_drift_scan,
+}
+
+def register_job_handler(kind: str, handler) -> None:
+    """Expose another engine function as a job kind; it receives the job payload as kwargs."""
+    JOB_HANDLERS[kind] = handler
+
+def dedup_key(kind: str, payload: dict) -> str:
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+# --- Queue ---
+class JobQueue:
+    """
+    SQLite-backed priority queue shared by the web and worker processes.
+    Jobs are claimed highest priority first, then oldest first. While a job with the same
+    dedup key is queued or running, enqueueing it again returns the existing job.
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                dedup_key TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 1,
+                worker TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, created_at);
+            CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedup ON jobs (dedup_key)
+                WHERE dedup_key IS NOT NULL AND status IN ('queued', 'running');
+            """)
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:  # queues created before heartbeats
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            self._conn = conn
+        return self._conn
+
+    def _reset_after_fork(self) -> None:
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, payload: dict = None, priority: int = PRIORITY_NORMAL,
+                dedup: bool = True, max_attempts: int = 1) -> dict:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        payload = payload or {}
+        key = dedup_key(kind, payload) if dedup else None
+        job_id = f"job_{uuid4().hex[:12]}"
+        with self._lock:
+            db = self._db()
+            try:
+                db.execute(
+                    "INSERT INTO jobs (id, kind, payload, priority, status, dedup_key, max_attempts, created_at) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                    (job_id, kind, json.dumps(payload, default=str), priority, key, max_attempts, time.time())
+                )
+            except sqlite3.IntegrityError:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row["status"] == "queued" and priority > row["priority"]:
+                        db.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, row["id"]))
+                    return self._as_dict(db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+                raise
+            return self._as_dict(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def claim(self, worker: str) -> dict:
+        """Atomically move the next queued job to running; None if the queue is empty."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY priority DESC, created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+                db.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker, time.time(), time.time(), row["id"])
+                )
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+            return self._as_dict(db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def complete(self, job_id: str, result) -> None:
+        with self._lock:
+            self._db().execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, finished_at = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Record a failure; the job goes back to the queue while attempts remain."""
+        with self._lock:
+            self._db().execute(
+                "UPDATE jobs SET error = ?, finished_at = ?, "
+                "status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END WHERE id = ?",
+                (error, time.time(), job_id)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that hasn't started yet."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+            return cur.rowcount == 1
+
+    def heartbeat(self, job_ids: list[str]) -> None:
+        """Mark running jobs as still owned by a live worker."""
+        if not job_ids:
+            return
+        with self._lock:
+            self._db().execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), *job_ids)
+            )
+
+    def requeue_stale(self, older_than: float = JOB_STALE_AFTER) -> int:
+        """
+        Return running jobs whose worker stopped heartbeating (it died) to the queue,
+        or fail them once their attempts are used up, so a job that kills its worker
+        is not retried forever. Returns how many jobs were released either way.
+        """
+        now = time.time()
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE jobs SET worker = NULL, "
+                "status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "error = CASE WHEN attempts < max_attempts THEN error ELSE 'Worker lost: no heartbeat' END, "
+                "finished_at = CASE WHEN attempts < max_attempts THEN finished_at ELSE ? END "
+                "WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < ?",
+                (now, now - older_than)
+            )
+            return cur.rowcount
+
+    def get(self, job_id: str) -> dict:
+        with self._lock:
+            row = self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._as_dict(row) if row else None
+
+    def list(self, status: str = None, kind: str = None, limit: int = 50) -> list[dict]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+            return [self._as_dict(r, include_result=False) for r in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db().execute("SELECT status, count(*) AS n FROM jobs GROUP BY status").fetchall()
+            return {r["status"]: r["n"] for r in rows}
+
+    @staticmethod
+    def _as_dict(row, include_result: bool = True) -> dict:
+        job = dict(row)
+        job.pop("dedup_key", None)
+        job["payload"] = json.loads(job["payload"])
+        if include_result and job.get("result") is not None:
+            job["result"] = json.loads(job["result"])
+        else:
+            job.pop("result", None)
+        return job
+
+_queue = JobQueue()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_queue._reset_after_fork)
+
+def get_job_queue() -> JobQueue:
+    return _queue
+
+def enqueue_job(kind: str, payload: dict = None, priority: int = PRIORITY_NORMAL,
+                dedup: bool = True, max_attempts: int = 1) -> dict:
+    """Queue an engine run for the worker process; returns the (possibly existing) job."""
+    job = _queue.enqueue(kind, payload, priority, dedup, max_attempts)
+    log_action("job_queue", "enqueue", f"{job['id']} {kind} (priority {job['priority']}, status {job['status']})")
+    return job
+
+def get_job(job_id: str) -> dict:
+    return _queue.get(job_id)
+
+def list_jobs(status: str = None, kind: str = None, limit: int = 50) -> list[dict]:
+    return _queue.list(status, kind, limit)
+
+def cancel_job(job_id: str) -> bool:
+    return _queue.cancel(job_id)
+
+# --- Worker ---
+_running = set()   # ids of jobs executing in this process, heartbeated by run_worker
+
+# OS-level primitives even under monkey-patching: a CPU-bound handler (a UMAP/HDBSCAN refit)
+# never yields to the hub, so a heartbeat greenlet would starve and the job would look dead.
+_start_native_thread, _native_lock = get_original("_thread", ["start_new_thread", "allocate_lock"])
+_native_sleep = get_original("time", "sleep")
+
+def _heartbeat_forever(path: str, stop_event: threading.Event, interval: float = JOB_HEARTBEAT_INTERVAL) -> None:
+    """Heartbeat this process's running jobs from a real OS thread with its own connection."""
+    queue = JobQueue(path)
+    queue._lock = _native_lock()  # never shared with greenlets
+    while not stop_event.is_set():
+        _native_sleep(interval)
+        try:
+            queue.heartbeat(list(_running))
+        except Exception as e:
+            logging.error(f"[job_queue] Heartbeat error: {e}")
+
+def run_job(job: dict, queue: JobQueue = None) -> bool:
+    """Execute one claimed job and record its outcome."""
+    queue = queue or _queue
+    _running.add(job["id"])
+    try:
+        with graph_session():  # every query in the job shares one Neo4j session
+            result = JOB_HANDLERS[job["kind"]](**job["payload"])
+    except Exception as e:
+        queue.fail(job["id"], f"{type(e).__name__}: {e}")
+        log_action("job_queue", "job_failed", f"{job['id']} {job['kind']}: {e}")
+        return False
+    finally:
+        _running.discard(job["id"])
+    queue.complete(job["id"], result)
+    log_action("job_queue", "job_succeeded", f"{job['id']} {job['kind']}")
+    return True
+
+def work_once(worker: str = None, queue: JobQueue = None) -> bool:
+    """Claim and run a single job; False if the queue was empty."""
+    queue = queue or _queue
+    job = queue.claim(worker or f"{socket.gethostname()}:{os.getpid()}")
+    if job is None:
+        return False
+    run_job(job, queue)
+    return True
+
+def run_worker(concurrency: int = JOB_WORKER_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL,
+               stop_event: threading.Event = None) -> None:
+    """
+    Worker pool loop: `concurrency` greenlets (threads without gevent) each claim and run jobs
+    until stop_event is set. Meant for its own process (see worker.py), away from request handling.
+    An OS thread heartbeats this process's running jobs; a monitor requeues any whose worker went silent.
+    """
+    stop_event = stop_event or threading.Event()
+
+    def requeue():
+        requeued = _queue.requeue_stale()
+        if requeued:
+            log_action("job_queue", "requeue_stale", f"Requeued {requeued} orphaned jobs")
+
+    def monitor():
+        while not stop_event.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                requeue()
+            except Exception as e:
+                logging.error(f"[job_queue] Requeue error: {e}")
+
+    requeue()
+    _start_native_thread(_heartbeat_forever, (_queue.path, stop_event))
+
+    def loop(slot: int):
+        name = f"{socket.gethostname()}:{os.getpid()}:{slot}"
+        while not stop_event.is_set():
+            try:
+                if not work_once(name):
+                    stop_event.wait(poll_interval)
+            except Exception as e:
+                logging.error(f"[job_queue] Worker {name} error: {e}")
+                stop_event.wait(poll_interval)
+
+    workers = [threading.Thread(target=loop, args=(i,), daemon=True, name=f"job-worker-{i}") for i in range(concurrency)]
+    workers.append(threading.Thread(target=monitor, daemon=True, name="job-monitor"))
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
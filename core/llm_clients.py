@@ -0,0 +1,76 @@
+# core/llm_clients.py — Process-Wide LLM Client Registry (Pooled, Keep-Alive)
+import os
+import threading
+
+# --- Config ---
+HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "20"))  # keep-alive connections for the OpenAI session
+HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+
+# Clients are built once per (provider, key) and reused by every caller in the process.
+# The lock is a threading lock, so it becomes greenlet-aware under gevent monkey-patching.
+_clients = {}
+_lock = threading.Lock()
+
+def _cached(key: tuple, factory):
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory()
+    return client
+
+def _require(env_var: str, api_key: str = None) -> str:
+    key = api_key or os.getenv(env_var)
+    if not key:
+        raise RuntimeError(f"{env_var} not set")
+    return key
+
+# --- Providers ---
+def get_anthropic_client(api_key: str = None):
+    """Shared anthropic.Anthropic client; its built-in connection pool keeps TLS sessions alive between calls."""
+    key = _require("ANTHROPIC_API_KEY", api_key)
+
+    def build():
+        import anthropic
+        return anthropic.Anthropic(api_key=key, timeout=HTTP_TIMEOUT)
+
+    return _cached(("anthropic", key), build)
+
+def get_openai(api_key: str = None):
+    """The openai module (0.28 API) with its key set and a pooled keep-alive requests session."""
+    key = _require("OPENAI_API_KEY", api_key)
+
+    def build():
+        import openai
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        openai.requestssession = session
+        return openai
+
+    openai = _cached(("openai", "session"), build)
+    openai.api_key = key
+    return openai
+
+def get_gemini_model(model_name: str, api_key: str = None):
+    """Shared GenerativeModel per model name; genai is configured once per key."""
+    key = _require("GOOGLE_API_KEY", api_key)
+
+    def configure():
+        import google.generativeai as genai
+        genai.configure(api_key=key)
+        return genai
+
+    genai = _cached(("gemini", key), configure)
+    return _cached(("gemini", key, model_name), lambda: genai.GenerativeModel(model_name))
+
+def reset_clients() -> None:
+    """Drop every cached client (used after fork, since pooled sockets must not be shared)."""
+    _clients.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_clients)
@@ -1,8 +1,10 @@
-# core/llm_tools.py — Multi-LLM Prompt Orchestrator (Lazy Client Init)
-import os
+# core/llm_tools.py — Multi-LLM Prompt Orchestrator (Pooled Clients)
 from core.logging_engine import log_action
+from core.fanout import fan_out
+from core.llm_clients import get_openai, get_anthropic_client, get_gemini_model
+from core.response_cache import response_key, get_cached_response, cache_response
+from core.rate_limit import call_with_limits, get_limiter
 from random import choice
-from time import sleep
 
 # --- Model Configs ---
 MODEL_SETTINGS = {
@@ -23,42 +25,47 @@ MODEL_SETTINGS = {
     }
 }
 
+# Clients come from core.llm_clients: built once per process, connections kept alive.
 def _get_openai():
-    import openai
-    key = os.getenv("OPENAI_API_KEY")
-    if not key:
-        raise RuntimeError("OPENAI_API_KEY not set")
-    openai.api_key = key
-    return openai
+    return get_openai()
 
 def _get_anthropic():
-    import anthropic
-    key = os.getenv("ANTHROPIC_API_KEY")
-    if not key:
-        raise RuntimeError("ANTHROPIC_API_KEY not set")
-    return anthropic.Anthropic(api_key=key)
+    return get_anthropic_client()
 
 def _get_gemini_model():
-    import google.generativeai as genai
-    key = os.getenv("GOOGLE_API_KEY")
-    if not key:
-        raise RuntimeError("GOOGLE_API_KEY not set")
-    genai.configure(api_key=key)
-    return genai.GenerativeModel(MODEL_SETTINGS["gemini"]["model"])
+    return get_gemini_model(MODEL_SETTINGS["gemini"]["model"])
 
 # --- Base Prompt Utility ---
-def _safe_prompt(model_id: str, prompt: str, system_prompt: str = None, temperature: float = 0.7) -> str:
-    """Unified handler for all model prompts with fallback logging."""
+def _safe_prompt(model_id: str, prompt: str, system_prompt: str = None, temperature: float = 0.7,
+                 cache: bool = None) -> str:
+    """
+    Unified handler for all model prompts with fallback logging.
+    cache=None caches only deterministic (temperature 0) calls; True/False force it on/off.
+    Provider calls go through the shared rate limiter (throttling, retries, circuit breaker);
+    only a call that still fails after that becomes an error placeholder, which is never cached.
+    """
+    use_cache = temperature == 0 if cache is None else cache
+    key = None
+    if use_cache:
+        key = response_key(model_id, MODEL_SETTINGS[model_id]["model"], system_prompt, prompt, temperature)
+        cached = get_cached_response(key)
+        if cached is not None:
+            return cached
     try:
         if model_id == "gpt":
-            return _prompt_openai(prompt, system_prompt, temperature)
+            response = call_with_limits("gpt", lambda: _prompt_openai(prompt, system_prompt, temperature))
         elif model_id == "claude":
-            return _prompt_claude(prompt, system_prompt, temperature)
+            response = call_with_limits("claude", lambda: _prompt_claude(prompt, system_prompt, temperature))
         elif model_id == "gemini":
-            return _prompt_gemini(prompt, system_prompt)
+            response = call_with_limits("gemini", lambda: _prompt_gemini(prompt, system_prompt))
+        else:
+            return None
     except Exception as e:
         log_action("llm_tools", "prompt_error", f"{model_id} failed: {e}")
         return f"[{model_id} ERROR]"
+    if key:
+        cache_response(key, response)
+    return response
 
 # --- Model-Specific Wrappers ---
 def _prompt_openai(prompt, system_prompt=None, temperature=0.7):
@@ -75,13 +82,15 @@ def _prompt_openai(prompt, system_prompt=None, temperature=0.7):
 
 def _prompt_claude(prompt, system_prompt=None, temperature=0.7):
     client = _get_anthropic()
-    msg = client.messages.create(
+    raw = client.messages.with_raw_response.create(
         model=MODEL_SETTINGS["claude"]["model"],
         max_tokens=1024,
         temperature=temperature,
         system=system_prompt or "",
         messages=[{"role": "user", "content": prompt}]
     )
+    get_limiter("claude").observe_headers(raw.headers)
+    msg = raw.parse()
     # NOTE: structure may differ by Anthropic version, adapt if needed
     return msg.content[0].text.strip()
 
@@ -93,15 +102,15 @@ def _prompt_gemini(prompt, system_prompt=None):
     return response.text.strip()
 
 # --- Public API ---
-def prompt_gpt(prompt: str, system_prompt: str = None, temperature: float = 0.7) -> str:
-    return _safe_prompt("gpt", prompt, system_prompt, temperature)
+def prompt_gpt(prompt: str, system_prompt: str = None, temperature: float = 0.7, cache: bool = None) -> str:
+    return _safe_prompt("gpt", prompt, system_prompt, temperature, cache=cache)
 
-def prompt_claude(prompt: str, system_prompt: str = None, temperature: float = 0.7) -> str:
-    return _safe_prompt("claude", prompt, system_prompt, temperature)
+def prompt_claude(prompt: str, system_prompt: str = None, temperature: float = 0.7, cache: bool = None) -> str:
+    return _safe_prompt("claude", prompt, system_prompt, temperature, cache=cache)
 
-def prompt_gemini(prompt: str, context: dict = None) -> str:
+def prompt_gemini(prompt: str, context: dict = None, cache: bool = None) -> str:
     sys_prompt = context.get("system_prompt") if context else None
-    return _safe_prompt("gemini", prompt, sys_prompt)
+    return _safe_prompt("gemini", prompt, sys_prompt, cache=cache)
 
 # --- Advanced ---
 def select_best_response(responses: list[str], context: str = None) -> str:
@@ -116,17 +125,23 @@ def select_best_response(responses: list[str], context: str = None) -> str:
         "and alignment with context:\n\n"
         f"{joined}\n\nReturn the best response text."
     )
-    return prompt_claude(prompt, system_prompt=context or "You are a consensus AI referee.")
+    return prompt_claude(prompt, system_prompt=context or "You are a consensus AI referee.", cache=True)
 
-def run_redundant_prompt(prompt: str, temperature: float = 0.7) -> dict:
-    """Send prompt to all models and return all responses."""
-    results = {}
-    for model_id in ["gpt", "claude", "gemini"]:
-        try:
-            out = _safe_prompt(model_id, prompt, temperature=temperature)
-            results[model_id] = out
-            sleep(0.5)
-        except Exception as e:
-            log_action("llm_tools", "redundant_error", f"{model_id} failed: {e}")
-            results[model_id] = f"[{model_id} ERROR]"
-    return results
+def run_redundant_prompt(prompt: str, temperature: float = 0.7, timeout: float = None, wait_for=None) -> dict:
+    """
+    Send prompt to all models concurrently and return all responses.
+    wait_for ("first", "quorum" or a count) returns early; models that failed, timed out
+    or were still running come back as "[<model> ERROR]".
+    """
+    model_ids = ["gpt", "claude", "gemini"]
+    calls = {
+        model_id: (model_id, lambda m=model_id: _safe_prompt(m, prompt, temperature=temperature))
+        for model_id in model_ids
+    }
+    # _safe_prompt never raises, so its placeholders must not count towards wait_for
+    responses = fan_out(calls, timeout=timeout, wait_for=wait_for,
+                        is_ok=lambda r: r is not None and r not in {f"[{m} ERROR]" for m in model_ids})
+    missing = [m for m in model_ids if m not in responses]
+    if missing:
+        log_action("llm_tools", "redundant_error", f"No response from: {missing}")
+    return {m: responses.get(m, f"[{m} ERROR]") for m in model_ids}
@@ -1,9 +1,14 @@
 # core/logging_engine.py — Universal Action & Audit Logger
 import logging
 import os
+import json
+import time
+import atexit
+import threading
+from queue import Queue, Empty, Full
 from datetime import datetime
 import traceback
-from core.graph_io import create_node
+from core.graph_io import create_node, create_subgraph
 
 # --- Config ---
 LOG_DIR = "logs"
@@ -61,7 +66,7 @@ def log_action(source: str, action_type: str, message: str, metadata: dict = Non
     }
 
     log_to_file(source, action_type, message, log_data["metadata"])
-    return log_to_neo4j(log_data)
+    return _log_sink.submit(log_data)
 
 def log_error(source: str, error_message: str, trace: str = "") -> bool:
     """Log an error, including stack trace if applicable."""
@@ -75,7 +80,7 @@ def log_error(source: str, error_message: str, trace: str = "") -> bool:
     }
 
     log_to_file(source, "ERROR", error_message, {"trace": trace})
-    return log_to_neo4j(log_data)
+    return _log_sink.submit(log_data)
 
 def log_to_file(source: str, level: str, message: str, meta: dict) -> None:
     """Write a message to local system.log. Ensures directory exists every write."""
@@ -93,6 +98,168 @@ def log_to_neo4j(log_data: dict) -> bool:
     """Store log entries as nodes in the graph for temporal queries."""
     return create_node("SystemLog", log_data)["status"] == "success"
 
+# --- Buffered Graph Sink ---
+LOG_SINK_SETTINGS = {
+    "enabled": os.getenv("LOG_SINK_ENABLED", "true").lower() == "true",
+    "flush_interval": float(os.getenv("LOG_SINK_FLUSH_INTERVAL", "1.0")),  # seconds
+    "flush_size": int(os.getenv("LOG_SINK_FLUSH_SIZE", "200")),
+    "max_queue": int(os.getenv("LOG_SINK_MAX_QUEUE", "10000")),
+    "drop_policy": os.getenv("LOG_SINK_DROP_POLICY", "drop_oldest"),  # drop_oldest | drop_newest | block
+    "block_timeout": float(os.getenv("LOG_SINK_BLOCK_TIMEOUT", "0.5")),
+}
+
+class _GraphLogSink:
+    """
+    Bounded queue drained by a background worker into batched SystemLog writes.
+    Under gevent monkey-patching the worker thread and queue are greenlet-based.
+    """
+    _STOP = object()
+
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+        self._reset()
+
+    def _reset(self):
+        self._queue = Queue(maxsize=self.settings["max_queue"])
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, log_data: dict) -> bool:
+        """Queue a log record for the graph; never waits on the database."""
+        if not self.settings["enabled"]:
+            return log_to_neo4j(log_data)
+        self._ensure_worker()
+        record = _to_graph_record(log_data)
+        policy = self.settings["drop_policy"]
+        try:
+            if policy == "block":
+                self._queue.put(record, timeout=self.settings["block_timeout"])
+            else:
+                self._queue.put_nowait(record)
+        except Full:
+            if policy != "drop_oldest":
+                self.stats["dropped"] += 1
+                return False
+            try:
+                self._queue.get_nowait()
+                self.stats["dropped"] += 1
+                self._queue.put_nowait(record)
+            except (Empty, Full):
+                self.stats["dropped"] += 1
+                return False
+        self.stats["queued"] += 1
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                if self._queue.maxsize != self.settings["max_queue"] and self._queue.empty():
+                    self._queue = Queue(maxsize=self.settings["max_queue"])  # resize deferred by configure_log_sink
+                self._worker = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch, stop = self._collect()
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _collect(self) -> tuple[list, bool]:
+        """Block until flush_size records arrive or flush_interval passes after the first one."""
+        first = self._queue.get()
+        if first is self._STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.settings["flush_interval"]
+        while len(batch) < self.settings["flush_size"]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except Empty:
+                break
+            if item is self._STOP:
+                return batch + self._drain(), True
+            batch.append(item)
+        return batch, False
+
+    def _drain(self) -> list:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                return items
+            if item is not self._STOP:
+                items.append(item)
+
+    def _write(self, batch: list):
+        for start in range(0, len(batch), self.settings["flush_size"]):
+            chunk = batch[start:start + self.settings["flush_size"]]
+            try:
+                result = create_subgraph([("SystemLog", r) for r in chunk])
+                ok = result.get("status") == "success"
+            except Exception as e:
+                logging.error(f"[log_sink] Batch write raised: {e}")
+                ok = False
+            self.stats["written" if ok else "failed"] += len(chunk)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Stop the worker after it writes everything queued so far; False if it is still running."""
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return True
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except Full:
+            logging.warning("[log_sink] Queue full, flush skipped; the worker keeps draining")
+            return False
+        worker.join(timeout)
+        # Still writing: keep the reference so no second worker starts; it exits at the STOP
+        if worker.is_alive():
+            return False
+        with self._lock:
+            if self._worker is worker:
+                self._worker = None
+        return True
+
+def _to_graph_record(log_data: dict) -> dict:
+    """Neo4j properties can't be maps, so metadata is stored as a JSON string."""
+    record = dict(log_data)
+    record["metadata"] = json.dumps(record.get("metadata") or {}, default=str)
+    return record
+
+_log_sink = _GraphLogSink(LOG_SINK_SETTINGS)
+
+def configure_log_sink(**settings) -> dict:
+    """Override sink settings at runtime (e.g. flush_interval=0.2, drop_policy="block")."""
+    LOG_SINK_SETTINGS.update(settings)
+    if "max_queue" in settings:
+        # Swapping the queue under a live worker would leak it along with its buffered records
+        if _log_sink.flush():
+            _log_sink._reset()
+        else:
+            logging.warning("[log_sink] Worker still draining; max_queue applies once it has stopped")
+    return dict(LOG_SINK_SETTINGS)
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Write all queued logs to the graph; call on shutdown. False if the worker didn't finish in time."""
+    return _log_sink.flush(timeout)
+
+def get_log_sink_stats() -> dict:
+    """Return queue depth and queued/written/dropped/failed counters."""
+    return {**_log_sink.stats, "pending": _log_sink._queue.qsize()}
+
+atexit.register(flush_logs)
+# A forked worker inherits the queue but not the thread; start clean.
+os.register_at_fork(after_in_child=_log_sink._reset)
+
 def get_recent_logs(limit: int = 50) -> list[dict]:
     """Retrieve recent logs for admin display or debugging."""
     from core.graph_io import run_read_query
@@ -103,3 +270,13 @@ def get_recent_logs(limit: int = 50) -> list[dict]:
     LIMIT $limit
     """
     return run_read_query(query, {"limit": limit})
+
+def get_logs_page(source: str = None, limit: int = 50, cursor: str = None, fields: list = None,
+                  filters: dict = None, since: str = None, until: str = None) -> dict:
+    """SystemLog entries (optionally for one source), newest first, keyset-paginated."""
+    from core.graph_io import paginate_nodes
+    filters = dict(filters or {})
+    if source:
+        filters["source"] = source
+    return paginate_nodes("SystemLog", limit=limit, cursor=cursor, fields=fields,
+                          filters=filters, since=since, until=until)
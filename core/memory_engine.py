@@ -3,13 +3,18 @@
 from datetime import datetime
 from uuid import uuid4
 
-from core.vector_ops import embed_text
-from core.graph_io import run_write_query, run_read_query
+import json
+
+from core.vector_ops import embed_text, embed_texts, pack_embedding
+from core.graph_io import (run_write_query, run_read_query, match_node_by_id, create_subgraph,
+                           project_node, node_from_projection, unit_of_work)
 from core.logging_engine import log_action
+from core.vector_index import index_node
 
 # --- Constants ---
 EVENT_LABELS = ["Event", "Dream", "TimelineEntry"]
 EMBEDDING_DIM = 1536
+BULK_WRITE_SIZE = 500  # events per write transaction in store_events
 
 def _generate_event_id(prefix: str = "event") -> str:
     return f"{prefix}_{uuid4().hex[:8]}"
@@ -17,6 +22,26 @@ def _generate_event_id(prefix: str = "event") -> str:
 def _now() -> str:
     return datetime.utcnow().isoformat()
 
+def _index_embedding(node_id: str, embedding, label: str) -> None:
+    # Recall index is best-effort; a failed update must never fail the write.
+    try:
+        index_node(node_id, embedding, label)
+    except Exception as e:
+        log_action("memory_engine", "index_error", f"{node_id}: {e}")
+
+def _event_node(raw_text: str, embedding: list, agent_origin: str = None, metadata: dict = None, timestamp: str = None) -> dict:
+    # Neo4j can't store map properties, so metadata goes in as a JSON string.
+    return {
+        "id": _generate_event_id("event"),
+        "timestamp": timestamp or _now(),
+        "embedding": pack_embedding(embedding),
+        "raw_text": raw_text,
+        "agent_origin": agent_origin or "system",
+        "status": "active",
+        "type": "event",
+        "metadata": json.dumps(metadata or {}, default=str)
+    }
+
 # --- Event Creation ---
 def store_event(raw_text: str, agent_origin: str = None, metadata: dict = None) -> dict:
     """
@@ -25,23 +50,15 @@ def store_event(raw_text: str, agent_origin: str = None, metadata: dict = None)
     """
     try:
         embedding = embed_text(raw_text)
-        node_data = {
-            "id": _generate_event_id("event"),
-            "timestamp": _now(),
-            "embedding": embedding,
-            "raw_text": raw_text,
-            "agent_origin": agent_origin or "system",
-            "status": "active",
-            "type": "event",
-            "metadata": metadata or {}
-        }
+        node_data = _event_node(raw_text, embedding, agent_origin, metadata)
 
-        result = run_write_query("CREATE (e:Event $props) RETURN e", {"props": node_data})
+        result = run_write_query(f"CREATE (e:Event $props) RETURN {project_node('e')} AS e", {"props": node_data})
         # Try to get dict from Neo4j response
         if result and result.get("status") == "success":
+            _index_embedding(node_data["id"], embedding, "Event")
             records = result.get("result", [])
             if records and isinstance(records[0], dict) and "e" in records[0]:
-                event_dict = dict(records[0]["e"])
+                event_dict = node_from_projection(records[0]["e"])
                 # Ensure critical fields present
                 event_dict.setdefault("id", node_data["id"])
                 event_dict.setdefault("raw_text", node_data["raw_text"])
@@ -70,6 +87,47 @@ def store_event(raw_text: str, agent_origin: str = None, metadata: dict = None)
             "type": "event"
         }
 
+def store_events(events: list, agent_origin: str = None) -> list[dict]:
+    """
+    Bulk variant of store_event for backfills (e.g. historic chat transcripts).
+    Each item is a raw text string or a dict with raw_text and optional agent_origin, metadata, timestamp.
+    Embeds everything in batched calls and writes BULK_WRITE_SIZE events per transaction.
+    RETURNS: event dicts in input order; status is "failed" for events whose write failed.
+    """
+    items = [e if isinstance(e, dict) else {"raw_text": e} for e in events]
+    if not items:
+        return []
+
+    embeddings = embed_texts([item["raw_text"] for item in items])
+    nodes = [
+        _event_node(
+            item["raw_text"],
+            embeddings[i],
+            item.get("agent_origin") or agent_origin,
+            item.get("metadata"),
+            item.get("timestamp")
+        )
+        for i, item in enumerate(items)
+    ]
+
+    stored = []
+    for start in range(0, len(nodes), BULK_WRITE_SIZE):
+        chunk = nodes[start:start + BULK_WRITE_SIZE]
+        result = create_subgraph([("Event", node) for node in chunk])
+        ok = result.get("status") == "success"
+        if not ok:
+            log_action("memory_engine", "store_events_error", f"Bulk write failed: {result.get('message')}")
+        for offset, node in enumerate(chunk):
+            event = {k: v for k, v in node.items() if k != "embedding"}
+            if ok:
+                _index_embedding(node["id"], embeddings[start + offset], "Event")
+            else:
+                event["status"] = "failed"
+            stored.append(event)
+
+    log_action("memory_engine", "store_events", f"Stored {len(stored)} events in bulk")
+    return stored
+
 # --- Dream Creation ---
 def store_dream_node(source_nodes: list, notes: str = "") -> dict:
     dream_id = _generate_event_id("dream")
@@ -78,28 +136,39 @@ def store_dream_node(source_nodes: list, notes: str = "") -> dict:
     node_data = {
         "id": dream_id,
         "timestamp": _now(),
-        "embedding": embedding,
+        "embedding": pack_embedding(embedding),
         "raw_text": raw_text,
         "notes": notes,
         "status": "active",
         "type": "dream"
     }
 
-    result = run_write_query("CREATE (d:Dream $props) RETURN d", {"props": node_data})
-    for source_id in source_nodes:
-        run_write_query("""
-            MATCH (d:Dream {id: $dream_id}), (s {id: $source_id})
-            CREATE (s)-[:FUSED_INTO]->(d)
-        """, {"dream_id": dream_id, "source_id": source_id})
-
-    log_action("memory_engine", "store_dream", f"Created dream node: {dream_id}")
+    # Node and edges commit together: a dream is never stored without its sources.
+    try:
+        with unit_of_work():
+            result = run_write_query(f"CREATE (d:Dream $props) RETURN {project_node('d')} AS d", {"props": node_data})
+            if source_nodes:
+                run_write_query(f"""
+                    MATCH (d:Dream {{id: $dream_id}})
+                    UNWIND $source_ids AS source_id
+                    {match_node_by_id("s", "source_id", imports="source_id")}
+                    CREATE (s)-[:FUSED_INTO]->(d)
+                """, {"dream_id": dream_id, "source_ids": source_nodes})
+    except Exception as e:
+        # The unit rolled back: nothing was stored, so there is no dream to hand back
+        log_action("memory_engine", "store_dream_error", f"{dream_id}: {e}")
+        return {}
 
-    if result and result.get("status") == "success":
-        records = result.get("result", [])
-        if records and isinstance(records[0], dict):
-            return dict(records[0].get("d", {}))
+    if not result or result.get("status") != "success":
+        log_action("memory_engine", "store_dream_error", f"{dream_id}: {(result or {}).get('message')}")
+        return {}
 
-    return dict(node_data)
+    log_action("memory_engine", "store_dream", f"Created dream node: {dream_id}")
+    _index_embedding(dream_id, embedding, "Dream")
+    records = result.get("result", [])
+    if records and isinstance(records[0], dict):
+        return node_from_projection(records[0].get("d", {}))
+    return node_from_projection(node_data)
 
 # --- Timeline Entry ---
 def store_timeline_entry(summary: str, event_ids: list, significance: float, rationale: str) -> dict:
@@ -108,7 +177,7 @@ def store_timeline_entry(summary: str, event_ids: list, significance: float, rat
     node_data = {
         "id": entry_id,
         "timestamp": _now(),
-        "embedding": embedding,
+        "embedding": pack_embedding(embedding),
         "summary": summary,
         "linked_events": event_ids,
         "significance": significance,
@@ -117,26 +186,28 @@ def store_timeline_entry(summary: str, event_ids: list, significance: float, rat
         "status": "active"
     }
 
-    result = run_write_query("CREATE (t:TimelineEntry $props) RETURN t", {"props": node_data})
+    result = run_write_query(f"CREATE (t:TimelineEntry $props) RETURN {project_node('t')} AS t", {"props": node_data})
     for eid in event_ids:
-        run_write_query("""
-            MATCH (t:TimelineEntry {id: $entry_id}), (e {id: $event_id})
+        run_write_query(f"""
+            MATCH (t:TimelineEntry {{id: $entry_id}})
+            {match_node_by_id("e", "$event_id")}
             CREATE (e)-[:HIGHLIGHTED_IN]->(t)
         """, {"entry_id": entry_id, "event_id": eid})
 
     log_action("memory_engine", "store_timeline", f"Created timeline entry: {entry_id}")
 
     if result and result.get("status") == "success":
+        _index_embedding(entry_id, embedding, "TimelineEntry")
         records = result.get("result", [])
         if records and isinstance(records[0], dict):
-            return dict(records[0].get("t", {}))
+            return node_from_projection(records[0].get("t", {}))
 
-    return dict(node_data)
+    return node_from_projection(node_data)
 
 # --- Memory Lifecycle ---
 def decay_memory(node_id: str) -> bool:
-    result = run_write_query("""
-        MATCH (n {id: $node_id})
+    result = run_write_query(f"""
+        {match_node_by_id("n", "$node_id")}
         SET n.status = 'deprioritized',
             n.attention = coalesce(n.attention, 1.0) * 0.2
         RETURN n
@@ -145,12 +216,12 @@ def decay_memory(node_id: str) -> bool:
     return result.get("status") == "success"
 
 def summarize_node(node_id: str) -> str:
-    node = run_read_query("MATCH (n {id: $node_id}) RETURN n", {"node_id": node_id})
+    node = run_read_query(f"{match_node_by_id('n', '$node_id')} RETURN n", {"node_id": node_id})
     if not node:
         return ""
     raw = node[0]["n"].get("raw_text", "")
     summary = embed_text(f"Summarize: {raw}")  # Placeholder for actual summarization
-    run_write_query("MATCH (n {id: $node_id}) SET n.summary = $summary", {
+    run_write_query(f"{match_node_by_id('n', '$node_id')} SET n.summary = $summary", {
         "node_id": node_id,
         "summary": summary
     })
@@ -158,8 +229,8 @@ def summarize_node(node_id: str) -> str:
     return summary
 
 def archive_node(node_id: str) -> bool:
-    result = run_write_query("""
-        MATCH (n {id: $node_id})
+    result = run_write_query(f"""
+        {match_node_by_id("n", "$node_id")}
         SET n.status = 'archived'
         RETURN n
     """, {"node_id": node_id})
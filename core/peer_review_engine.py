@@ -1,6 +1,7 @@
 # core/peer_review_engine.py — Recursive Reasoning Audit
-from core.agent_manager import assign_task
-from core.graph_io import create_node, create_relationship
+from core.agent_manager import assign_task, agent_provider
+from core.fanout import fan_out
+from core.graph_io import create_node, create_subgraph
 from core.logging_engine import log_action
 from core.utils import timestamp_now, generate_uuid
 
@@ -20,31 +21,39 @@ review_format = {
 }
 
 # --- Core Protocol ---
-def initiate_peer_review(event_id: str, agent_ids: list[str]) -> dict:
-    """Request critique from multiple agents on a given event or rationale."""
-    results = []
-    for agent_id in agent_ids:
-        target_node = {"id": event_id}
-        review = critique_rationale(agent_id, target_node)
-        results.append(review)
+def initiate_peer_review(event_id: str, agent_ids: list[str], timeout: float = None, wait_for=None) -> dict:
+    """
+    Request critique from multiple agents on a given event or rationale.
+    Reviewers run concurrently; wait_for ("first", "quorum" or a count) stops once enough have answered.
+    """
+    target_node = {"id": event_id}
+    calls = {
+        agent_id: (agent_provider(agent_id), lambda a=agent_id: critique_rationale(a, target_node))
+        for agent_id in dict.fromkeys(agent_ids)
+    }
+    results = list(fan_out(calls, timeout=timeout, wait_for=wait_for, is_ok=lambda r: "error" not in r).values())
 
+    nodes, relationships = [], []
     for r in results:
-        create_node(PEER_REVIEW_LABEL, r)
-        create_relationship(r["reviewer"], r["target"], REL_REVIEWED)
+        nodes.append((PEER_REVIEW_LABEL, r))
+        relationships.append((r["reviewer"], r["target"], REL_REVIEWED))
         if "suggested_action" in r:
-            create_relationship(r["target"], r["reviewer"], REL_CRITIQUES, {
+            relationships.append((r["target"], r["reviewer"], REL_CRITIQUES, {
                 "action": r["suggested_action"],
                 "score": r["score"]
-            })
+            }))
+    create_subgraph(nodes, relationships)
 
     log_action("peer_review", "initiate", f"Reviewed {event_id} via {agent_ids}")
     return {"target": event_id, "reviews": results}
 
 def critique_rationale(agent_id: str, target_node: dict) -> dict:
-    """Return a structured critique of reasoning from a target agent or node."""
+    """Return a structured critique of reasoning from a target agent or node ({"error": ...} if the agent failed)."""
     event_id = target_node["id"]
     prompt = f"Please critique the logic and clarity of node {event_id}. Suggest improvements and give a confidence score."
     result = assign_task(agent_id, prompt, context={})
+    if "error" in result:
+        return {"reviewer": agent_id, "target": event_id, "error": result["error"]}
 
     return {
         "id": f"review_{generate_uuid()}",
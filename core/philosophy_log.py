@@ -1,6 +1,6 @@
 # core/philosophy_log.py — Inner Reasoning Changelog
 from datetime import datetime
-from core.graph_io import create_node, run_read_query
+from core.graph_io import create_node, run_read_query, stream_read_query
 from core.utils import generate_uuid
 from core.logging_engine import log_action
 
@@ -31,18 +31,22 @@ def get_recent_reflections(limit: int = 10) -> list[dict]:
     ORDER BY p.timestamp DESC
     LIMIT $limit
     """
-    return run_read_query(query, {"limit": limit})
+    return run_read_query(query, {"limit": limit}).get("result", [])
+
+def stream_philosophical_timeline(since: str):
+    """Yield philosophical changes since a date in chronological order, one record at a time."""
+    query = f"""
+    MATCH (p:{PHILOSOPHY_LOG_LABEL})
+    WHERE datetime(p.timestamp) >= datetime($since)
+    RETURN p
+    ORDER BY p.timestamp ASC
+    """
+    yield from stream_read_query(query, {"since": since})
 
 def get_philosophical_timeline(since: str = None) -> list[dict]:
     """Return chronological timeline of philosophical changes and internal reasoning."""
     if since:
-        query = f"""
-        MATCH (p:{PHILOSOPHY_LOG_LABEL})
-        WHERE datetime(p.timestamp) >= datetime($since)
-        RETURN p
-        ORDER BY p.timestamp ASC
-        """
-        return run_read_query(query, {"since": since})
+        return list(stream_philosophical_timeline(since))
     else:
         return get_recent_reflections(limit=100)
 
@@ -0,0 +1,289 @@
+# core/rate_limit.py — Per-Provider Adaptive Rate Limiting, Retry & Circuit Breaking
+import os
+import re
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+
+# --- Config ---
+# Requests/second each provider starts at; rate-limit headers can lower or raise the ceiling.
+PROVIDER_RATES = {
+    "gpt": float(os.getenv("LLM_RATE_GPT", "5")),
+    "claude": float(os.getenv("LLM_RATE_CLAUDE", "2")),
+    "gemini": float(os.getenv("LLM_RATE_GEMINI", "1")),
+}
+DEFAULT_RATE = float(os.getenv("LLM_RATE_DEFAULT", "2"))
+MIN_RATE = 0.05                 # never throttle below one call per 20s
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))     # seconds
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # consecutive failed calls
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))  # seconds open before a trial call
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+THROTTLE_ERRORS = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+TRANSIENT_ERRORS = {
+    "APIConnectionError", "APITimeoutError", "Timeout", "ServiceUnavailableError", "ServiceUnavailable",
+    "InternalServerError", "OverloadedError", "DeadlineExceeded", "TryAgain", "ConnectionError", "TimeoutError"
+}
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+# --- Header & Error Parsing ---
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def _seconds(value) -> float:
+    """Parse '1.5', '20ms', '6m0s' or an RFC 3339 reset timestamp into seconds from now."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, (reset - datetime.now(timezone.utc)).total_seconds())
+    except ValueError:
+        return None
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+def _error_headers(exc) -> dict:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    return headers if hasattr(headers, "get") else {}
+
+def _status(exc):
+    for attr in ("status_code", "http_status", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+def classify_error(exc) -> tuple:
+    """Return (retryable, throttled) for a provider exception."""
+    status = _status(exc)
+    name = type(exc).__name__
+    throttled = status == 429 or name in THROTTLE_ERRORS
+    retryable = throttled or status in RETRYABLE_STATUS or name in TRANSIENT_ERRORS
+    return retryable, throttled
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """Full-jitter exponential backoff; a server-sent retry-after is treated as the floor."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    return max(delay, retry_after or 0.0)
+
+# --- Token Bucket (AIMD) ---
+class TokenBucket:
+    """
+    Reservation-style token bucket: callers take a token and sleep off any debt, so waiters are served in order.
+    The rate halves on every 429 and creeps back toward the ceiling on success.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.ceiling = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token; return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.ceiling, self.rate + self.ceiling * 0.05)
+
+    def on_throttled(self, retry_after: float = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, now + (retry_after or 1.0 / self.rate))
+
+    def observe(self, limit_per_minute: float = None, remaining: float = None, reset: float = None) -> None:
+        """Fold provider rate-limit headers into the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit_per_minute:
+                self.ceiling = max(MIN_RATE, limit_per_minute / 60.0)
+                self.rate = min(self.rate, self.ceiling)
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+                if remaining < 1 and reset:
+                    self.blocked_until = max(self.blocked_until, now + reset)
+
+# --- Circuit Breaker ---
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures -> half_open (one trial call) after `cooldown`."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """True while calls are being refused (no state change, unlike allow)."""
+        return self.state == "open" and time.monotonic() - self.opened_at < self.cooldown
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                opened = self.state != "open"
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                return opened
+            return False
+
+# --- Provider Limiter ---
+class ProviderLimiter:
+    """Token bucket + retry/backoff + circuit breaker + counters for one provider."""
+
+    def __init__(self, provider: str, rate: float = None, max_retries: int = MAX_RETRIES):
+        self.provider = provider
+        self.bucket = TokenBucket(rate or PROVIDER_RATES.get(provider, DEFAULT_RATE))
+        self.breaker = CircuitBreaker()
+        self.max_retries = max_retries
+        self.metrics = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "throttled": 0, "rejected": 0, "circuit_opens": 0, "wait_seconds": 0.0
+        }
+
+    def observe_headers(self, headers) -> None:
+        """Read OpenAI (x-ratelimit-*), Anthropic (anthropic-ratelimit-*) and retry-after headers."""
+        if not headers:
+            return
+        limit = _header(headers, "x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit")
+        remaining = _header(headers, "x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining")
+        reset = _header(headers, "x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset", "retry-after")
+        try:
+            self.bucket.observe(
+                limit_per_minute=float(limit) if limit is not None else None,
+                remaining=float(remaining) if remaining is not None else None,
+                reset=_seconds(reset)
+            )
+        except ValueError:
+            pass
+
+    def call(self, fn):
+        """Run fn() under the limiter; retries transient failures, re-raises the last one."""
+        if not self.breaker.allow():
+            self.metrics["rejected"] += 1
+            raise CircuitOpenError(f"{self.provider} circuit open")
+        for attempt in range(self.max_retries + 1):
+            self.metrics["wait_seconds"] += self.bucket.acquire()
+            self.metrics["calls"] += 1
+            try:
+                result = fn()
+            except Exception as e:
+                retryable, throttled = classify_error(e)
+                headers = _error_headers(e)
+                self.observe_headers(headers)
+                retry_after = _seconds(_header(headers, "retry-after"))
+                if throttled:
+                    self.metrics["throttled"] += 1
+                    self.bucket.on_throttled(retry_after)
+                if not retryable:
+                    self.breaker.record_success()  # the provider answered; the request itself was bad
+                    self.metrics["failures"] += 1
+                    raise
+                if attempt == self.max_retries:
+                    self.metrics["failures"] += 1
+                    if self.breaker.record_failure():
+                        self.metrics["circuit_opens"] += 1
+                        logging.error(f"[rate_limit] {self.provider} circuit opened after repeated failures")
+                    raise
+                self.metrics["retries"] += 1
+                time.sleep(backoff_delay(attempt, retry_after))
+                continue
+            self.bucket.on_success()
+            self.breaker.record_success()
+            self.metrics["successes"] += 1
+            return result
+
+    def snapshot(self) -> dict:
+        return {
+            **self.metrics,
+            "rate_per_second": round(self.bucket.rate, 3),
+            "ceiling_per_second": round(self.bucket.ceiling, 3),
+            "circuit": self.breaker.state
+        }
+
+# --- Process-wide Registry ---
+_limiters = {}
+_registry_lock = threading.Lock()
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.setdefault(provider, ProviderLimiter(provider))
+    return limiter
+
+def call_with_limits(provider: str, fn):
+    """Shared entry point for llm_tools and models/*: throttle, retry and circuit-break fn()."""
+    return get_limiter(provider).call(fn)
+
+def throttle(provider: str) -> None:
+    """Take a token without retry handling (streaming calls that can't be replayed mid-way)."""
+    limiter = get_limiter(provider)
+    if limiter.breaker.is_open():
+        limiter.metrics["rejected"] += 1
+        raise CircuitOpenError(f"{provider} circuit open")
+    limiter.metrics["wait_seconds"] += limiter.bucket.acquire()
+    limiter.metrics["calls"] += 1
+
+def get_limiter_metrics() -> dict:
+    """Per-provider counters, current adaptive rate and breaker state."""
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
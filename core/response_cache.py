@@ -0,0 +1,152 @@
+# core/response_cache.py — Two-Tier LLM Response Cache (TTL LRU + SQLite)
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+# --- Config ---
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))      # seconds
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "2048"))        # in-process LRU entries
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("cache", "llm_responses.sqlite"))
+LLM_CACHE_DISK = os.getenv("LLM_CACHE_DISK", "true").lower() == "true"
+
+def response_key(provider: str, model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+    """Content hash of everything that determines a completion."""
+    raw = json.dumps([provider, model, system_prompt or "", prompt, float(temperature)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+# --- Disk Tier ---
+class _SqliteResponseStore:
+    """key -> (response, expires_at) table; shared by every worker pointing at the same file."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str, now: float):
+        row = self._conn.execute("SELECT response, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None, 0.0
+        if row[1] <= now:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None, 0.0
+        return row[0], row[1]
+
+    def put(self, key: str, response: str, expires_at: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+            (key, response, expires_at)
+        )
+
+    def purge_expired(self, now: float) -> int:
+        return self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+
+# --- Two-Tier Cache ---
+class ResponseCache:
+    """TTL-aware LRU in front of a persistent SQLite table."""
+
+    def __init__(self, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_SIZE,
+                 path: str = LLM_CACHE_PATH, disk: bool = LLM_CACHE_DISK):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._path = path if disk else None
+        self._store = None
+
+    def _disk(self):
+        """Open the disk tier on first use; disable it if the file can't be opened."""
+        if self._store is None and self._path:
+            try:
+                self._store = _SqliteResponseStore(self._path)
+            except (OSError, sqlite3.Error) as e:
+                logging.error(f"[response_cache] Disk tier unavailable: {e}")
+                self._path = None
+        return self._store
+
+    def get(self, key: str):
+        """Return a cached, unexpired response or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._lru.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._lru[key]
+            store = self._disk()
+            if store:
+                try:
+                    response, expires_at = store.get(key, now)
+                except sqlite3.Error as e:
+                    logging.error(f"[response_cache] Disk read failed: {e}")
+                    response = None
+                if response is not None:
+                    self._remember(key, response, expires_at)
+                    self.stats["disk_hits"] += 1
+                    return response
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, response: str, ttl: float = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, response, expires_at)
+            store = self._disk()
+            if store:
+                try:
+                    store.put(key, response, expires_at)
+                except sqlite3.Error as e:
+                    logging.error(f"[response_cache] Disk write failed: {e}")
+            self.stats["writes"] += 1
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        self._lru[key] = (response, expires_at)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers; returns the number removed from disk."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, exp) in self._lru.items() if exp <= now]:
+                del self._lru[key]
+            store = self._disk()
+            return store.purge_expired(now) if store else 0
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def _reset_after_fork(self) -> None:
+        # SQLite connections must not cross a fork; reopen lazily in the child.
+        self._store = None
+        self._lock = threading.Lock()
+
+_cache = ResponseCache()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_cache._reset_after_fork)
+
+def get_cached_response(key: str):
+    return _cache.get(key) if LLM_CACHE_ENABLED else None
+
+def cache_response(key: str, response: str, ttl: float = None) -> None:
+    if LLM_CACHE_ENABLED:
+        _cache.put(key, response, ttl)
+
+def get_response_cache_stats() -> dict:
+    """Return hit/miss counters plus current LRU size."""
+    return {**_cache.stats, "memory_entries": len(_cache._lru)}
@@ -1,7 +1,7 @@
 # core/simulation_engine.py — Timeline Simulation Engine
 from datetime import datetime
 
-from core.graph_io import create_node, create_relationship
+from core.graph_io import create_node, create_subgraph, run_read_query, match_node_by_id
 from core.logging_engine import log_action
 from core.timeline_engine import summarize_sequence
 from core.llm_tools import prompt_gpt
@@ -29,8 +29,10 @@ def simulate_timeline_change(event_id: str, mutation: dict) -> dict:
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(SIM_NODE_LABEL, timeline_node)
-    create_relationship(event_id, timeline_node["id"], REL_SIMULATES)
+    create_subgraph(
+        [(SIM_NODE_LABEL, timeline_node)],
+        [(event_id, timeline_node["id"], REL_SIMULATES)]
+    )
     log_action("simulation_engine", "simulate_change", f"Simulated mutation on {event_id}")
     return timeline_node
 
@@ -56,9 +58,10 @@ def simulate_policy_shift(policy_vector: dict, test_scope: list[str]) -> dict:
         "timestamp": datetime.utcnow().isoformat()
     }
 
-    create_node(SIM_NODE_LABEL, node)
-    for nid in test_scope:
-        create_relationship(nid, sim_id, REL_SIMULATES)
+    create_subgraph(
+        [(SIM_NODE_LABEL, node)],
+        [(nid, sim_id, REL_SIMULATES) for nid in test_scope]
+    )
 
     log_action("simulation_engine", "simulate_policy", f"Simulated policy shift over {len(test_scope)} nodes")
     return node
@@ -91,9 +94,8 @@ def log_simulation(sim_data: dict) -> bool:
 
 # --- Helpers ---
 def get_event_summary(event_id: str) -> str:
-    from core.graph_io import run_read_query
-    query = "MATCH (e {id: $id}) RETURN e.summary AS summary, e.raw_text AS raw LIMIT 1"
-    result = run_read_query({"id": event_id}, query)
-    if result:
-        return result[0].get("summary") or result[0].get("raw") or "[No content]"
+    query = f"{match_node_by_id('e', '$id')} RETURN e.summary AS summary, e.raw_text AS raw LIMIT 1"
+    records = run_read_query(query, {"id": event_id}).get("result", [])
+    if records:
+        return records[0].get("summary") or records[0].get("raw") or "[No content]"
     return "[No event found]"
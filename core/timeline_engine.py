@@ -1,8 +1,9 @@
 # core/timeline_engine.py — Narrative Timeline Builder (Normalized Returns)
 from datetime import datetime
 
-from core.graph_io import create_node, create_relationship, run_read_query
-from core.vector_ops import embed_text
+from core.graph_io import create_subgraph, run_read_query, match_node_by_id, project_node, node_from_projection, paginate_nodes
+from core.vector_ops import embed_text, pack_embedding
+from core.vector_index import index_node
 from core.logging_engine import log_action
 
 # --- Constants ---
@@ -27,7 +28,7 @@ def summarize_sequence(node_ids: list[str], title: str = None) -> dict:
 
     node_texts = "\n".join(get_raw_text(nid) for nid in node_ids)
     prompt = f"Summarize the following sequence of thoughts/events:\n{node_texts}"
-    summary = prompt_claude(prompt, system_prompt="You are a narrative compression engine.")
+    summary = prompt_claude(prompt, system_prompt="You are a narrative compression engine.", cache=True)
 
     summary_node = {
         "id": f"timeline_{int(datetime.utcnow().timestamp())}",
@@ -40,9 +41,10 @@ def summarize_sequence(node_ids: list[str], title: str = None) -> dict:
         "type": "timeline"
     }
 
-    create_node(TIMELINE_LABEL, summary_node)
-    for nid in node_ids:
-        create_relationship(nid, summary_node["id"], REL_HIGHLIGHTS)
+    create_subgraph(
+        [(TIMELINE_LABEL, summary_node)],
+        [(nid, summary_node["id"], REL_HIGHLIGHTS) for nid in node_ids]
+    )
 
     log_action("timeline_engine", "summarize_sequence", f"Created timeline entry from {len(node_ids)} nodes")
     return summary_node
@@ -66,18 +68,24 @@ def create_timeline_entry(summary: str, linked_nodes: list[str], rationale: str,
         "linked_events": linked_nodes,
         "rationale": rationale,
         "significance": significance,
-        "embedding": embedding,
+        "embedding": pack_embedding(embedding),
         "timestamp": datetime.utcnow().isoformat(),
         "status": "active",
         "type": "timeline"
     }
 
-    create_node(TIMELINE_LABEL, node)
-    for nid in linked_nodes:
-        create_relationship(nid, node["id"], REL_HIGHLIGHTS)
+    result = create_subgraph(
+        [(TIMELINE_LABEL, node)],
+        [(nid, node["id"], REL_HIGHLIGHTS) for nid in linked_nodes]
+    )
+    if result.get("status") == "success":
+        try:
+            index_node(node["id"], embedding, TIMELINE_LABEL)
+        except Exception as e:
+            log_action("timeline_engine", "index_error", f"{node['id']}: {e}")
 
     log_action("timeline_engine", "create_entry", f"Timeline moment: {summary[:50]}...")
-    return node
+    return node_from_projection(node)
 
 def log_timeline_shift(event_id: str, impact: str = "moderate") -> bool:
     """
@@ -94,25 +102,33 @@ def get_timeline_entries(limit: int = 50) -> list[dict]:
     """
     query = f"""
     MATCH (t:{TIMELINE_LABEL})
-    RETURN t
-    ORDER BY t.timestamp DESC
-    LIMIT $limit
+    WITH t ORDER BY t.timestamp DESC LIMIT $limit
+    RETURN {project_node('t')} AS t
     """
-    results = run_read_query(query, {"limit": limit})
-    return [r["t"] for r in results if "t" in r]
+    results = run_read_query(query, {"limit": limit}).get("result", [])
+    return [node_from_projection(r["t"]) for r in results if "t" in r]
+
+def get_timeline_page(limit: int = 50, cursor: str = None, fields: list = None,
+                      filters: dict = None, since: str = None, until: str = None) -> dict:
+    """
+    Keyset-paginated timeline listing: {"items": [...], "next_cursor": ...}.
+    Pass next_cursor back to continue from the last entry returned.
+    """
+    return paginate_nodes(TIMELINE_LABEL, limit=limit, cursor=cursor, fields=fields,
+                          filters=filters, since=since, until=until)
 
 def get_timeline_entry_by_id(entry_id: str) -> dict:
     """
     Retrieve a single timeline entry by ID as a normalized dict.
     """
-    query = f"MATCH (t:{TIMELINE_LABEL} {{id: $id}}) RETURN t LIMIT 1"
-    results = run_read_query(query, {"id": entry_id})
-    return results[0]["t"] if results and "t" in results[0] else {}
+    query = f"MATCH (t:{TIMELINE_LABEL} {{id: $id}}) RETURN {project_node('t')} AS t LIMIT 1"
+    results = run_read_query(query, {"id": entry_id}).get("result", [])
+    return node_from_projection(results[0]["t"]) if results and "t" in results[0] else {}
 
 # --- Helpers ---
 def get_raw_text(node_id: str) -> str:
-    query = "MATCH (n {id: $id}) RETURN n.raw_text AS text, n.summary AS summary LIMIT 1"
-    result = run_read_query(query, {"id": node_id})
+    query = f"{match_node_by_id('n', '$id')} RETURN n.raw_text AS text, n.summary AS summary LIMIT 1"
+    result = run_read_query(query, {"id": node_id}).get("result", [])
     if result:
         return result[0].get("summary") or result[0].get("text") or "[No content]"
     return "[No node found]"
@@ -1,13 +1,17 @@
 # core/value_vector.py — Moral Cognition Engine
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import normalize  # ← ADD THIS
 
-from core.graph_io import update_node_properties, get_node_by_id
+from datetime import datetime
+
+from core.graph_io import (
+    get_node_by_id, run_write_query, stream_read_query, update_node_properties
+)
 from core.logging_engine import log_action
 
 # --- Constants ---
 VALUE_DIM = 32  # Expandable moral resolution
+DRIFT_SCAN_PAGE_SIZE = 1000     # records per fetch and rows per matrix chunk
+DRIFT_THRESHOLD = 0.2
 default_value_profile = {
     "empathy": 0.5,
     "curiosity": 0.5,
@@ -19,14 +23,48 @@ default_value_profile = {
     "resilience": 0.5
 }
 
+# Key order is fixed once; every vector and matrix row uses it.
+VALUE_KEYS = tuple(sorted(default_value_profile))
+
 # --- Helpers ---
-def _to_vector(value_dict: dict) -> np.ndarray:
-    ordered = [value_dict.get(k, 0.0) for k in sorted(default_value_profile.keys())]
-    return normalize([ordered])[0]
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in float32; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+def _raw_vector(values) -> np.ndarray:
+    if isinstance(values, dict):
+        return np.fromiter((values.get(k, 0.0) for k in VALUE_KEYS), dtype=np.float32, count=len(VALUE_KEYS))
+    return np.asarray(values, dtype=np.float32)
+
+def _to_vector(values) -> np.ndarray:
+    """Normalized float32 vector from a {value: weight} dict or an already ordered sequence."""
+    return _unit_rows(_raw_vector(values))
 
 def _from_vector(vec: np.ndarray) -> dict:
-    keys = sorted(default_value_profile.keys())
-    return {k: float(v) for k, v in zip(keys, vec)}
+    return dict(zip(VALUE_KEYS, map(float, vec)))
+
+def to_value_matrix(vectors) -> np.ndarray:
+    """Stack many value vectors (dicts or sequences) into one normalized (N, len(VALUE_KEYS)) float32 matrix."""
+    if isinstance(vectors, np.ndarray):
+        return _unit_rows(vectors.astype(np.float32, copy=False).reshape(-1, len(VALUE_KEYS)))
+    matrix = np.zeros((len(vectors), len(VALUE_KEYS)), dtype=np.float32)
+    for i, values in enumerate(vectors):
+        matrix[i] = _raw_vector(values)
+    return _unit_rows(matrix)
+
+# --- Batch Math ---
+def similarity_to_many(vec, matrix) -> np.ndarray:
+    """Cosine similarity of one value vector against every row of a matrix, shape (N,)."""
+    return to_value_matrix(matrix) @ _to_vector(vec)
+
+def drift_from_reference(reference, matrix) -> np.ndarray:
+    """Drift (1 - cosine) of every row from one reference vector, e.g. all agents vs the community profile."""
+    return 1.0 - similarity_to_many(reference, matrix)
+
+def pairwise_drift(originals, currents) -> np.ndarray:
+    """Row-wise drift between two aligned matrices, e.g. each agent's initial vs current values."""
+    return 1.0 - np.einsum("ij,ij->i", to_value_matrix(originals), to_value_matrix(currents))
 
 # --- Core Functions ---
 def initialize_value_vector(base_values: dict[str, float]) -> list[float]:
@@ -35,31 +73,32 @@ def initialize_value_vector(base_values: dict[str, float]) -> list[float]:
     log_action("value_vector", "init", f"Initialized values: {_from_vector(vec)}")
     return vec.tolist()
 
-def update_value_vector(node_id: str, new_influences: dict[str, float]) -> list[float]:
-    """Merge and normalize new value influences into an existing node’s vector."""
+def update_value_vector(node_id: str, new_influences) -> list[float]:
+    """Merge and normalize new value influences (a dict or another value vector) into an existing node’s vector."""
     node = get_node_by_id(node_id)
     if not node or "value_vector" not in node:
         base = _to_vector(default_value_profile)
     else:
-        base = np.array(node["value_vector"])
+        base = _raw_vector(node["value_vector"])
 
-    influence = _to_vector(new_influences)
-    updated = normalize([base + influence])[0]
+    updated = _unit_rows(base + _to_vector(new_influences))
     update_node_properties(node_id, {"value_vector": updated.tolist()})
     log_action("value_vector", "update", f"Updated vector for {node_id}")
     return updated.tolist()
 
-def compare_values(vec_a: list[float], vec_b: list[float]) -> float:
+def compare_values(vec_a: list[float], vec_b: list[float], log: bool = False) -> float:
     """Return cosine similarity between two value vectors."""
-    sim = cosine_similarity([vec_a], [vec_b])[0][0]
-    log_action("value_vector", "compare", f"Similarity: {sim:.4f}")
-    return float(sim)
+    sim = float(_to_vector(vec_a) @ _to_vector(vec_b))
+    if log:
+        log_action("value_vector", "compare", f"Similarity: {sim:.4f}")
+    return sim
 
-def detect_value_drift(original_vec: list[float], current_vec: list[float]) -> float:
+def detect_value_drift(original_vec: list[float], current_vec: list[float], log: bool = False) -> float:
     """Detect degree of drift between initial and current value state."""
-    drift = 1 - cosine_similarity([original_vec], [current_vec])[0][0]
-    log_action("value_vector", "drift", f"Drift magnitude: {drift:.4f}")
-    return float(drift)
+    drift = 1.0 - float(_to_vector(original_vec) @ _to_vector(current_vec))
+    if log:
+        log_action("value_vector", "drift", f"Drift magnitude: {drift:.4f}")
+    return drift
 
 def apply_value_influence(agent_id: str, value_node_id: str) -> bool:
     """Adjust agent or system alignment based on a value node (and log influence)."""
@@ -74,3 +113,78 @@ def apply_value_influence(agent_id: str, value_node_id: str) -> bool:
     updated = update_value_vector(agent_id, value_node["value_vector"])
     log_action("value_vector", "apply_influence", f"Applied influence from {value_node_id} to {agent_id}")
     return True
+
+# --- Fleet-wide Drift ---
+def _stream_value_vectors(labels: list[str], page_size: int):
+    """
+    Yield (rows, matrix) chunks of nodes carrying a value_vector; rows hold element id, id and
+    whether a value_drift is already set. Without labels every node is swept (one streamed scan,
+    since update_value_vector / apply_value_influence can write the property onto any node).
+    """
+    matches = [f"MATCH (n:{label})" for label in labels] if labels else ["MATCH (n)"]
+    for match in matches:
+        chunk = []
+        for record in stream_read_query(f"""
+        {match}
+        WHERE n.value_vector IS NOT NULL
+        RETURN elementId(n) AS eid, n.id AS id, n.value_vector AS value_vector,
+               n.value_drift IS NOT NULL AS drifted
+        """, fetch_size=page_size):
+            if len(record["value_vector"] or []) == len(VALUE_KEYS):
+                chunk.append(record)
+            if len(chunk) == page_size:
+                yield chunk, np.array([r["value_vector"] for r in chunk], dtype=np.float32)
+                chunk = []
+        if chunk:
+            yield chunk, np.array([r["value_vector"] for r in chunk], dtype=np.float32)
+
+def scan_value_drift(reference=None, threshold: float = DRIFT_THRESHOLD, labels: list[str] = None,
+                     page_size: int = DRIFT_SCAN_PAGE_SIZE, write_back: bool = True) -> dict:
+    """
+    Alignment report for every node carrying a value_vector (or only those under `labels`).
+    Records are streamed into one float32 matrix, drift from `reference` (default profile) is computed
+    in a single pass, and one batched write sets value_drift / value_drift_at on nodes over `threshold`
+    and clears them from nodes that have drifted back under it.
+    """
+    labels = labels or []
+    invalid = [l for l in labels if not str(l).isidentifier()]
+    if invalid:
+        raise ValueError(f"Invalid labels: {invalid}")
+
+    rows, pages = [], []
+    for chunk, matrix in _stream_value_vectors(labels, page_size):
+        rows.extend({"eid": r["eid"], "id": r["id"], "drifted": r["drifted"]} for r in chunk)
+        pages.append(matrix)
+    matrix = np.vstack(pages) if pages else np.zeros((0, len(VALUE_KEYS)), dtype=np.float32)
+    drift = drift_from_reference(default_value_profile if reference is None else reference, matrix)
+
+    flagged_rows = np.flatnonzero(drift > threshold)
+    flagged_rows = flagged_rows[np.argsort(-drift[flagged_rows])]
+    flagged = [{"id": rows[i]["id"], "drift": float(drift[i])} for i in flagged_rows]
+    cleared = [r["eid"] for i, r in enumerate(rows) if r["drifted"] and drift[i] <= threshold]
+
+    if write_back and (flagged or cleared):
+        run_write_query("""
+        UNWIND $flagged AS row
+        MATCH (n) WHERE elementId(n) = row.eid
+        SET n.value_drift = row.drift, n.value_drift_at = $scanned_at
+        WITH count(*) AS done
+        UNWIND $cleared AS eid
+        MATCH (n) WHERE elementId(n) = eid
+        REMOVE n.value_drift, n.value_drift_at
+        """, {
+            "flagged": [{"eid": rows[i]["eid"], "drift": float(drift[i])} for i in flagged_rows],
+            "cleared": cleared,
+            "scanned_at": datetime.utcnow().isoformat()
+        })
+
+    report = {
+        "scanned": len(rows),
+        "threshold": threshold,
+        "flagged": flagged,
+        "cleared": len(cleared),
+        "mean_drift": float(drift.mean()) if len(drift) else 0.0,
+        "max_drift": float(drift.max()) if len(drift) else 0.0
+    }
+    log_action("value_vector", "drift_scan", f"{len(flagged)} of {len(rows)} nodes drifted past {threshold}")
+    return report
@@ -0,0 +1,330 @@
+# core/vector_index.py — Local Semantic Recall Index (IVF over a float32 matrix)
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+
+from core.graph_io import run_read_query
+from core.logging_engine import log_action
+from core.vector_ops import embed_text, unpack_embedding
+
+# --- Config ---
+INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", os.path.join("cache", "vector_index.npz"))
+INDEXED_EMBEDDING_LABELS = ["Event", "Dream", "TimelineEntry"]
+IVF_MIN_TRAIN = 4096      # below this, search is an exact scan
+IVF_RETRAIN_GROWTH = 4    # retrain once the index is this many times larger than at training
+IVF_NPROBE = 8            # inverted lists scanned per query
+REBUILD_AFTER = 500       # local adds before a rebuild job is queued
+PENDING_MAX = 5000        # local adds kept to re-apply over a newer build; oldest dropped first
+BUILD_RETRY_AFTER = 600   # seconds before re-queueing a build that never produced a file
+BUILD_PAGE_SIZE = 1000
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class VectorIndex:
+    """
+    Cosine-similarity index over normalized float32 rows.
+    Small indexes are scanned exactly. Once trained, rows are stored grouped by their
+    nearest centroid (IVF), so a query scores only the contiguous slices of the nprobe
+    closest lists plus any rows added since training.
+    """
+
+    def __init__(self, dim: int = 1536):
+        self.dim = dim
+        self.ids = []
+        self.labels = []
+        self._rows = {}
+        self._label_codes = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._label_of_row = np.zeros(0, dtype=np.int16)
+        self._list_of_row = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self.centroids = None
+        self._bounds = None        # list c occupies rows [_bounds[c], _bounds[c + 1]) of the trained block
+        self._trained_size = 0
+        self._overflow = {}        # list id -> rows added after training
+        self._overflow_cache = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._size
+
+    # --- Writes ---
+    def add(self, ids: list[str], vectors, labels: list[str]) -> None:
+        """
+        Insert or replace rows; zero vectors (failed embeddings) are skipped.
+        A replaced row keeps its inverted list until the next training pass.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        keep = np.linalg.norm(matrix, axis=1) > 0
+        matrix = _normalize(matrix[keep])
+        ids = [i for i, k in zip(ids, keep) if k]
+        labels = [l for l, k in zip(labels, keep) if k]
+        if not ids:
+            return
+        with self._lock:
+            for node_id, vec, label in zip(ids, matrix, labels):
+                row = self._rows.get(node_id)
+                if row is None:
+                    row = self._append_row()
+                    self._rows[node_id] = row
+                    self.ids.append(node_id)
+                    self.labels.append(label)
+                    if self.centroids is not None:
+                        list_id = int(np.argmax(self.centroids @ vec))
+                        self._list_of_row[row] = list_id
+                        self._overflow.setdefault(list_id, []).append(row)
+                        self._overflow_cache.pop(list_id, None)
+                else:
+                    self.labels[row] = label
+                self._vectors[row] = vec
+                self._label_of_row[row] = self._label_code(label)
+            if self._needs_training():
+                self.train()
+
+    def _append_row(self) -> int:
+        if self._size == self._vectors.shape[0]:
+            grow = max(1024, self._size)
+            self._vectors = np.vstack([self._vectors, np.zeros((grow, self.dim), dtype=np.float32)])
+            self._label_of_row = np.concatenate([self._label_of_row, np.zeros(grow, dtype=np.int16)])
+            self._list_of_row = np.concatenate([self._list_of_row, np.zeros(grow, dtype=np.int32)])
+        self._size += 1
+        return self._size - 1
+
+    def _label_code(self, label: str) -> int:
+        return self._label_codes.setdefault(label, len(self._label_codes))
+
+    def _needs_training(self) -> bool:
+        if self._size < IVF_MIN_TRAIN:
+            return False
+        return self.centroids is None or self._size >= self._trained_size * IVF_RETRAIN_GROWTH
+
+    def train(self, iterations: int = 8, sample_size: int = 30000) -> None:
+        """Fit 2*sqrt(N) centroids with spherical k-means on a sample, then regroup every row by list."""
+        with self._lock:
+            n = self._size
+            data = self._vectors[:n]
+            nlist = int(min(2048, max(1, 2 * np.sqrt(n))))
+            rng = np.random.default_rng(42)
+            sample = data[rng.choice(n, size=min(sample_size, n), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assign, sample)
+                filled = np.bincount(assign, minlength=nlist) > 0
+                centroids[filled] = sums[filled]
+                centroids = _normalize(centroids)
+            self.centroids = centroids.astype(np.float32)
+
+            lists = self._assign(data)
+            order = np.argsort(lists, kind="stable")
+            self._vectors[:n] = data[order]
+            self._label_of_row[:n] = self._label_of_row[:n][order]
+            self._list_of_row[:n] = lists[order]
+            self.ids = [self.ids[i] for i in order]
+            self.labels = [self.labels[i] for i in order]
+            self._rows = {node_id: row for row, node_id in enumerate(self.ids)}
+            self._bounds = np.searchsorted(self._list_of_row[:n], np.arange(nlist + 1))
+            self._overflow, self._overflow_cache = {}, {}
+            self._trained_size = n
+
+    def _assign(self, data: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        out = np.empty(len(data), dtype=np.int32)
+        for start in range(0, len(data), chunk):
+            out[start:start + chunk] = np.argmax(data[start:start + chunk] @ self.centroids.T, axis=1)
+        return out
+
+    def _overflow_rows(self, list_id: int) -> np.ndarray:
+        rows = self._overflow_cache.get(list_id)
+        if rows is None:
+            rows = np.array(self._overflow.get(list_id, []), dtype=np.int64)
+            self._overflow_cache[list_id] = rows
+        return rows
+
+    # --- Reads ---
+    def search(self, vector, k: int = 10, labels: list[str] = None, nprobe: int = IVF_NPROBE) -> list[dict]:
+        """Return the k most similar rows as {"id", "label", "score"}, best first."""
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+        with self._lock:
+            if self._size == 0:
+                return []
+            if self.centroids is None:
+                rows = np.arange(self._size)
+                scores = self._vectors[:self._size] @ query
+            else:
+                row_parts, score_parts = [], []
+                for c in np.argsort(-(self.centroids @ query))[:nprobe]:
+                    lo, hi = self._bounds[c], self._bounds[c + 1]
+                    row_parts.append(np.arange(lo, hi))
+                    score_parts.append(self._vectors[lo:hi] @ query)
+                    extra = self._overflow_rows(c)
+                    if len(extra):
+                        row_parts.append(extra)
+                        score_parts.append(self._vectors[extra] @ query)
+                rows, scores = np.concatenate(row_parts), np.concatenate(score_parts)
+            if labels:
+                codes = [self._label_codes[l] for l in labels if l in self._label_codes]
+                keep = np.isin(self._label_of_row[rows], codes)
+                rows, scores = rows[keep], scores[keep]
+            if len(rows) == 0:
+                return []
+            top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"id": self.ids[rows[i]], "label": self.labels[rows[i]], "score": float(scores[i])}
+                for i in top
+            ]
+
+    # --- Persistence ---
+    def save(self, path: str = INDEX_PATH) -> None:
+        """Atomically write the index to disk."""
+        with self._lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp.{os.getpid()}.npz"
+            np.savez(
+                tmp,
+                vectors=self._vectors[:self._size],
+                ids=np.array(self.ids, dtype=str),
+                labels=np.array(self.labels, dtype=str),
+                lists=self._list_of_row[:self._size],
+                centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+                trained_size=np.array([self._trained_size])
+            )
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> "VectorIndex":
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            index = cls(dim=vectors.shape[1])
+            index._vectors = np.array(vectors, dtype=np.float32)
+            index._size = len(vectors)
+            index.ids = data["ids"].tolist()
+            index.labels = data["labels"].tolist()
+            index._rows = {node_id: row for row, node_id in enumerate(index.ids)}
+            index._label_of_row = np.array([index._label_code(l) for l in index.labels], dtype=np.int16)
+            index._list_of_row = np.array(data["lists"], dtype=np.int32)
+            index._trained_size = int(data["trained_size"][0])
+            if len(data["centroids"]):
+                index.centroids = np.array(data["centroids"], dtype=np.float32)
+                trained = index._list_of_row[:index._trained_size]
+                index._bounds = np.searchsorted(trained, np.arange(len(index.centroids) + 1))
+                for row in range(index._trained_size, index._size):
+                    index._overflow.setdefault(int(index._list_of_row[row]), []).append(row)
+        return index
+
+# --- Process-wide Index ---
+# The `build_vector_index` job is the only writer of INDEX_PATH. Web workers load it read-only,
+# reload when a newer build lands, and keep nodes they indexed since then in `_pending` so their
+# own writes stay searchable until the rebuild (which reads them from the graph) includes them.
+_index = None
+_loaded_mtime = 0.0
+_index_lock = threading.Lock()
+_pending = {}
+_pending_adds = 0
+_build_requested_at = 0.0
+
+def _request_build(reason: str) -> None:
+    """Queue a rebuild on the job worker (deduplicated there; retried here after BUILD_RETRY_AFTER)."""
+    global _build_requested_at
+    if time.time() - _build_requested_at < BUILD_RETRY_AFTER:
+        return
+    _build_requested_at = time.time()
+    try:
+        from core.job_queue import enqueue_job
+        enqueue_job("build_vector_index", {"reason": reason})
+    except Exception as e:
+        logging.error(f"[vector_index] Could not queue a rebuild: {e}")
+
+def get_vector_index() -> VectorIndex:
+    """The persisted index plus this worker's pending additions; never builds in the caller."""
+    global _index, _loaded_mtime, _build_requested_at
+    try:
+        mtime = os.path.getmtime(INDEX_PATH)
+    except OSError:
+        mtime = 0.0
+    if _index is None or mtime > _loaded_mtime:
+        with _index_lock:
+            if _index is None or mtime > _loaded_mtime:
+                index = None
+                if mtime:
+                    try:
+                        index = VectorIndex.load(INDEX_PATH)
+                    except Exception as e:
+                        logging.error(f"[vector_index] Could not load {INDEX_PATH}: {e}")
+                if index is None:
+                    index = _index or VectorIndex()
+                else:
+                    _build_requested_at = 0.0
+                    for node_id in [n for n in _pending if n in index._rows]:
+                        del _pending[node_id]
+                    for node_id, (vec, label) in _pending.items():
+                        index.add([node_id], [vec], [label])
+                _index, _loaded_mtime = index, mtime
+    if not mtime:
+        _request_build("missing")
+    return _index
+
+def build_index_from_graph(labels: list[str] = None, page_size: int = BUILD_PAGE_SIZE) -> VectorIndex:
+    """Page through every embedded node (keyset on id) and index it, then persist (the `build_vector_index` job)."""
+    index = VectorIndex()
+    for label in labels or INDEXED_EMBEDDING_LABELS:
+        after = ""
+        while True:
+            result = run_read_query(f"""
+            MATCH (n:{label})
+            WHERE n.id > $after AND n.embedding IS NOT NULL
+            RETURN n.id AS id, n.embedding AS embedding
+            ORDER BY n.id
+            LIMIT $limit
+            """, {"after": after, "limit": page_size})
+            records = result.get("result", [])
+            rows = [(r["id"], unpack_embedding(r.get("embedding"))) for r in records]
+            rows = [(node_id, vec) for node_id, vec in rows if vec is not None and vec.shape == (index.dim,)]
+            if rows:
+                index.add([node_id for node_id, _ in rows], [vec for _, vec in rows], [label] * len(rows))
+            if len(records) < page_size:
+                break
+            after = records[-1]["id"]
+    index.save()
+    log_action("vector_index", "build", f"Indexed {len(index)} embeddings from the graph")
+    return index
+
+def index_node(node_id: str, embedding, label: str) -> None:
+    """
+    Make a new node searchable in this worker right away. Nothing is written to disk here;
+    after REBUILD_AFTER local additions a rebuild job is queued so other workers see them too.
+    Without a job worker no build lands, so only the newest PENDING_MAX additions are kept
+    for re-applying; the in-memory index itself still holds every one of them.
+    """
+    global _pending_adds
+    vec = np.asarray(embedding, dtype=np.float32)
+    index = get_vector_index()
+    if vec.shape != (index.dim,):
+        return
+    index.add([node_id], [vec], [label])
+    with _index_lock:
+        _pending.pop(node_id, None)
+        _pending[node_id] = (vec, label)
+        while len(_pending) > PENDING_MAX:
+            del _pending[next(iter(_pending))]
+        _pending_adds += 1
+        due = _pending_adds % REBUILD_AFTER == 0
+    if due:
+        _request_build("pending")
+
+def find_similar(text_or_vector, k: int = 10, labels: list[str] = None) -> list[dict]:
+    """Semantic recall: k nearest Event/Dream/TimelineEntry nodes to a text or an embedding."""
+    if isinstance(text_or_vector, str):
+        text_or_vector = embed_text(text_or_vector)
+    return get_vector_index().search(text_or_vector, k=k, labels=labels)
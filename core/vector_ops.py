@@ -1,31 +1,70 @@
 # core/vector_ops.py — Embedding + Dimensionality Ops
-import openai
+import os
 import numpy as np
-from sklearn.preprocessing import normalize
-from umap import UMAP
-from hdbscan import HDBSCAN
 from typing import List, Dict, Tuple
 
 from core.llm_tools import prompt_claude, prompt_gpt
+from core.llm_clients import get_openai
 from core.logging_engine import log_action
+from core.embedding_cache import get_cached_embedding, cache_embedding
 
 # --- Constants ---
 EMBED_DIM = 1536
 CLUSTER_MIN_SAMPLES = 5
 CLUSTER_MIN_CLUSTER_SIZE = 8
+OPENAI_EMBED_MODEL = "text-embedding-3-small"
+OPENAI_EMBED_BATCH_LIMIT = 2048  # max inputs per embeddings request
 
 embedding_model_options = ["openai", "claude", "gemini"]
 
+# How embeddings are written to the graph: "float32" / "float16" little-endian byte arrays, or "list" (legacy).
+EMBEDDING_STORAGE = os.getenv("EMBEDDING_STORAGE", "float32").lower()
+_STORAGE_DTYPES = {"float32": "<f4", "float16": "<f2"}
+# Packed blobs start with one byte naming their dtype (the item size), so decoding never guesses from length.
+# Headerless blobs from before the tag have an even length and were written under EMBEDDING_STORAGE.
+_DTYPE_TAGS = {"<f4": 4, "<f2": 2}
+_TAG_DTYPES = {tag: dtype for dtype, tag in _DTYPE_TAGS.items()}
+
+# --- Graph Storage Encoding ---
+def pack_embedding(embedding, storage: str = None):
+    """Encode an embedding for a node property: 6 KB of float32 bytes (3 KB float16) instead of 1536 boxed floats."""
+    if embedding is None:
+        return None
+    dtype = _STORAGE_DTYPES.get(storage or EMBEDDING_STORAGE)
+    if dtype is None:
+        return list(embedding)
+    return bytes([_DTYPE_TAGS[dtype]]) + np.asarray(embedding, dtype=dtype).tobytes()
+
+def unpack_embedding(value):
+    """Decode a stored embedding (tagged byte array, legacy bytes or legacy list) to a float32 vector; None if absent."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) % 2:
+            dtype = _TAG_DTYPES.get(value[0])
+            if dtype is None:
+                return None
+            return np.frombuffer(value, dtype=dtype, offset=1).astype(np.float32)
+        dtype = _STORAGE_DTYPES.get(EMBEDDING_STORAGE, "<f4")
+        return np.frombuffer(value, dtype=dtype).astype(np.float32)
+    return np.asarray(value, dtype=np.float32)
+
 # --- Core Embedding ---
 def embed_text(text: str, model: str = "openai") -> List[float]:
-    """Return a 1536-dim embedding for a given text using the specified model."""
+    """Return a 1536-dim embedding for a given text using the specified model (cached by content hash)."""
+    cache_model = f"openai:{OPENAI_EMBED_MODEL}" if model == "openai" else model
+    cached = get_cached_embedding(cache_model, text)
+    if cached is not None:
+        return cached.tolist()
     try:
         if model == "openai":
-            response = openai.Embedding.create(
+            response = get_openai().Embedding.create(
                 input=text,
-                model="text-embedding-3-small"
+                model=OPENAI_EMBED_MODEL
             )
-            return response['data'][0]['embedding']
+            embedding = response['data'][0]['embedding']
+            cache_embedding(cache_model, text, embedding)
+            return embedding
         elif model == "claude":
             # Claude embedding via LLM simulation
             prompt = f"Return a normalized 1536-dim embedding vector for: {text}"
@@ -37,32 +76,155 @@ def embed_text(text: str, model: str = "openai") -> List[float]:
         log_action("vector_ops", "embed_error", f"Failed to embed text: {str(e)}")
         return [0.0] * EMBED_DIM
 
+def embed_texts(texts: List[str], model: str = "openai", batch_size: int = OPENAI_EMBED_BATCH_LIMIT) -> np.ndarray:
+    """
+    Embed many texts with as few remote calls as possible.
+    Returns a contiguous float32 matrix of shape (len(texts), EMBED_DIM), rows in input order.
+    Repeated strings are embedded once; cached ones are not sent at all.
+    """
+    out = np.zeros((len(texts), EMBED_DIM), dtype=np.float32)
+    if not texts:
+        return out
+    if model != "openai":
+        for i, text in enumerate(texts):
+            vec = embed_text(text, model=model)
+            if isinstance(vec, list) and len(vec) == EMBED_DIM:
+                out[i] = vec
+        return out
+
+    cache_model = f"openai:{OPENAI_EMBED_MODEL}"
+    positions = {}
+    for i, text in enumerate(texts):
+        positions.setdefault(text, []).append(i)
+
+    pending = []
+    for text, rows in positions.items():
+        cached = get_cached_embedding(cache_model, text)
+        if cached is not None:
+            out[rows] = cached
+        else:
+            pending.append(text)
+
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        try:
+            response = get_openai().Embedding.create(input=chunk, model=OPENAI_EMBED_MODEL)
+        except Exception as e:
+            log_action("vector_ops", "embed_error", f"Failed to embed batch of {len(chunk)}: {str(e)}")
+            continue
+        for item in response['data']:
+            text = chunk[item['index']]
+            out[positions[text]] = item['embedding']
+            cache_embedding(cache_model, text, item['embedding'])
+
+    return out
+
 # --- Dimensionality Reduction ---
 def reduce_dimensions(embeddings: List[List[float]], n_components: int = 2) -> List[List[float]]:
-    """Apply UMAP to reduce high-dim embeddings to lower-dim for clustering or viz."""
+    """
+    Project high-dim embeddings to lower-dim for clustering or viz.
+    Uses the persisted reducer from core.cluster_service when it has this shape; only a request
+    the persisted model can't serve (other dimensionality or target size) pays for a one-off fit.
+    """
+    from core.cluster_service import get_cluster_service, schedule_refit_if_needed
+    data = np.asarray(embeddings, dtype=np.float32)
+    service = get_cluster_service()
+    if service.serves(data.shape[-1]) and service.reducer is not None and service.n_components == n_components:
+        return service.transform(data).tolist()
+    if data.shape[-1] == EMBED_DIM:
+        schedule_refit_if_needed()
+    from umap import UMAP  # heavy (numba/pynndescent); only loaded when no persisted reducer fits
     umap_model = UMAP(n_components=n_components, random_state=42)
-    return umap_model.fit_transform(embeddings).tolist()
+    return umap_model.fit_transform(data).tolist()
 
 # --- Clustering ---
 def cluster_embeddings(embeddings: List[List[float]]) -> Tuple[List[int], Dict]:
-    """Apply HDBSCAN and return cluster labels + metadata (e.g., soft memberships)."""
+    """
+    Return cluster labels + metadata (the HDBSCAN model, labels, strengths).
+    Points are placed into the persisted clustering (approximate_predict, no refit) when one
+    is fitted for their dimensionality; otherwise a one-off HDBSCAN fit is run.
+    """
+    from core.cluster_service import get_cluster_service, predict_clusters, schedule_refit_if_needed
+    data = np.asarray(embeddings, dtype=np.float32)
+    service = get_cluster_service()
+    if service.serves(data.shape[-1]):
+        labels, strengths = predict_clusters(data)
+        return labels.tolist(), {"model": service.clusterer, "labels": labels, "strengths": strengths}
+    if data.shape[-1] == EMBED_DIM:
+        schedule_refit_if_needed()
+    from hdbscan import HDBSCAN
     cluster_model = HDBSCAN(
         min_samples=CLUSTER_MIN_SAMPLES,
         min_cluster_size=CLUSTER_MIN_CLUSTER_SIZE,
         prediction_data=True
     )
-    cluster_labels = cluster_model.fit_predict(embeddings)
+    cluster_labels = cluster_model.fit_predict(data)
     return cluster_labels.tolist(), {"model": cluster_model, "labels": cluster_labels}
 
-def get_soft_cluster_memberships(embedding: List[float], cluster_model) -> Dict[str, float]:
-    """Return soft membership scores across clusters for a single embedding."""
-    import hdbscan.prediction
-    membership = hdbscan.prediction.membership_vector(cluster_model, [embedding])[0]
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class MiniBatchClusterer:
+    """
+    Spherical mini-batch k-means over cosine similarity, fed one page at a time.
+    Memory stays at one page plus the centroids, so it can cluster a streamed graph sweep.
+    """
+
+    def __init__(self, n_clusters: int = 8, seed: int = 42):
+        self.n_clusters = n_clusters
+        self.centroids = np.zeros((0, EMBED_DIM), dtype=np.float32)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def _seed(self, batch: np.ndarray) -> None:
+        # Farthest-first: fill open slots with the rows least similar to any existing centroid.
+        while len(self.centroids) < min(self.n_clusters, len(self.centroids) + len(batch)):
+            if len(self.centroids) == 0:
+                pick = int(self._rng.integers(len(batch)))
+            else:
+                pick = int(np.argmin((batch @ self.centroids.T).max(axis=1)))
+            self.centroids = np.vstack([self.centroids, batch[pick]])
+            self.counts = np.append(self.counts, 0)
+
+    def partial_fit(self, vectors) -> Tuple[np.ndarray, np.ndarray]:
+        """Fold a page into the centroids; returns each row's cluster and its cosine similarity to it."""
+        batch = _unit_rows(np.asarray(vectors, dtype=np.float32).reshape(-1, self.centroids.shape[1]))
+        if len(batch) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if len(self.centroids) < self.n_clusters:
+            self._seed(batch)
+        labels = np.argmax(batch @ self.centroids.T, axis=1)
+        for c in np.unique(labels):
+            rows = batch[labels == c]
+            self.counts[c] += len(rows)
+            rate = len(rows) / self.counts[c]
+            self.centroids[c] = (1 - rate) * self.centroids[c] + rate * rows.mean(axis=0)
+        self.centroids = _unit_rows(self.centroids)
+        sims = np.einsum("ij,ij->i", batch, self.centroids[labels])
+        return labels, sims
+
+def get_soft_cluster_memberships(embedding: List[float], cluster_model=None) -> Dict[str, float]:
+    """
+    Return soft membership scores across clusters for a single embedding.
+    Without a cluster_model, the persisted clustering service's model is used.
+    """
+    if cluster_model is None:
+        from core.cluster_service import get_cluster_service, schedule_refit_if_needed
+        service = get_cluster_service()
+        schedule_refit_if_needed()
+        if not service.serves(len(embedding)):
+            return {}
+        membership = service.memberships([embedding])[0]
+    else:
+        import hdbscan.prediction
+        membership = hdbscan.prediction.membership_vector(cluster_model, [embedding])[0]
     return {f"cluster_{i}": float(score) for i, score in enumerate(membership)}
 
 # --- Optional Cluster Labeling ---
 def label_clusters(clusters: Dict, texts: List[str]) -> Dict[int, str]:
     """Use Claude/GPT to generate human-readable labels for each cluster."""
     prompt = f"Given the following grouped texts, label each group with a meaningful concept:\n{clusters}"
-    label_output = prompt_claude(prompt)
+    label_output = prompt_claude(prompt, cache=True)
     return label_output  # Must be structured by calling function
@@ -1,22 +1,51 @@
 # models/claude.py
 import os
-import anthropic
+
+from core.llm_clients import get_anthropic_client
+from core.rate_limit import call_with_limits, get_limiter, throttle
 
 class ClaudeWrapper:
+    provider = "claude"
+
     def __init__(self, model="claude-3-opus-20240229", api_key=None):
         self.model = model
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+
+    @property
+    def client(self):
+        # Shared per-process client, created on first call rather than at registry import.
+        return get_anthropic_client(self.api_key)
 
     def __call__(self, prompt, temperature=0.7, max_tokens=1024, system_prompt=None):
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        response = self.client.messages.create(
+
+        def request():
+            raw = self.client.messages.with_raw_response.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            get_limiter(self.provider).observe_headers(raw.headers)
+            return raw.parse()
+
+        response = call_with_limits(self.provider, request)
+        return response.content[0].text.strip()
+
+    def stream(self, prompt, temperature=0.7, max_tokens=1024, system_prompt=None):
+        """Yield text deltas as Claude produces them."""
+        kwargs = {"system": system_prompt} if system_prompt else {}
+        throttle(self.provider)
+        with self.client.messages.stream(
             model=self.model,
-            messages=messages,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
             temperature=temperature,
-        )
-        return response.content[0].text.strip()
+            **kwargs
+        ) as response:
+            for text in response.text_stream:
+                if text:
+                    yield text
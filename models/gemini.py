@@ -1,17 +1,32 @@
 # models/gemini.py
 import os
-import google.generativeai as genai
+
+from core.llm_clients import get_gemini_model
+from core.rate_limit import call_with_limits, throttle
 
 class GeminiWrapper:
+    provider = "gemini"
+
     def __init__(self, model="gemini-pro", api_key=None):
         self.model = model
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        genai.configure(api_key=self.api_key)
 
     def __call__(self, prompt, temperature=0.7, max_tokens=1024, system_prompt=None):
-        model = genai.GenerativeModel(self.model)
+        model = get_gemini_model(self.model, self.api_key)
         full_prompt = prompt
         if system_prompt:
             full_prompt = system_prompt + "\n" + prompt
-        response = model.generate_content(full_prompt)
+        response = call_with_limits(self.provider, lambda: model.generate_content(full_prompt))
         return response.text.strip() if hasattr(response, "text") else str(response)
+
+    def stream(self, prompt, temperature=0.7, max_tokens=1024, system_prompt=None):
+        """Yield text chunks from a streamed generate_content call."""
+        model = get_gemini_model(self.model, self.api_key)
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = system_prompt + "\n" + prompt
+        throttle(self.provider)
+        for chunk in model.generate_content(full_prompt, stream=True):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
@@ -1,22 +1,44 @@
 # models/gpt.py
-import openai
 import os
 
+from core.llm_clients import get_openai
+from core.rate_limit import call_with_limits, throttle
+
 class GPTWrapper:
+    provider = "gpt"
+
     def __init__(self, model="gpt-4", api_key=None):
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        openai.api_key = self.api_key
 
     def __call__(self, prompt, temperature=0.7, max_tokens=512, system_prompt=None):
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        response = openai.ChatCompletion.create(
+        response = call_with_limits(self.provider, lambda: get_openai(self.api_key).ChatCompletion.create(
             model=self.model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
-        )
+        ))
         return response.choices[0].message.content.strip()
+
+    def stream(self, prompt, temperature=0.7, max_tokens=512, system_prompt=None):
+        """Yield content deltas from a streamed chat completion."""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        throttle(self.provider)
+        response = get_openai(self.api_key).ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in response:
+            text = chunk["choices"][0].get("delta", {}).get("content")
+            if text:
+                yield text
@@ -4,6 +4,10 @@ from .auth import auth_bp
 from .chat import chat_bp
 from .dreams import dreams_bp
 from .events import events_bp
+from .identity import identity_bp
+from .jobs import jobs_bp
+from .metrics import metrics_bp
+from .schema import schema_bp
 from .timeline import timeline_bp
 
 def register_blueprints(app):
@@ -16,4 +20,8 @@ def register_blueprints(app):
     app.register_blueprint(chat_bp, url_prefix='/api')
     app.register_blueprint(dreams_bp, url_prefix='/api')
     app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(identity_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp, url_prefix='/api')
+    app.register_blueprint(schema_bp, url_prefix='/api')
     app.register_blueprint(timeline_bp, url_prefix='/api')
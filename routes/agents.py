@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify
 from core.agent_manager import get_agent_roster
 from core.auth import verify_token, is_admin
 from core.logging_engine import log_action
+from routes.pagination import page_args
 
 agents_bp = Blueprint('agents', __name__)
 
@@ -20,17 +21,22 @@ def get_all_agents():
 
 @agents_bp.route('/agents/<agent_id>/logs', methods=['GET'])
 def get_agent_logs(agent_id):
-    """Return action logs for a specific agent."""
+    """
+    Return action logs for a specific agent, newest first, one page at a time.
+    Query: limit, cursor (from next_cursor), fields=a,b, since, until, type.
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = verify_token(token)
     if 'error' in user or not is_admin(user):
         return jsonify({"error": "Forbidden"}), 403
 
-    from core.logging_engine import get_recent_logs
-    logs = get_recent_logs(limit=100)
-    agent_logs = [log for log in logs if log.get("source") == agent_id]
+    from core.logging_engine import get_logs_page
+    try:
+        page = get_logs_page(agent_id, **page_args(request.args, ("type",), default_limit=100))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     log_action("routes/agents", "logs", f"Returned logs for {agent_id}")
-    return jsonify({"logs": agent_logs})
+    return jsonify({"logs": page["items"], "next_cursor": page["next_cursor"]})
 
 @agents_bp.route('/agents/<agent_id>/retire', methods=['POST'])
 def retire_agent(agent_id):
@@ -1,6 +1,8 @@
-from flask import Blueprint, request, jsonify
+import json
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from core.memory_engine import store_event
-from core.agent_manager import assign_task
+from core.agent_manager import assign_task, stream_task
 from core.logging_engine import log_action
 from core.auth import verify_token
 from flask_socketio import emit
@@ -32,6 +34,14 @@ def chat_with_soul():
             agent_origin=user["username"]
         )
 
+        # Streaming mode: Server-Sent Events, one `token` event per chunk, then `done`
+        if _wants_stream(data):
+            return Response(
+                stream_with_context(_sse_tokens(user["username"], user_message, event)),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
         # Assign task to agent
         response_obj = assign_task(
             agent_id="gpt_writer",
@@ -56,6 +66,30 @@ def chat_with_soul():
         return jsonify({"error": "Internal server error"}), 500
 
 
+def _wants_stream(data: dict) -> bool:
+    if data.get("stream") or request.args.get("stream", "").lower() in ("1", "true"):
+        return True
+    return "text/event-stream" in request.headers.get("Accept", "")
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def _sse_tokens(username: str, user_message: str, event: dict):
+    """Relay agent tokens as they arrive; the full reply is sent again in the final `done` event."""
+    chunks = []
+    try:
+        for token in stream_task(agent_id="gpt_writer", task="respond", context={"event": event}):
+            chunks.append(token)
+            yield _sse("token", {"token": token})
+    except Exception as e:
+        log_action("chat_route", "agent_error", str(e))
+        yield _sse("error", {"error": str(e)})
+        return
+    final_response = "".join(chunks).strip()
+    log_action("chat_route", "message_exchange", f"{username} → {user_message} → {final_response}")
+    yield _sse("done", {"response": final_response, "event_id": event.get("id")})
+
+
 @chat_bp.route('/chat/history', methods=['GET'])
 def get_chat_history():
     """
@@ -1,6 +1,7 @@
 # routes/dreams.py — Dreamscape API
 from flask import Blueprint, request, jsonify
-from core.graph_io import run_read_query
+from core.graph_io import run_read_query, project_node, node_from_projection, paginate_nodes
+from routes.pagination import page_args
 from core.auth import verify_token
 from core.logging_engine import log_action
 
@@ -8,22 +9,21 @@ dreams_bp = Blueprint('dreams', __name__)
 
 @dreams_bp.route('/dreams', methods=['GET'])
 def get_all_dreams():
-    """Return recent or significant dream nodes."""
+    """
+    Return recent dream nodes, newest first, one page at a time.
+    Query: limit, cursor (from next_cursor), fields=a,b, since, until, trigger_reason, status.
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = verify_token(token)
     if 'error' in user:
         return jsonify({"error": "Unauthorized"}), 401
 
-    limit = int(request.args.get("limit", 20))
-    query = """
-    MATCH (d:Dream)
-    RETURN d
-    ORDER BY d.timestamp DESC
-    LIMIT $limit
-    """
-    dreams = run_read_query(query, {"limit": limit})
-    log_action("routes/dreams", "list", f"Returned {len(dreams)} dreams")
-    return jsonify({"dreams": dreams})
+    try:
+        page = paginate_nodes("Dream", **page_args(request.args, ("trigger_reason", "status"), default_limit=20))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    log_action("routes/dreams", "list", f"Returned {len(page['items'])} dreams")
+    return jsonify({"dreams": page["items"], "next_cursor": page["next_cursor"]})
 
 @dreams_bp.route('/dreams/<dream_id>', methods=['GET'])
 def get_dream_by_id(dream_id):
@@ -33,9 +33,9 @@ def get_dream_by_id(dream_id):
     if 'error' in user:
         return jsonify({"error": "Unauthorized"}), 401
 
-    query = "MATCH (d:Dream {id: $id}) RETURN d LIMIT 1"
-    result = run_read_query(query, {"id": dream_id})
-    if not result:
+    query = f"MATCH (d:Dream {{id: $id}}) RETURN {project_node('d')} AS d LIMIT 1"
+    records = run_read_query(query, {"id": dream_id}).get("result", [])
+    if not records:
         return jsonify({"error": "Not found"}), 404
     log_action("routes/dreams", "get", f"Returned dream {dream_id}")
-    return jsonify({"dream": result[0]["d"]})
+    return jsonify({"dream": node_from_projection(records[0]["d"])})
@@ -4,7 +4,8 @@ from core.memory_engine import store_event
 from core.agent_manager import assign_task
 from core.auth import verify_token, is_admin
 from core.logging_engine import log_action
-from core.graph_io import run_read_query
+from core.graph_io import paginate_nodes
+from routes.pagination import page_args
 
 events_bp = Blueprint('events', __name__)
 
@@ -35,16 +36,21 @@ def post_event():
 
 @events_bp.route('/events', methods=['GET'])
 def get_all_events():
-    """Return all stored events (admin only), normalized."""
+    """
+    Return stored events (admin only), newest first, one page at a time.
+    Query: limit, cursor (from next_cursor), fields=a,b, since, until, agent_origin, status, type.
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = verify_token(token)
     if 'error' in user or not is_admin(user):
         return jsonify({"error": "Forbidden"}), 403
 
-    # Always unpack Neo4j objects, only return the event dicts
-    results = run_read_query("MATCH (e:Event) RETURN e ORDER BY e.timestamp DESC LIMIT 100")
-    events = [r["e"] for r in results if "e" in r and isinstance(r["e"], dict)]
-    return jsonify({"events": events})
+    # Embeddings stay server-side; filtering and projection happen in Cypher
+    try:
+        page = paginate_nodes("Event", **page_args(request.args, ("agent_origin", "status", "type"), default_limit=100))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"events": page["items"], "next_cursor": page["next_cursor"]})
 
 # If you ever add endpoints to fetch a single event by ID,
 # always unpack as above:
@@ -0,0 +1,42 @@
+# routes/identity.py — Identity Cluster and Philosophy Timeline API (streamed)
+from flask import Blueprint, request, jsonify
+from core.identity_memory import stream_identity_clusters, stream_identity_shift
+from core.philosophy_log import stream_philosophical_timeline
+from core.auth import verify_token
+from routes.ndjson import ndjson_response
+
+identity_bp = Blueprint('identity', __name__)
+
+@identity_bp.route('/identity/clusters', methods=['GET'])
+def get_identity_clusters():
+    """Stream every identity cluster with its member ids as NDJSON, one cluster per line."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return ndjson_response(stream_identity_clusters(), "routes/identity", "get_clusters")
+
+@identity_bp.route('/identity/clusters/<cluster_id>/shift', methods=['GET'])
+def get_identity_shift(cluster_id):
+    """Stream a cluster's member nodes oldest first as NDJSON. Query: since (ISO date, optional)."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    since = request.args.get("since") or None
+    return ndjson_response(stream_identity_shift(cluster_id, since), "routes/identity", "get_shift")
+
+@identity_bp.route('/philosophy/timeline', methods=['GET'])
+def get_philosophy_timeline():
+    """Stream philosophical changes since a date in chronological order as NDJSON. Query: since (required)."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    since = request.args.get("since")
+    if not since:
+        return jsonify({"error": "'since' is required"}), 400
+    return ndjson_response(stream_philosophical_timeline(since), "routes/identity", "get_philosophy_timeline")
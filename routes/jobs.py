@@ -0,0 +1,99 @@
+# routes/jobs.py — Background Job API
+from flask import Blueprint, request, jsonify
+from core.job_queue import enqueue_job, get_job, list_jobs, cancel_job, JOB_HANDLERS, JOB_STATUSES
+from core.auth import verify_token
+from core.logging_engine import log_action
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a long-running engine run: { kind, payload, priority, dedup }. Returns 202 with the job."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or {}
+    kind = data.get("kind")
+    if kind not in JOB_HANDLERS:
+        return jsonify({"error": f"Unknown job kind. Expected one of {sorted(JOB_HANDLERS)}"}), 400
+    if not isinstance(data.get("payload", {}), dict):
+        return jsonify({"error": "'payload' must be an object"}), 400
+
+    try:
+        priority = int(data.get("priority", 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'priority' must be an integer"}), 400
+    dedup = data.get("dedup", True)
+    if not isinstance(dedup, bool):
+        return jsonify({"error": "'dedup' must be a boolean"}), 400
+
+    job = enqueue_job(
+        kind,
+        data.get("payload") or {},
+        priority=priority,
+        dedup=dedup
+    )
+    log_action("routes/jobs", "submit", f"{user.get('username', 'unknown')} queued {job['id']} ({kind})")
+    return jsonify({"job": job}), 202
+
+@jobs_bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """List recent jobs, optionally filtered by ?status= and ?kind= (results omitted)."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    status = request.args.get("status")
+    if status and status not in JOB_STATUSES:
+        return jsonify({"error": f"Unknown status. Expected one of {JOB_STATUSES}"}), 400
+    try:
+        limit = min(int(request.args.get("limit", 50)), 500)
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+    return jsonify({"jobs": list_jobs(status=status, kind=request.args.get("kind"), limit=limit)})
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Return a job's status, plus its result once it has succeeded."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"job": job})
+
+@jobs_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Return only the result: 200 when succeeded, 202 while pending, 409 if it failed or was cancelled."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    if job["status"] == "succeeded":
+        return jsonify({"result": job.get("result")})
+    if job["status"] in ("queued", "running"):
+        return jsonify({"status": job["status"]}), 202
+    return jsonify({"status": job["status"], "error": job.get("error")}), 409
+
+@jobs_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_queued_job(job_id):
+    """Cancel a job that hasn't started."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if not cancel_job(job_id):
+        return jsonify({"error": "Job not found or already started"}), 409
+    log_action("routes/jobs", "cancel", f"Job {job_id} cancelled")
+    return jsonify({"status": "cancelled", "id": job_id})
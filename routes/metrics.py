@@ -0,0 +1,24 @@
+# routes/metrics.py — Runtime Metrics API (admin)
+from flask import Blueprint, request, jsonify
+from core.graph_io import get_pool_metrics
+from core.rate_limit import get_limiter_metrics
+from core.response_cache import get_response_cache_stats
+from core.job_queue import get_job_queue
+from core.auth import verify_token, is_admin
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Neo4j pool usage and acquisition waits, LLM limiter and cache counters, job queue depth (admin only)."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user or not is_admin(user):
+        return jsonify({"error": "Forbidden"}), 403
+
+    return jsonify({
+        "neo4j_pool": get_pool_metrics(),
+        "llm_rate_limits": get_limiter_metrics(),
+        "llm_response_cache": get_response_cache_stats(),
+        "jobs": get_job_queue().counts()
+    })
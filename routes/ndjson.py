@@ -0,0 +1,29 @@
+# routes/ndjson.py — Newline-Delimited JSON Responses for Graph Sweeps
+import json
+
+from flask import Response, stream_with_context
+from core.logging_engine import log_action
+
+def ndjson_response(records, source: str, action: str) -> Response:
+    """
+    Stream records (any iterable, usually a stream_read_query generator) as one JSON object
+    per line, so a sweep never sits in memory. The status is sent before the first record,
+    so a failure mid-stream ends the body with an {"error": ...} line instead.
+    """
+    def lines():
+        count = 0
+        try:
+            for record in records:
+                count += 1
+                yield json.dumps(record, default=str) + "\n"
+        except Exception as e:
+            log_action(source, f"{action}_error", str(e))
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        log_action(source, action, f"Streamed {count} records")
+
+    return Response(
+        stream_with_context(lines()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
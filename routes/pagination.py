@@ -0,0 +1,16 @@
+# routes/pagination.py — Shared Query-String Parsing for Paginated List Endpoints
+
+def page_args(args, filter_params: tuple = (), default_limit: int = 50) -> dict:
+    """
+    Turn ?limit=&cursor=&fields=a,b&since=&until=&<filter>= into paginate_nodes kwargs.
+    Only names in filter_params become property filters. Raises ValueError on a bad limit.
+    """
+    fields = [f.strip() for f in args.get("fields", "").split(",") if f.strip()]
+    return {
+        "limit": int(args.get("limit", default_limit)),
+        "cursor": args.get("cursor") or None,
+        "fields": fields or None,
+        "since": args.get("since") or None,
+        "until": args.get("until") or None,
+        "filters": {name: args[name] for name in filter_params if args.get(name)}
+    }
@@ -0,0 +1,19 @@
+# routes/schema.py — Graph Schema Maintenance API (admin)
+from flask import Blueprint, request, jsonify
+from utils.schema_tools import stream_orphan_nodes
+from core.auth import verify_token, is_admin
+from routes.ndjson import ndjson_response
+
+schema_bp = Blueprint('schema', __name__)
+
+@schema_bp.route('/schema/orphans/<label>', methods=['GET'])
+def get_orphan_nodes(label):
+    """Stream nodes of a label that have no relationships as NDJSON (admin only)."""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = verify_token(token)
+    if 'error' in user or not is_admin(user):
+        return jsonify({"error": "Forbidden"}), 403
+    if not label.isidentifier():  # interpolated into the Cypher label position
+        return jsonify({"error": "Invalid label"}), 400
+
+    return ndjson_response(stream_orphan_nodes(label), "routes/schema", "find_orphans")
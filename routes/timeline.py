@@ -1,6 +1,7 @@
 # routes/timeline.py — Timeline Narrative API
 from flask import Blueprint, request, jsonify
-from core.timeline_engine import get_timeline_entries
+from core.timeline_engine import get_timeline_page
+from routes.pagination import page_args
 from core.auth import verify_token
 from core.logging_engine import log_action
 
@@ -8,16 +9,21 @@ timeline_bp = Blueprint('timeline', __name__)
 
 @timeline_bp.route('/timeline', methods=['GET'])
 def get_timeline():
-    """Return recent timeline entries for UI rendering."""
+    """
+    Return timeline entries for UI rendering, newest first, one page at a time.
+    Query: limit, cursor (from next_cursor), fields=a,b, since, until, status, type.
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = verify_token(token)
     if 'error' in user:
         return jsonify({"error": "Unauthorized"}), 401
 
-    limit = int(request.args.get("limit", 50))
-    entries = get_timeline_entries(limit=limit)
-    log_action("routes/timeline", "get_timeline", f"Returned {len(entries)} entries")
-    return jsonify({"timeline": entries})
+    try:
+        page = get_timeline_page(**page_args(request.args, ("status", "type"), default_limit=50))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    log_action("routes/timeline", "get_timeline", f"Returned {len(page['items'])} entries")
+    return jsonify({"timeline": page["items"], "next_cursor": page["next_cursor"]})
 
 @timeline_bp.route('/timeline/<entry_id>', methods=['GET'])
 def get_timeline_entry(entry_id):
@@ -27,9 +33,11 @@ def get_timeline_entry(entry_id):
     if 'error' in user:
         return jsonify({"error": "Unauthorized"}), 401
 
-    from core.graph_io import run_read_query
-    result = run_read_query("MATCH (t:TimelineEntry {id: $id}) RETURN t LIMIT 1", {"id": entry_id})
-    if not result:
+    from core.graph_io import run_read_query, project_node, node_from_projection
+    records = run_read_query(
+        f"MATCH (t:TimelineEntry {{id: $id}}) RETURN {project_node('t')} AS t LIMIT 1", {"id": entry_id}
+    ).get("result", [])
+    if not records:
         return jsonify({"error": "Not found"}), 404
     log_action("routes/timeline", "get_entry", f"Returned timeline entry {entry_id}")
-    return jsonify({"entry": result[0]["t"]})
+    return jsonify({"entry": node_from_projection(records[0]["t"])})
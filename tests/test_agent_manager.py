@@ -61,3 +61,13 @@ def test_get_context_for_agent(monkeypatch):
     ctx = agent_manager.get_context_for_agent("some_agent")
     assert "recent_events" in ctx
     assert isinstance(ctx["recent_events"], list)
+
+def test_stream_task_yields_chunks():
+    class StreamingModel(DummyModel):
+        def stream(self, prompt, **kwargs):
+            yield from ["dum", "my"]
+    agent_manager.register_agent("streamer", "reflector", "desc", StreamingModel())
+    agent_manager.register_agent("plain", "reflector", "desc", DummyModel())
+    context = {"event": {"raw_text": "hi"}}
+    assert list(agent_manager.stream_task("streamer", "task", context)) == ["dum", "my"]
+    assert list(agent_manager.stream_task("plain", "task", context)) == ["dummy response"]
@@ -0,0 +1,69 @@
+# tests/test_cluster_service.py
+
+import numpy as np
+from core import cluster_service
+from core.cluster_service import ClusterService
+
+def _blobs(n_per=40, dim=16, seed=0, centers=(0, 1, 2)):
+    rng = np.random.default_rng(seed)
+    return np.vstack([rng.normal(0, 0.05, (n_per, dim)) + np.eye(dim)[c] * 5 for c in centers]).astype(np.float32)
+
+def _fitted():
+    # n_components=0 skips UMAP, whose JIT warm-up would dominate the test run
+    service = ClusterService(n_components=0)
+    service.fit(_blobs())
+    return service
+
+def test_fit_and_predict_new_points():
+    service = _fitted()
+    assert service.describe()["clusters"] == 3
+    labels, strengths = service.predict(_blobs(n_per=5, seed=1))
+    assert len(set(labels[:5])) == 1 and labels[0] != -1
+    assert service.memberships(_blobs(n_per=1, seed=2)).shape == (3, 3)
+
+def test_save_load_roundtrip(tmp_path):
+    service = _fitted()
+    path = str(tmp_path / "model.joblib")
+    service.save(path)
+    loaded = ClusterService.load(path)
+    points = _blobs(n_per=3, seed=3)
+    assert list(loaded.predict(points)[0]) == list(service.predict(points)[0])
+
+def test_refit_reason_tracks_drift(monkeypatch):
+    monkeypatch.setattr(cluster_service, "CLUSTER_DRIFT_MIN_POINTS", 20)
+    service = _fitted()
+    service.predict(_blobs(n_per=10, seed=4))
+    assert service.refit_reason() is None
+    service.predict(_blobs(n_per=30, seed=5, centers=(7,)))
+    assert service.refit_reason() in ("noise_drift", "centroid_drift")
+
+def test_predict_clusters_schedules_refit_without_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(cluster_service, "CLUSTER_MODEL_PATH", str(tmp_path / "missing.joblib"))
+    monkeypatch.setattr(cluster_service, "_service", None)
+    queued = []
+    monkeypatch.setattr("core.job_queue.enqueue_job", lambda kind, payload: queued.append((kind, payload)) or {"id": "j"})
+    labels, _ = cluster_service.predict_clusters(np.zeros((2, 1536), dtype=np.float32))
+    cluster_service.predict_clusters(np.zeros((1, 1536), dtype=np.float32))
+    assert list(labels) == [-1, -1]
+    assert queued == [("refit_clusters", {"reason": "unfitted"})]
+
+def test_refit_is_requeued_after_retry_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(cluster_service, "CLUSTER_MODEL_PATH", str(tmp_path / "missing.joblib"))
+    monkeypatch.setattr(cluster_service, "_service", None)
+    queued = []
+    monkeypatch.setattr("core.job_queue.enqueue_job", lambda kind, payload: queued.append(kind) or {"id": "j"})
+    assert cluster_service.schedule_refit_if_needed() is not None
+    assert cluster_service.schedule_refit_if_needed() is None
+    # The refit was skipped or failed: no model landed, so the window lapsing re-queues it
+    cluster_service.get_cluster_service().refit_queued_at -= cluster_service.CLUSTER_REFIT_RETRY + 1
+    assert cluster_service.schedule_refit_if_needed() is not None
+    assert queued == ["refit_clusters", "refit_clusters"]
+
+def test_cluster_embeddings_uses_persisted_model(monkeypatch):
+    from core import vector_ops
+    service = _fitted()
+    monkeypatch.setattr(cluster_service, "get_cluster_service", lambda: service)
+    monkeypatch.setattr("hdbscan.HDBSCAN.fit", lambda *a, **k: 1 / 0)  # no refit allowed
+    labels, info = vector_ops.cluster_embeddings(_blobs(n_per=4, seed=6))
+    assert len(labels) == 12 and info["model"] is service.clusterer
+    assert service.seen == 12
@@ -9,8 +9,7 @@ def patch_graph(monkeypatch):
     monkeypatch.setattr(graph_io, "run_write_query", lambda q, p=None: {"status": "success"})
 
     # Patch other local dependencies
-    monkeypatch.setattr(consciousness_engine, "create_node", lambda label, props: {"status": "success", "id": "fake"})
-    monkeypatch.setattr(consciousness_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(consciousness_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(consciousness_engine, "update_node_properties", lambda *a, **k: True)
     monkeypatch.setattr(consciousness_engine, "log_action", lambda *a, **k: True)
 
@@ -10,7 +10,7 @@ def patch_core(monkeypatch):
     # Patch local consensus_engine functions
     monkeypatch.setattr(consensus_engine, "initiate_peer_review", lambda e, a: {"status": "reviewed"})
     monkeypatch.setattr(consensus_engine, "create_node", lambda label, props: {"status": "success"})
-    monkeypatch.setattr(consensus_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(consensus_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(consensus_engine, "log_action", lambda *a, **k: True)
 
 def test_synthesize_consensus():
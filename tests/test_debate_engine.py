@@ -10,7 +10,7 @@ def patch_core(monkeypatch):
     # Patch local dependencies
     monkeypatch.setattr(debate_engine, "assign_task", lambda agent_id, task, ctx: {"response": "mock"})
     monkeypatch.setattr(debate_engine, "create_node", lambda label, props: {"status": "success"})
-    monkeypatch.setattr(debate_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(debate_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(debate_engine, "log_action", lambda *a, **k: True)
 
 def test_launch_debate():
@@ -31,3 +31,12 @@ def test_resolve_debate(monkeypatch):
 def test_log_debate_outcome():
     ok = debate_engine.log_debate_outcome("debate123", "summary", "consensus")
     assert isinstance(ok, bool)
+
+def test_launch_debate_writes_single_batch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(debate_engine, "assign_task", lambda agent_id, task, context=None: {"response": "mock"})
+    monkeypatch.setattr(debate_engine, "create_subgraph", lambda nodes, rels: calls.append((nodes, rels)))
+    debate_engine.launch_debate("Is AI good?", ["agent1", "agent2"], max_rounds=3)
+    assert len(calls) == 1
+    nodes, rels = calls[0]
+    assert len(nodes) == 7 and len(rels) == 6
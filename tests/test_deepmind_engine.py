@@ -1,28 +1,99 @@
 # tests/test_deepmind_engine.py
 
+import numpy as np
 import pytest
 from core import deepmind_engine
+from core.vector_ops import pack_embedding
 
 @pytest.fixture(autouse=True)
 def patch_core(monkeypatch):
-    monkeypatch.setattr(deepmind_engine, "create_node", lambda label, props: {"status": "success"})
-    monkeypatch.setattr(deepmind_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(deepmind_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(deepmind_engine, "update_self_concept", lambda *a, **k: True)
     monkeypatch.setattr(deepmind_engine, "embed_text", lambda text, model=None: [0.0, 1.0, 2.0])
     monkeypatch.setattr(deepmind_engine, "run_read_query", lambda q, p=None: [{"id": "node1"}])
+    monkeypatch.setattr(deepmind_engine, "run_write_query", lambda q, p=None: {"status": "success", "result": []})
     monkeypatch.setattr(deepmind_engine, "log_action", lambda *a, **k: True)
 
-def test_run_meta_audit():
+def _contradiction_graph(monkeypatch, edges, state=None):
+    """Route contradiction queries to an in-memory edge list and AuditState node."""
+    store = {"state": state}
+
+    def read(q, p=None):
+        if "AuditState" in q:
+            return {"status": "success", "result": [{"s": store["state"]}] if store["state"] else []}
+        if "CONTRADICTS" in q:
+            since = (p or {}).get("since") if "$since" in q else None
+            rows = [{"id_a": a, "id_b": b} for a, b, ts in edges if since is None or ts > since]
+            return {"status": "success", "result": rows}
+        return {"status": "success", "result": []}
+
+    def write(q, p=None):
+        store.setdefault("writes", []).append(q)
+        if "AuditState" in q:
+            store["state"] = {"id": p["id"], **p["props"]}
+        return {"status": "success", "result": []}
+
+    monkeypatch.setattr(deepmind_engine, "run_read_query", read)
+    monkeypatch.setattr(deepmind_engine, "run_write_query", write)
+    return store
+
+def test_run_meta_audit(monkeypatch):
+    _contradiction_graph(monkeypatch, [("e1", "e2", "2024-01-01T00:00:00")])
     result = deepmind_engine.run_meta_audit()
     assert isinstance(result, dict)
 
-def test_detect_contradictions():
+def test_detect_contradictions(monkeypatch):
+    _contradiction_graph(monkeypatch, [("e1", "e2", "2024-01-01T00:00:00")])
     out = deepmind_engine.detect_contradictions()
     assert isinstance(out, list)
 
-def test_search_for_patterns():
-    result = deepmind_engine.search_for_patterns()
-    assert isinstance(result, list)
+def test_detect_contradictions_incremental(monkeypatch):
+    edges = [("e1", "e2", "2024-01-01T00:00:00")]
+    store = _contradiction_graph(monkeypatch, edges)
+
+    assert sorted(deepmind_engine.detect_contradictions(incremental=True)) == ["e1", "e2"]
+    assert store["state"]["edges_total"] == 1
+
+    # Nothing new since the high-water mark
+    assert deepmind_engine.detect_contradictions(incremental=True) == []
+
+    edges.append(("e2", "e3", "9999-01-01T00:00:00"))
+    assert deepmind_engine.detect_contradictions(incremental=True) == ["e2", "e3"]
+    state = deepmind_engine.get_contradiction_state()
+    assert state["edges_total"] == 2
+    assert state["hot_nodes"]["e2"] == 2
+    # Edges are stamped at creation; an audit never scans for unstamped ones
+    assert not any("r.timestamp IS NULL" in q for q in store["writes"])
+
+def test_search_for_patterns(monkeypatch):
+    rng = np.random.default_rng(0)
+    themes = np.eye(2, 1536, dtype=np.float32)
+    nodes = [
+        {"id": f"e{i:03d}", "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "text": f"t{i}",
+         "embedding": pack_embedding(themes[i % 2] + rng.normal(0, 0.01, 1536))}
+        for i in range(40)
+    ]
+    queries = []
+
+    def read(q, p=None):
+        queries.append((q, p))
+        rows = sorted(nodes, key=lambda n: (n["timestamp"], n["id"]), reverse=True)
+        if "before_ts" in p:
+            rows = [n for n in rows if (n["timestamp"], n["id"]) < (p["before_ts"], p["before_id"])]
+        return {"status": "success", "result": rows[:p["limit"]]}
+
+    monkeypatch.setattr(deepmind_engine, "run_read_query", read)
+    monkeypatch.setattr(deepmind_engine, "PATTERN_PAGE_SIZE", 15)
+    result = deepmind_engine.search_for_patterns({"clusters": 2, "agent_origin": "gpt"})
+
+    assert [p["size"] for p in result] == [20, 20]
+    for pattern in result:
+        parity = {int(nid[1:]) % 2 for nid in pattern["members"]}
+        assert len(parity) == 1
+        assert len(pattern["centroid"]) == 1536
+    assert len(queries) == 3
+    assert "rand()" not in queries[0][0] and "n.agent_origin = $agent_origin" in queries[0][0]
+    assert queries[0][1]["status"] == "active"
 
 def test_generate_epiphany():
     out = deepmind_engine.generate_epiphany(["n1", "n2"], "insight")
@@ -31,3 +102,8 @@ def test_generate_epiphany():
 def test_log_deepmind_cycle():
     ok = deepmind_engine.log_deepmind_cycle("summary", ["n1", "n2"])
     assert isinstance(ok, bool)
+
+def test_run_meta_audit_defaults_to_full_pass(monkeypatch):
+    store = _contradiction_graph(monkeypatch, [("e1", "e2", "2024-01-01T00:00:00")])
+    deepmind_engine.run_meta_audit()
+    assert store["state"] is None
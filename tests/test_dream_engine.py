@@ -4,10 +4,11 @@ import core.llm_tools as llm
 
 @pytest.fixture(autouse=True)
 def patch_core(monkeypatch):
-    monkeypatch.setattr(dream_engine, "create_node", lambda label, props: {"status": "success", "id": "dream1"})
-    monkeypatch.setattr(dream_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(dream_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(dream_engine, "embed_text", lambda text, model=None: [0.1, 0.2, 0.3])
-    monkeypatch.setattr(dream_engine, "run_read_query", lambda q, p=None: [{"id": "event1"}])
+    monkeypatch.setattr(dream_engine, "run_read_query", lambda q, p=None: {"status": "success", "result": [{"id": "event1"}]})
+    monkeypatch.setattr(dream_engine, "find_similar", lambda anchor, k=10, labels=None: [])
+    monkeypatch.setattr(dream_engine, "index_node", lambda node_id, embedding, label: None)
     monkeypatch.setattr(dream_engine, "log_action", lambda *a, **k: True)
 
     # Correct location for LLM call
@@ -17,10 +18,16 @@ def test_generate_dream():
     out = dream_engine.generate_dream(["n1", "n2"], "trigger")
     assert isinstance(out, dict)
 
-def test_select_dream_seeds():
+def test_select_dream_seeds(monkeypatch):
+    monkeypatch.setattr(dream_engine, "run_read_query", lambda q, p=None: {"status": "success", "result": [{"id": "event1"}]})
     seeds = dream_engine.select_dream_seeds(limit=2)
     assert isinstance(seeds, list)
 
+def test_select_dream_seeds_by_theme(monkeypatch):
+    monkeypatch.setattr(dream_engine, "find_similar", lambda anchor, k=10, labels=None: [{"id": "event7", "label": "Event", "score": 0.9}])
+    seeds = dream_engine.select_dream_seeds(limit=1, filters={"theme": "loss"})
+    assert seeds == ["event7"]
+
 def test_score_dream_significance():
     score = dream_engine.score_dream_significance(["id1", "id2"])
     assert isinstance(score, float)
@@ -44,3 +51,18 @@ def test_get_raw_text():
 def test_synthesize_dream_idea():
     out = dream_engine.synthesize_dream_idea("raw text")
     assert isinstance(out, str)
+
+def test_getters_read_wrapped_results(monkeypatch):
+    monkeypatch.setattr(dream_engine, "run_read_query", lambda q, p=None: {
+        "status": "success", "result": [{"d": [["id", "dream1"], ["embedding", b"x"]], "text": "raw"}]
+    })
+    assert dream_engine.get_dream_by_id("dream1") == {"id": "dream1"}
+    assert dream_engine.get_recent_dreams() == [{"id": "dream1"}]
+    assert dream_engine.get_raw_text("n1") == "raw"
+
+def test_generate_dream_indexes_the_new_dream(monkeypatch):
+    indexed = []
+    monkeypatch.setattr(dream_engine, "get_raw_text", lambda nid: f"text {nid}")
+    monkeypatch.setattr(dream_engine, "index_node", lambda node_id, embedding, label: indexed.append((node_id, label)))
+    out = dream_engine.generate_dream(["n1"], "trigger")
+    assert indexed == [(out["id"], "Dream")]
@@ -0,0 +1,60 @@
+# tests/test_embedding_cache.py
+
+import numpy as np
+from core import embedding_cache
+
+def test_cache_key_depends_on_model_and_text():
+    assert embedding_cache.cache_key("m", "a") == embedding_cache.cache_key("m", "a")
+    assert embedding_cache.cache_key("m", "a") != embedding_cache.cache_key("n", "a")
+
+def test_lru_tier_evicts_oldest(tmp_path):
+    cache = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path), max_entries=2, disk=False)
+    for i in range(3):
+        cache.put("m", f"t{i}", [float(i)] * 4)
+    assert cache.get("m", "t0") is None
+    assert cache.get("m", "t2").tolist() == [2.0] * 4
+    assert cache.stats["memory_hits"] == 1 and cache.stats["misses"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    first = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    first.put("m", "hello", [0.1, 0.2, 0.3, 0.4])
+    second = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    vec = second.get("m", "hello")
+    assert vec.dtype == np.float32
+    assert np.allclose(vec, [0.1, 0.2, 0.3, 0.4])
+    assert second.stats["disk_hits"] == 1
+
+def test_wrong_dimension_is_ignored(tmp_path):
+    cache = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    cache.put("m", "short", [0.0] * 3)
+    assert cache.get("m", "short") is None
+
+def test_disk_tier_recovers_from_torn_append(tmp_path):
+    first = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    first.put("m", "a", [1.0] * 4)
+    store = first._disk()
+    # Crash between the two writes: a stray half row and a partial key line
+    with open(store.vectors_path, "ab") as f:
+        f.write(b"\x00" * 6)
+    with open(store.keys_path, "a", encoding="utf-8") as f:
+        f.write("deadbeef")
+    second = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    second.put("m", "b", [2.0] * 4)
+    third = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    assert third.get("m", "a").tolist() == [1.0] * 4
+    assert third.get("m", "b").tolist() == [2.0] * 4
+
+def test_rowless_key_line_is_not_trusted(tmp_path):
+    first = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    first.put("m", "a", [1.0] * 4)
+    store = first._disk()
+    with open(store.keys_path, "a", encoding="utf-8") as f:
+        f.write(embedding_cache.cache_key("m", "b") + "\n")
+    second = embedding_cache.EmbeddingCache(dim=4, directory=str(tmp_path))
+    assert second.get("m", "b") is None
+    assert second.get("m", "a").tolist() == [1.0] * 4
+
+def test_shared_cache_uses_the_embedding_width(monkeypatch):
+    from core import vector_ops
+    monkeypatch.setattr(embedding_cache, "_cache", None)
+    assert embedding_cache._shared_cache().dim == vector_ops.EMBED_DIM
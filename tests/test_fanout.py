@@ -0,0 +1,55 @@
+# tests/test_fanout.py
+
+import time
+import gevent
+from core import fanout
+
+def _sleeper(seconds, value):
+    def call():
+        gevent.sleep(seconds)
+        return value
+    return call
+
+def test_calls_run_concurrently():
+    start = time.monotonic()
+    out = fanout.fan_out({m: (m, _sleeper(0.2, m)) for m in ["gpt", "claude", "gemini"]})
+    assert list(out) == ["gpt", "claude", "gemini"]
+    assert time.monotonic() - start < 0.5
+
+def test_first_and_quorum_return_early():
+    calls = {"slow": ("a", _sleeper(2, "slow")), "fast": ("b", _sleeper(0.01, "fast")), "mid": ("c", _sleeper(0.05, "mid"))}
+    assert fanout.fan_out(calls, wait_for="first") == {"fast": "fast"}
+    assert fanout.fan_out(calls, wait_for="quorum") == {"fast": "fast", "mid": "mid"}
+
+def test_timeout_and_errors_are_dropped():
+    def boom():
+        raise ValueError("nope")
+    calls = {"ok": ("a", _sleeper(0, 1)), "slow": ("a", _sleeper(1, 2)), "bad": ("b", boom)}
+    assert fanout.fan_out(calls, timeout=0.1) == {"ok": 1}
+
+def test_provider_limit_serializes_calls():
+    fanout.set_provider_limit("limited", 1)
+    start = time.monotonic()
+    fanout.fan_out({i: ("limited", _sleeper(0.1, i)) for i in range(3)})
+    assert time.monotonic() - start >= 0.3
+
+def test_fast_failures_do_not_win_the_race(monkeypatch):
+    from core import llm_tools
+    from core.rate_limit import CircuitOpenError
+
+    def call_with_limits(provider, fn):
+        if provider == "gpt":
+            raise CircuitOpenError("gpt circuit open")
+        gevent.sleep(0.05 if provider == "claude" else 0.1)
+        return f"{provider}-response"
+
+    monkeypatch.setattr(llm_tools, "call_with_limits", call_with_limits)
+    monkeypatch.setattr(llm_tools, "log_action", lambda *a, **k: True)
+    first = llm_tools.run_redundant_prompt("q?", wait_for="first")
+    assert first["claude"] == "claude-response"
+    quorum = llm_tools.run_redundant_prompt("q?", wait_for="quorum")
+    assert quorum == {"gpt": "[gpt ERROR]", "claude": "claude-response", "gemini": "gemini-response"}
+
+def test_is_ok_rejects_returned_failures():
+    calls = {"bad": ("a", _sleeper(0, {"error": "no key"})), "good": ("b", _sleeper(0.05, {"response": "hi"}))}
+    assert fanout.fan_out(calls, wait_for="first", is_ok=lambda r: "error" not in r) == {"good": {"response": "hi"}}
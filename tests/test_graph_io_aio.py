@@ -0,0 +1,71 @@
+# tests/test_graph_io_aio.py
+
+import asyncio
+import pytest
+from neo4j import READ_ACCESS, WRITE_ACCESS
+from core import graph_io_aio
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+    async def data(self):
+        return self.rows
+
+class FakeTx:
+    def __init__(self, log):
+        self.log = log
+    async def run(self, query, params=None):
+        if "FAIL" in query:
+            raise RuntimeError("boom")
+        self.log.append((query.strip(), params))
+        return FakeResult([{"n": {"id": params.get("node_id")}}] if "node_id" in params else [])
+
+class FakeSession:
+    def __init__(self, log, kwargs):
+        self.log = log
+        self.kwargs = kwargs
+    async def execute_write(self, fn, *args):
+        self.log.append(("write", self.kwargs["default_access_mode"]))
+        return await fn(FakeTx(self.log), *args)
+    async def execute_read(self, fn, *args):
+        self.log.append(("read", self.kwargs["default_access_mode"]))
+        return await fn(FakeTx(self.log), *args)
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *exc):
+        self.log.append(("close",))
+
+@pytest.fixture
+def log(monkeypatch):
+    events = []
+
+    class FakeDriver:
+        def session(self, **kwargs):
+            return FakeSession(events, kwargs)
+
+    monkeypatch.setattr(graph_io_aio, "get_async_driver", lambda: FakeDriver())
+    monkeypatch.setattr(graph_io_aio._AsyncNeo4jDriverSingleton, "read_routing", True)
+    return events
+
+def test_reads_and_writes_use_matching_access_modes(log):
+    assert asyncio.run(graph_io_aio.run_write_query("CREATE (a)"))["status"] == "success"
+    node = asyncio.run(graph_io_aio.get_node_by_id("n1", label="Event"))
+    assert node == {"id": "n1"}
+    assert ("write", WRITE_ACCESS) in log and ("read", READ_ACCESS) in log
+    assert log.count(("close",)) == 2
+
+def test_read_query_can_pin_to_leader(log, monkeypatch):
+    asyncio.run(graph_io_aio.run_read_query("MATCH (a) RETURN a", access_mode=WRITE_ACCESS))
+    monkeypatch.setattr(graph_io_aio._AsyncNeo4jDriverSingleton, "read_routing", False)
+    asyncio.run(graph_io_aio.run_read_query("MATCH (a) RETURN a"))
+    assert [e for e in log if e[0] in ("read", "write")] == [("write", WRITE_ACCESS)] * 2
+
+def test_errors_are_wrapped_not_raised(log):
+    result = asyncio.run(graph_io_aio.run_read_query("FAIL"))
+    assert result["status"] == "error" and result["result"] == []
+    assert asyncio.run(graph_io_aio.create_relationship("a", "b", "FAIL_REL")) is False
+
+def test_concurrent_queries(log):
+    async def sweep():
+        return await asyncio.gather(*(graph_io_aio.get_node_by_id(f"n{i}") for i in range(5)))
+    assert [n["id"] for n in asyncio.run(sweep())] == [f"n{i}" for i in range(5)]
@@ -0,0 +1,248 @@
+# tests/test_graph_scope.py
+
+import pytest
+from config.settings import load_config
+from core import graph_io
+from core.utils import generate_uuid
+
+class FakeTx:
+    def __init__(self, log):
+        self.log = log
+    def run(self, query, params=None):
+        if "FAIL" in query:
+            raise RuntimeError("boom")
+        self.log.append(("run", query))
+        return type("Result", (), {"data": lambda self=None: [{"q": query}]})()
+    def commit(self):
+        self.log.append(("commit",))
+    def rollback(self):
+        self.log.append(("rollback",))
+    def close(self):
+        pass
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+    def write_transaction(self, fn):
+        return fn(FakeTx(self.log))
+    read_transaction = write_transaction
+    def begin_transaction(self):
+        self.log.append(("begin",))
+        return FakeTx(self.log)
+    def close(self):
+        self.log.append(("close",))
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+
+@pytest.fixture
+def log(monkeypatch):
+    events = []
+
+    class FakeDriver:
+        def session(self, **kwargs):
+            events.append(("session",))
+            return FakeSession(events)
+
+    monkeypatch.setattr(graph_io, "get_neo4j_driver", lambda: FakeDriver())
+    return events
+
+def test_graph_session_reuses_one_session(log):
+    with graph_io.graph_session():
+        graph_io.run_read_query("MATCH (a) RETURN a")
+        with graph_io.graph_session():
+            graph_io.run_write_query("CREATE (b)")
+        assert ("close",) not in log
+    assert log.count(("session",)) == 1 and log[-1] == ("close",)
+
+def test_unit_of_work_commits_once(log):
+    with graph_io.unit_of_work():
+        graph_io.run_write_query("CREATE (a)")
+        with graph_io.unit_of_work():
+            graph_io.run_write_query("CREATE (b)")
+    assert [e[0] for e in log] == ["session", "begin", "run", "run", "commit", "close"]
+
+def test_unit_of_work_rolls_back_on_error(log):
+    with pytest.raises(RuntimeError):
+        with graph_io.unit_of_work():
+            graph_io.run_write_query("CREATE (a)")
+            graph_io.run_write_query("FAIL")
+    assert ("rollback",) in log and ("commit",) not in log
+    # Outside a unit, errors are still reported as a status
+    assert graph_io.run_write_query("FAIL")["status"] == "error"
+
+def test_driver_options_from_config():
+    config = {"NEO4J_MAX_POOL_SIZE": 25, "NEO4J_ACQUISITION_TIMEOUT": 5.0, "NEO4J_LIVENESS_CHECK_TIMEOUT": None}
+    assert graph_io.driver_options(config) == {"max_connection_pool_size": 25, "connection_acquisition_timeout": 5.0}
+
+def test_pool_acquisitions_are_timed(monkeypatch):
+    class Conn:
+        def __init__(self, in_use):
+            self.in_use = in_use
+
+    class Pool:
+        connections = {"db:7687": [Conn(True), Conn(False), Conn(False)]}
+        def acquire(self, *a, **k):
+            return "conn"
+
+    driver = type("Driver", (), {"_pool": Pool()})()
+    monkeypatch.setattr(graph_io._Neo4jDriverSingleton, "_driver", driver)
+    monkeypatch.setattr(graph_io, "_pool_stats", dict.fromkeys(graph_io._pool_stats, 0))
+    graph_io._instrument_pool(driver, slow_after=10)
+    assert driver._pool.acquire() == "conn"
+    metrics = graph_io.get_pool_metrics()
+    assert metrics["acquisitions"] == 1 and (metrics["in_use"], metrics["idle"]) == (1, 2)
+
+def test_reads_route_to_followers_with_bookmarks(monkeypatch):
+    sessions = []
+
+    class Driver:
+        def session(self, **kwargs):
+            sessions.append(kwargs)
+            return FakeSession([])
+
+    manager = object()
+    monkeypatch.setattr(graph_io, "get_neo4j_driver", lambda: Driver())
+    monkeypatch.setattr(graph_io._Neo4jDriverSingleton, "_configured", True)
+    monkeypatch.setattr(graph_io._Neo4jDriverSingleton, "_bookmark_manager", manager)
+    graph_io.run_write_query("CREATE (a)")
+    graph_io.run_read_query("MATCH (a) RETURN a")
+    graph_io.run_read_query("MATCH (a) RETURN a", access_mode=graph_io.WRITE_ACCESS)
+    assert [s["default_access_mode"] for s in sessions] == ["WRITE", "READ", "WRITE"]
+    assert all(s["bookmark_manager"] is manager for s in sessions)
+
+def test_first_session_is_configured_before_it_is_built(monkeypatch, caplog):
+    sessions = []
+
+    class Driver:
+        def session(self, **kwargs):
+            sessions.append(kwargs)
+            return FakeSession([])
+
+    for attr, value in [("_configured", False), ("_bookmark_manager", None), ("bookmark_mode", "process")]:
+        monkeypatch.setattr(graph_io._Neo4jDriverSingleton, attr, value)
+    monkeypatch.setattr(graph_io, "get_neo4j_driver", lambda: Driver())
+    monkeypatch.setenv("NEO4J_BOOKMARKS", "requests")
+    graph_io.run_write_query("CREATE (a)")
+    assert sessions[0]["bookmark_manager"] is not None
+    assert graph_io._Neo4jDriverSingleton.bookmark_mode == "process"
+    assert "Unknown NEO4J_BOOKMARKS" in caplog.text
+
+def test_request_scope_echoes_bookmarks(log, monkeypatch):
+    from flask import Flask
+    from neo4j import Bookmarks
+    monkeypatch.setattr(FakeSession, "last_bookmarks", lambda self: Bookmarks.from_raw_values(["bm:2"]), raising=False)
+    app = Flask(__name__)
+    graph_io.init_graph_scope(app)
+    seen = []
+
+    @app.route("/x")
+    def x():
+        seen.append(graph_io._scope.bookmarks.raw_values)
+        graph_io.run_read_query("MATCH (a) RETURN a")
+        graph_io.run_write_query("CREATE (a)")
+        return "ok"
+
+    resp = app.test_client().get("/x", headers={graph_io.BOOKMARK_HEADER: "bm:1"})
+    assert seen == [frozenset({"bm:1"})]
+    assert resp.headers[graph_io.BOOKMARK_HEADER] == "bm:2"
+    assert log.count(("session",)) == 1 and graph_io._scope.depth == 0
+
+def test_stream_read_query_pulls_lazily(monkeypatch):
+    sessions, pulled = [], []
+
+    class Record(dict):
+        def data(self):
+            return dict(self)
+
+    class StreamSession(FakeSession):
+        def run(self, query, params=None):
+            for i in range(1000):
+                pulled.append(i)
+                yield Record(i=i)
+
+    class Driver:
+        def session(self, **kwargs):
+            sessions.append(kwargs)
+            return StreamSession(sessions)
+
+    monkeypatch.setattr(graph_io, "get_neo4j_driver", lambda: Driver())
+    stream = graph_io.stream_read_query("MATCH (n) RETURN n.id AS i", fetch_size=50)
+    assert [next(stream)["i"] for _ in range(3)] == [0, 1, 2]
+    stream.close()
+    assert len(pulled) == 3 and sessions[-1] == ("close",)
+    assert sessions[0]["fetch_size"] == 50 and sessions[0]["default_access_mode"] == "READ"
+
+def test_match_by_id_falls_back_beyond_indexed_labels():
+    assert "SchemaMeta" not in graph_io.INDEXED_LABELS
+    fragment = graph_io.match_node_by_id("n", "$id")
+    # Indexed probes run first; the label-less match only runs when they find nothing,
+    # so an unlisted label like SchemaMeta is still reachable.
+    assert "MATCH (x:Event {id: $id})" in fragment
+    assert "CASE WHEN size(hits) = 0 THEN [1] ELSE [] END" in fragment
+    assert fragment.index("size(hits) = 0") < fragment.index("MATCH (x {id: $id})")
+    assert fragment.endswith("RETURN x AS n }")
+    assert graph_io.match_node_by_id("n", "$id", "SchemaMeta") == "MATCH (n:SchemaMeta {id: $id})"
+
+def test_match_by_id_imports_path_keeps_a_row_without_hits():
+    fragment = graph_io.match_node_by_id("a", "row.from_id", imports="row")
+    # A grouped collect(x) returns no row when no indexed label hits, starving the fallback.
+    assert "collect(x)" not in fragment
+    assert "WITH row, COLLECT { MATCH (x:Event {id: row.from_id}) RETURN x UNION" in fragment
+    assert "MATCH (x {id: row.from_id}) RETURN x" in fragment
+
+@pytest.mark.skipif(not load_config().get("NEO4J_URI"), reason="needs a Neo4j instance")
+def test_create_subgraph_links_unindexed_nodes(monkeypatch):
+    monkeypatch.setattr(graph_io._Neo4jDriverSingleton, "_configured", False)
+    ids = [f"probe_{generate_uuid()}" for _ in range(2)]
+    graph_io.run_write_query("UNWIND $ids AS id CREATE (:UnindexedProbe {id: id})", {"ids": ids})
+    try:
+        graph_io.create_subgraph(relationships=[(ids[0], ids[1], "PROBES")])
+        found = graph_io.run_read_query(
+            "MATCH (:UnindexedProbe {id: $a})-[r:PROBES]->(:UnindexedProbe {id: $b}) RETURN count(r) AS n",
+            {"a": ids[0], "b": ids[1]},
+        )
+        assert found["result"] == [{"n": 1}]
+    finally:
+        graph_io.run_write_query("MATCH (n:UnindexedProbe) WHERE n.id IN $ids DETACH DELETE n", {"ids": ids})
+
+def test_stream_read_query_raises_mid_stream_failure(monkeypatch):
+    class Record(dict):
+        def data(self):
+            return dict(self)
+
+    class BrokenSession(FakeSession):
+        def run(self, query, params=None):
+            yield Record(i=0)
+            raise RuntimeError("connection lost")
+
+    class Driver:
+        def session(self, **kwargs):
+            return BrokenSession([])
+
+    monkeypatch.setattr(graph_io, "get_neo4j_driver", lambda: Driver())
+    stream = graph_io.stream_read_query("MATCH (n) RETURN n.id AS i")
+    assert next(stream) == {"i": 0}
+    with pytest.raises(RuntimeError):
+        next(stream)
+
+def test_indexed_relationships_are_stamped_on_create(monkeypatch):
+    calls = []
+    monkeypatch.setattr(graph_io, "run_write_query", lambda q, p=None: calls.append(p) or {"status": "success", "result": []})
+    graph_io.create_subgraph(relationships=[("a", "b", "CONTRADICTS"), ("a", "b", "CONTRADICTS", {"timestamp": "t0"}),
+                                            ("a", "b", "SOURCE_OF")])
+    rows = [row for params in calls for key, rows in params.items() for row in rows]
+    stamps = [row["props"].get("timestamp") for row in rows]
+    assert stamps[0] and stamps[1] == "t0" and stamps[2] is None
+    graph_io.create_relationship("a", "b", "CONTRADICTS")
+    assert calls[-1]["props"]["timestamp"]
+
+def test_create_subgraph_accepts_none_properties(monkeypatch):
+    calls = []
+    monkeypatch.setattr(graph_io, "run_write_query", lambda q, p=None: calls.append((q, p)) or {"status": "success", "result": []})
+    result = graph_io.create_subgraph([("Event", None), ("Event", {"id": "e1", "note": None})])
+    assert result["status"] == "success"
+    query, params = calls[0]
+    assert params["nodes_0"] == [{}, {"id": "e1"}]
+    assert "CREATE (n:Event) SET n = props" in query
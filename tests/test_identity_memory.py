@@ -7,6 +7,7 @@ def patch_graph(monkeypatch):
     monkeypatch.setattr(identity_memory, "create_node", lambda label, props: {"id": "cluster1"})
     monkeypatch.setattr(identity_memory, "create_relationship", lambda *a, **k: True)
     monkeypatch.setattr(identity_memory, "run_read_query", lambda q, p=None: [{"id": "cluster1"}])
+    monkeypatch.setattr(identity_memory, "stream_read_query", lambda q, p=None: iter([{"id": "cluster1"}]))
     monkeypatch.setattr(identity_memory, "log_action", lambda *a, **k: True)
 
     # Patch external graph util
@@ -5,9 +5,9 @@ from core import imagination_engine
 
 @pytest.fixture(autouse=True)
 def patch_core(monkeypatch):
-    monkeypatch.setattr(imagination_engine, "create_node", lambda label, props: {"id": "imagine1"})
-    monkeypatch.setattr(imagination_engine, "create_relationship", lambda *a, **k: True)
-    monkeypatch.setattr(imagination_engine, "run_read_query", lambda q, p=None: [{"id": "node1"}])
+    monkeypatch.setattr(imagination_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
+    monkeypatch.setattr(imagination_engine, "run_read_query",
+                        lambda q, p=None: {"status": "success", "result": [{"id": "node1", "text": "raw"}]})
     monkeypatch.setattr(imagination_engine, "embed_text", lambda text, model=None: [0.1, 0.2, 0.3])
     monkeypatch.setattr(imagination_engine, "log_action", lambda *a, **k: True)
     monkeypatch.setattr(imagination_engine, "prompt_gpt", lambda prompt, **kwargs: "Imagined scenario")
@@ -26,8 +26,7 @@ def test_simulate_alternatives():
     assert isinstance(out, list)
 
 def test_get_raw_text():
-    text = imagination_engine.get_raw_text("node1")
-    assert isinstance(text, str)
+    assert imagination_engine.get_raw_text("node1") == "raw"
 
 def test_label_imagination():
     out = imagination_engine.label_imagination("Prompt?", "Output")
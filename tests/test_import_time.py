@@ -0,0 +1,33 @@
+# tests/test_import_time.py
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generous enough for a cold CI runner; a heavy top-level import (umap alone is ~15s) blows straight past it.
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "5"))
+LAZY_MODULES = ["umap", "hdbscan", "sklearn", "pynndescent", "models.claude", "models.gpt", "models.gemini"]
+
+def _import_wsgi(code: str = "") -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import wsgi\n{code}"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+
+def _cumulative_us(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not in -X importtime output")
+
+def test_wsgi_import_within_budget():
+    proc = _import_wsgi()
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert _cumulative_us(proc.stderr, "wsgi") / 1e6 < IMPORT_BUDGET_SECONDS
+
+def test_heavy_modules_stay_lazy():
+    proc = _import_wsgi(f"import sys; print([m for m in {LAZY_MODULES!r} if m in sys.modules])")
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,111 @@
+# tests/test_job_queue.py
+
+import pytest
+from core import job_queue
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    q = job_queue.JobQueue(str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(job_queue, "_queue", q)
+    monkeypatch.setattr(job_queue, "log_action", lambda *a, **k: True)
+    monkeypatch.setitem(job_queue.JOB_HANDLERS, "echo", lambda **payload: payload)
+    return q
+
+def test_claims_by_priority_then_age(queue):
+    low = queue.enqueue("echo", {"n": 1}, priority=job_queue.PRIORITY_LOW)
+    first = queue.enqueue("echo", {"n": 2})
+    urgent = queue.enqueue("echo", {"n": 3}, priority=job_queue.PRIORITY_HIGH)
+    second = queue.enqueue("echo", {"n": 4})
+    order = [queue.claim("w")["id"] for _ in range(4)]
+    assert order == [urgent["id"], first["id"], second["id"], low["id"]]
+    assert queue.claim("w") is None
+
+def test_duplicate_active_jobs_are_merged(queue):
+    a = queue.enqueue("echo", {"x": 1})
+    b = queue.enqueue("echo", {"x": 1}, priority=job_queue.PRIORITY_HIGH)
+    assert a["id"] == b["id"] and b["priority"] == job_queue.PRIORITY_HIGH
+    assert queue.enqueue("echo", {"x": 1}, dedup=False)["id"] != a["id"]
+
+def test_work_once_records_result(queue):
+    job = job_queue.enqueue_job("echo", {"answer": 42})
+    assert job_queue.work_once("w") is True
+    done = job_queue.get_job(job["id"])
+    assert done["status"] == "succeeded" and done["result"] == {"answer": 42}
+    # finished jobs no longer block a fresh run of the same payload
+    assert job_queue.enqueue_job("echo", {"answer": 42})["id"] != job["id"]
+
+def test_failures_retry_until_max_attempts(queue, monkeypatch):
+    monkeypatch.setitem(job_queue.JOB_HANDLERS, "boom", lambda: 1 / 0)
+    job = queue.enqueue("boom", max_attempts=2)
+    job_queue.work_once("w")
+    assert queue.get(job["id"])["status"] == "queued"
+    job_queue.work_once("w")
+    failed = queue.get(job["id"])
+    assert failed["status"] == "failed" and "ZeroDivisionError" in failed["error"]
+
+def test_unknown_kind_and_cancel(queue):
+    with pytest.raises(ValueError):
+        queue.enqueue("nope")
+    job = queue.enqueue("echo", {"c": 1})
+    assert queue.cancel(job["id"]) is True
+    assert queue.claim("w") is None
+
+def test_stale_means_no_heartbeat_not_long_running(queue):
+    alive = queue.enqueue("echo", {"a": 1})
+    dead = queue.enqueue("echo", {"d": 1}, max_attempts=2)
+    queue.claim("w1")
+    queue.claim("w2")
+    db = queue._db()
+    db.execute("UPDATE jobs SET started_at = 0, heartbeat_at = ?", (job_queue.time.time() - 600,))
+    queue.heartbeat([alive["id"]])
+    assert queue.requeue_stale(older_than=60) == 1
+    assert queue.get(alive["id"])["status"] == "running"
+    assert queue.get(dead["id"])["status"] == "queued"
+
+def test_stale_jobs_fail_once_attempts_are_used_up(queue):
+    job = queue.enqueue("echo", {"oom": 1})
+    queue.claim("w1")
+    queue._db().execute("UPDATE jobs SET heartbeat_at = 0")
+    assert queue.requeue_stale(older_than=60) == 1
+    stale = queue.get(job["id"])
+    assert stale["status"] == "failed"
+    assert "no heartbeat" in stale["error"]
+    assert queue.claim("w2") is None
+
+def test_heartbeat_thread_beats_through_cpu_bound_work(queue, monkeypatch):
+    job = queue.enqueue("echo", {"cpu": 1})
+    queue.claim("w1")
+    queue._db().execute("UPDATE jobs SET heartbeat_at = 0")
+    monkeypatch.setattr(job_queue, "_running", {job["id"]})
+    stop = job_queue.threading.Event()
+    job_queue._start_native_thread(job_queue._heartbeat_forever, (queue.path, stop, 0.01))
+    deadline = job_queue.time.time() + 0.5
+    while job_queue.time.time() < deadline:  # never yields, like a refit
+        sum(range(1000))
+    stop.set()
+    assert queue.get(job["id"])["heartbeat_at"] > 0
+
+def test_existing_queue_gains_heartbeat_column(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "old.sqlite")
+    sqlite3.connect(path).execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT, payload TEXT, priority INTEGER, "
+                                  "status TEXT, dedup_key TEXT, result TEXT, error TEXT, attempts INTEGER DEFAULT 0, "
+                                  "max_attempts INTEGER DEFAULT 1, worker TEXT, created_at REAL, started_at REAL, "
+                                  "finished_at REAL)")
+    columns = {r["name"] for r in job_queue.JobQueue(path)._db().execute("PRAGMA table_info(jobs)")}
+    assert "heartbeat_at" in columns
+
+def test_jobs_route_rejects_bad_integers(queue, monkeypatch):
+    from flask import Flask
+    from routes import jobs
+    monkeypatch.setattr(jobs, "verify_token", lambda token: {"username": "t"})
+    monkeypatch.setattr(jobs, "log_action", lambda *a, **k: True)
+    app = Flask(__name__)
+    app.register_blueprint(jobs.jobs_bp)
+    client = app.test_client()
+    assert client.post("/jobs", json={"kind": "echo", "priority": "high"}).status_code == 400
+    assert client.get("/jobs?limit=lots").status_code == 400
+    assert client.post("/jobs", json={"kind": "echo", "priority": "5"}).status_code == 202
+    assert client.post("/jobs", json={"kind": "echo", "dedup": "false"}).status_code == 400
+    assert client.post("/jobs", json={"kind": "echo", "dedup": 0}).status_code == 400
+    assert client.post("/jobs", json={"kind": "echo", "dedup": False}).status_code == 202
@@ -0,0 +1,30 @@
+# tests/test_llm_clients.py
+
+import pytest
+from core import llm_clients
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    llm_clients.reset_clients()
+    yield
+    llm_clients.reset_clients()
+
+def test_clients_are_built_once_per_key():
+    built = []
+    factory = lambda: built.append(1) or object()
+    first = llm_clients._cached(("demo", "k1"), factory)
+    assert llm_clients._cached(("demo", "k1"), factory) is first
+    assert llm_clients._cached(("demo", "k2"), factory) is not first
+    assert len(built) == 2
+
+def test_openai_session_is_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    openai = llm_clients.get_openai()
+    session = openai.requestssession
+    assert llm_clients.get_openai().requestssession is session
+    assert openai.api_key == "test-key"
+
+def test_missing_key_raises(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        llm_clients.get_anthropic_client()
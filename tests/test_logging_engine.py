@@ -35,3 +35,51 @@ def test_log_to_neo4j():
 def test_get_recent_logs():
     logs = logging_engine.get_recent_logs(limit=2)
     assert isinstance(logs, list)
+
+def test_log_action_batches_through_sink(monkeypatch):
+    logging_engine.flush_logs()
+    batches = []
+    monkeypatch.setattr(logging_engine, "create_subgraph", lambda nodes, rels=None: batches.append(nodes) or {"status": "success"})
+    for i in range(5):
+        assert logging_engine.log_action("source", "type", f"msg {i}", metadata={"i": i}) is True
+    logging_engine.flush_logs()
+    written = [props for nodes in batches for _, props in nodes]
+    assert len(written) == 5
+    assert all(isinstance(props["metadata"], str) for props in written)
+
+class _BusyWorker:
+    def is_alive(self):
+        return True
+
+    def join(self, timeout=None):
+        pass
+
+def test_log_sink_drop_newest(monkeypatch):
+    monkeypatch.setitem(logging_engine.LOG_SINK_SETTINGS, "drop_policy", "drop_newest")
+    sink = logging_engine._GraphLogSink({**logging_engine.LOG_SINK_SETTINGS, "max_queue": 1})
+    sink._worker = _BusyWorker()  # keep the queue undrained
+    assert sink.submit({"id": "a"}) is True
+    assert sink.submit({"id": "b"}) is False
+    assert sink.stats["dropped"] == 1
+
+def test_flush_with_full_queue_keeps_single_worker(monkeypatch):
+    sink = logging_engine._GraphLogSink({**logging_engine.LOG_SINK_SETTINGS, "max_queue": 1, "drop_policy": "drop_newest"})
+    busy = _BusyWorker()
+    sink._worker = busy
+    sink.submit({"id": "a"})
+    sink.flush(timeout=0.01)
+    assert sink._worker is busy
+    sink.submit({"id": "b"})
+    assert sink._worker is busy
+
+def test_configure_keeps_queue_while_worker_is_running(monkeypatch):
+    sink = logging_engine._GraphLogSink({**logging_engine.LOG_SINK_SETTINGS, "max_queue": 2, "drop_policy": "drop_newest"})
+    monkeypatch.setattr(logging_engine, "_log_sink", sink)
+    monkeypatch.setattr(logging_engine, "LOG_SINK_SETTINGS", sink.settings)
+    busy = _BusyWorker()
+    sink._worker = busy
+    sink.submit({"id": "a"})
+    queue = sink._queue
+    logging_engine.configure_log_sink(max_queue=5)
+    assert sink._worker is busy and sink._queue is queue
+    assert sink._queue.qsize() == 2  # the record and the STOP the worker will reach
@@ -47,3 +47,49 @@ def test_summarize_node():
 def test_archive_node():
     ok = memory_engine.archive_node("node1")
     assert ok is True
+
+def test_store_events(monkeypatch):
+    import numpy as np
+    writes = []
+    monkeypatch.setattr(memory_engine, "embed_texts", lambda texts: np.zeros((len(texts), 3), dtype=np.float32))
+    monkeypatch.setattr(memory_engine, "create_subgraph", lambda nodes, rels=None: writes.append(nodes) or {"status": "success"})
+    out = memory_engine.store_events(["first", {"raw_text": "second", "agent_origin": "user1"}], agent_origin="importer")
+    assert [e["raw_text"] for e in out] == ["first", "second"]
+    assert out[0]["agent_origin"] == "importer" and out[1]["agent_origin"] == "user1"
+    assert len(writes) == 1 and len(writes[0]) == 2
+
+def test_store_event_packs_embedding(monkeypatch):
+    import numpy as np
+    from core.vector_ops import unpack_embedding
+    sent = {}
+    def fake_write(query, params=None):
+        sent.update(params["props"])
+        return {"status": "success", "result": [{"e": [["id", params["props"]["id"]], ["raw_text", "x"]]}]}
+    monkeypatch.setattr(memory_engine, "run_write_query", fake_write)
+    out = memory_engine.store_event("x")
+    assert isinstance(sent["embedding"], bytes)
+    assert np.allclose(unpack_embedding(sent["embedding"]), [0.1, 0.2, 0.3])
+    assert "embedding" not in out and out["raw_text"] == "x"
+
+def test_embedding_dtype_is_tagged_not_guessed(monkeypatch):
+    import numpy as np
+    from core import vector_ops
+    half_dim = np.linspace(-1, 1, vector_ops.EMBED_DIM // 2)
+    # 768 float32 values are as long as 1536 float16 ones; the tag keeps them apart
+    assert np.allclose(vector_ops.unpack_embedding(vector_ops.pack_embedding(half_dim, "float32")), half_dim)
+    full = vector_ops.unpack_embedding(vector_ops.pack_embedding(np.linspace(-1, 1, vector_ops.EMBED_DIM), "float16"))
+    assert full.shape == (vector_ops.EMBED_DIM,) and full.dtype == np.float32
+    legacy = np.asarray(half_dim, dtype="<f4").tobytes()
+    monkeypatch.setattr(vector_ops, "EMBEDDING_STORAGE", "float32")
+    assert np.allclose(vector_ops.unpack_embedding(legacy), half_dim)
+
+def test_store_dream_node_returns_empty_on_rollback(monkeypatch):
+    logged = []
+    def failing_write(query, params=None):
+        if "FUSED_INTO" in query:
+            raise RuntimeError("edge write failed")
+        return {"status": "success", "result": [{"d": [["id", "dream_x"]]}]}
+    monkeypatch.setattr(memory_engine, "run_write_query", failing_write)
+    monkeypatch.setattr(memory_engine, "log_action", lambda source, action, msg: logged.append(action))
+    assert memory_engine.store_dream_node(["n1"]) == {}
+    assert logged == ["store_dream_error"]
@@ -0,0 +1,59 @@
+# tests/test_pagination.py
+
+import pytest
+from werkzeug.datastructures import MultiDict
+from core import graph_io
+from routes.pagination import page_args
+
+NODES = [{"id": f"n{i:02d}", "timestamp": f"2024-01-01T00:00:{i // 2:02d}", "raw_text": f"t{i}",
+          "agent_origin": "a" if i % 2 else "b", "embedding": b"\x00" * 8} for i in range(25)]
+
+@pytest.fixture
+def queries(monkeypatch):
+    """In-memory stand-in for the paginate_nodes query: keyset, equality filters, projection."""
+    seen = []
+
+    def read(q, p=None):
+        seen.append((q, p))
+        rows = sorted(NODES, key=lambda n: (n["timestamp"], n["id"]), reverse=True)
+        if "cursor_ts" in p:
+            rows = [n for n in rows if (n["timestamp"], n["id"]) < (p["cursor_ts"], p["cursor_id"])]
+        if "filter_0" in p:
+            rows = [n for n in rows if n["agent_origin"] == p["filter_0"]]
+        keys = p.get("fields")
+        return {"status": "success", "result": [
+            {"timestamp": n["timestamp"], "id": n["id"],
+             "node": [[k, v] for k, v in n.items() if (k in keys if keys else k != "embedding")]}
+            for n in rows[:p["limit"]]
+        ]}
+
+    monkeypatch.setattr(graph_io, "run_read_query", read)
+    return seen
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    cursor = graph_io.encode_cursor("2024-01-01T00:00:00", "n1")
+    assert graph_io.decode_cursor(cursor) == ("2024-01-01T00:00:00", "n1")
+    with pytest.raises(ValueError):
+        graph_io.decode_cursor("not-a-cursor")
+
+def test_pages_cover_every_node_once(queries):
+    ids, cursor = [], None
+    while True:
+        page = graph_io.paginate_nodes("Event", limit=10, cursor=cursor)
+        ids += [n["id"] for n in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(ids) == 25 and len(set(ids)) == 25
+    assert all("embedding" not in n for n in page["items"])
+    assert "SKIP" not in queries[-1][0]
+
+def test_fields_and_filters_are_pushed_down(queries):
+    args = MultiDict({"fields": "id,raw_text", "agent_origin": "a", "limit": "5", "ignored": "x"})
+    page = graph_io.paginate_nodes("Event", **page_args(args, ("agent_origin",)))
+    query, params = queries[-1]
+    assert "n.agent_origin = $filter_0" in query and params["fields"] == ["id", "raw_text"]
+    assert all(set(n) == {"id", "raw_text"} for n in page["items"])
+    assert len(page["items"]) == 5 and page["next_cursor"]
+    with pytest.raises(ValueError):
+        graph_io.paginate_nodes("Event", fields=["embedding"])
@@ -7,7 +7,7 @@ from core import peer_review_engine
 def patch_core(monkeypatch):
     monkeypatch.setattr(peer_review_engine, "assign_task", lambda agent_id, task, ctx: {"response": "mock"})
     monkeypatch.setattr(peer_review_engine, "create_node", lambda label, props: {"id": "peer_review1"})
-    monkeypatch.setattr(peer_review_engine, "create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr(peer_review_engine, "create_subgraph", lambda *a, **k: {"status": "success", "result": []})
     monkeypatch.setattr(peer_review_engine, "run_read_query", lambda q, p=None: [{"id": "review1"}])
     monkeypatch.setattr(peer_review_engine, "log_action", lambda *a, **k: True)
 
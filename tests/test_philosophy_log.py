@@ -17,6 +17,9 @@ def patch_core(monkeypatch):
             }}
         ]
     })
+    monkeypatch.setattr("core.philosophy_log.stream_read_query", lambda q, p=None: iter([
+        {"p": {"timestamp": "2025-07-16T14:21:00", "type": "shift", "text": "I updated my worldview.", "actor": "Claude"}}
+    ]))
     monkeypatch.setattr("core.philosophy_log.log_action", lambda *a, **k: True)
 
 def test_log_philosophical_shift():
@@ -36,3 +39,7 @@ def test_export_philosophy_log():
     out = philosophy_log.export_philosophy_log()
     assert isinstance(out, str)
     assert "Claude" in out or len(out) == 0
+
+def test_get_philosophical_timeline_without_since_is_a_list():
+    out = philosophy_log.get_philosophical_timeline()
+    assert isinstance(out, list) and out[0]["p"]["actor"] == "Claude"
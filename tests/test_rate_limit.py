@@ -0,0 +1,56 @@
+# tests/test_rate_limit.py
+
+import pytest
+from core import rate_limit
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+    def __init__(self, retry_after="2"):
+        super().__init__("slow down")
+        self.headers = {"retry-after": retry_after}
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limit.time, "sleep", slept.append)
+    return slept
+
+def test_parse_reset_values():
+    assert rate_limit._seconds("1.5") == 1.5
+    assert rate_limit._seconds("20ms") == pytest.approx(0.02)
+    assert rate_limit._seconds("6m0s") == 360
+    assert rate_limit._seconds("soon") is None
+
+def test_bucket_spaces_calls_beyond_burst():
+    bucket = rate_limit.TokenBucket(rate=10, capacity=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+def test_throttled_call_retries_and_adapts(sleeps):
+    limiter = rate_limit.ProviderLimiter("test", rate=100)
+    attempts = []
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeRateLimitError()
+        return "ok"
+    assert limiter.call(flaky) == "ok"
+    assert limiter.metrics["retries"] == 2 and limiter.metrics["throttled"] == 2
+    assert limiter.bucket.rate < 100
+    assert max(sleeps) >= 2  # retry-after is respected
+
+def test_bad_request_is_not_retried(sleeps):
+    limiter = rate_limit.ProviderLimiter("test", rate=100)
+    with pytest.raises(ValueError):
+        limiter.call(lambda: (_ for _ in ()).throw(ValueError("bad prompt")))
+    assert limiter.metrics["calls"] == 1
+
+def test_circuit_opens_after_repeated_failures(sleeps):
+    limiter = rate_limit.ProviderLimiter("test", rate=100, max_retries=0)
+    limiter.breaker.threshold = 2
+    for _ in range(2):
+        with pytest.raises(FakeRateLimitError):
+            limiter.call(lambda: (_ for _ in ()).throw(FakeRateLimitError("0")))
+    with pytest.raises(rate_limit.CircuitOpenError):
+        limiter.call(lambda: "never")
+    assert limiter.snapshot()["circuit"] == "open"
@@ -0,0 +1,36 @@
+# tests/test_response_cache.py
+
+import time
+from core import response_cache, llm_tools
+
+def test_key_covers_every_input():
+    base = response_cache.response_key("claude", "m", "sys", "hi", 0)
+    assert base == response_cache.response_key("claude", "m", "sys", "hi", 0.0)
+    assert base != response_cache.response_key("claude", "m", "sys", "hi", 0.5)
+    assert base != response_cache.response_key("gpt", "m", "sys", "hi", 0)
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = response_cache.ResponseCache(ttl=0.05, max_entries=2, disk=False)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.put("c", "3")
+    assert cache.get("a") is None and cache.get("c") == "3"
+    time.sleep(0.06)
+    assert cache.get("c") is None
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    response_cache.ResponseCache(path=path).put("k", "answer")
+    second = response_cache.ResponseCache(path=path)
+    assert second.get("k") == "answer"
+    assert second.stats["disk_hits"] == 1
+
+def test_safe_prompt_caches_deterministic_calls(monkeypatch):
+    monkeypatch.setattr(response_cache, "_cache", response_cache.ResponseCache(disk=False))
+    calls = []
+    monkeypatch.setattr(llm_tools, "_prompt_claude", lambda p, s=None, t=0.7: calls.append(p) or f"reply {len(calls)}")
+    assert llm_tools.prompt_claude("same", temperature=0) == "reply 1"
+    assert llm_tools.prompt_claude("same", temperature=0) == "reply 1"
+    assert llm_tools.prompt_claude("same", temperature=0.7) == "reply 2"
+    assert llm_tools.prompt_claude("same", temperature=0.7, cache=True) == "reply 3"
+    assert llm_tools.prompt_claude("same", temperature=0.7, cache=True) == "reply 3"
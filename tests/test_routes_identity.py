@@ -0,0 +1,43 @@
+# tests/test_routes_identity.py
+
+import json
+import pytest
+from flask import Flask
+from routes import identity, schema
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr("routes.identity.verify_token", lambda t: {"username": "user"})
+    monkeypatch.setattr("routes.schema.verify_token", lambda t: {"username": "admin", "role": "admin"})
+    monkeypatch.setattr("routes.ndjson.log_action", lambda *a, **k: True)
+    app = Flask(__name__)
+    app.register_blueprint(identity.identity_bp)
+    app.register_blueprint(schema.schema_bp)
+    return app.test_client()
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_clusters_stream_one_line_per_record(client, monkeypatch):
+    def clusters():
+        for i in range(3):
+            yield {"cluster_id": f"c{i}", "members": []}
+
+    monkeypatch.setattr("routes.identity.stream_identity_clusters", clusters)
+    response = client.get("/identity/clusters")
+    assert response.mimetype == "application/x-ndjson"
+    assert [r["cluster_id"] for r in _lines(response)] == ["c0", "c1", "c2"]
+
+def test_stream_failure_ends_with_error_line(client, monkeypatch):
+    def timeline(since):
+        yield {"p": {"id": "p1"}}
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr("routes.identity.stream_philosophical_timeline", timeline)
+    assert client.get("/philosophy/timeline").status_code == 400
+    assert _lines(client.get("/philosophy/timeline?since=2020-01-01")) == [{"p": {"id": "p1"}}, {"error": "connection lost"}]
+
+def test_orphan_scan_streams_and_validates_label(client, monkeypatch):
+    monkeypatch.setattr("routes.schema.stream_orphan_nodes", lambda label: iter([{"id": "n1", "n": {}}]))
+    assert _lines(client.get("/schema/orphans/Event")) == [{"id": "n1", "n": {}}]
+    assert client.get("/schema/orphans/Event) DETACH DELETE (m").status_code == 400
@@ -6,7 +6,7 @@ from core import simulation_engine
 @pytest.fixture(autouse=True)
 def patch_core(monkeypatch):
     monkeypatch.setattr("core.simulation_engine.create_node", lambda label, props: {"id": "simnode"})
-    monkeypatch.setattr("core.simulation_engine.create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr("core.simulation_engine.create_subgraph", lambda *a, **k: True)
     monkeypatch.setattr("core.simulation_engine.summarize_sequence", lambda node_ids, title=None: {"summary": "test"})
     monkeypatch.setattr("core.simulation_engine.prompt_gpt", lambda prompt, **kwargs: "Simulated answer")
     monkeypatch.setattr("core.simulation_engine.run_read_query", lambda *a, **k: {
@@ -31,5 +31,4 @@ def test_log_simulation():
     assert isinstance(ok, bool)
 
 def test_get_event_summary():
-    summary = simulation_engine.get_event_summary("event1")
-    assert isinstance(summary, str)
+    assert simulation_engine.get_event_summary("event1") == "test"
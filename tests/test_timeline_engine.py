@@ -5,8 +5,7 @@ from core import timeline_engine
 
 @pytest.fixture(autouse=True)
 def patch_core(monkeypatch):
-    monkeypatch.setattr("core.timeline_engine.create_node", lambda label, props: {"id": "timeline1"})
-    monkeypatch.setattr("core.timeline_engine.create_relationship", lambda *a, **k: True)
+    monkeypatch.setattr("core.timeline_engine.create_subgraph", lambda *a, **k: True)
     monkeypatch.setattr("core.timeline_engine.embed_text", lambda text, model=None: [0.1, 0.2])
     monkeypatch.setattr("core.timeline_engine.log_action", lambda *a, **k: True)
     monkeypatch.setattr("core.timeline_engine.prompt_claude", lambda prompt, **kwargs: "Philosophy log")
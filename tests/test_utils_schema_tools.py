@@ -11,6 +11,7 @@ def patch_core(monkeypatch):
     monkeypatch.setattr("utils.schema_tools.run_write_query", lambda *a, **k: {
         "status": "success", "result": [{"migrated_count": 2}]
     })
+    monkeypatch.setattr("utils.schema_tools.stream_read_query", lambda *a, **k: iter([{"id": "n1", "n": {"id": "n1"}}]))
     monkeypatch.setattr("utils.schema_tools.log_action", lambda *a, **k: True)
 
 def test_list_node_labels():
@@ -30,3 +31,21 @@ def test_migrate_node_label():
     ok = schema_tools.migrate_node_label("Old", "New")
     assert isinstance(ok, bool)
     assert ok is True
+
+def test_bootstrap_schema():
+    out = schema_tools.bootstrap_schema(["Event", "Dream"])
+    assert out["status"] == "success"
+    assert out["applied"] == 4
+
+def test_backfill_relationship_timestamps_runs_in_batches(monkeypatch):
+    remaining = [5]
+
+    def write(q, p=None):
+        assert "r.timestamp IS NULL" in q and ":CONTRADICTS" in q
+        stamped = min(p["batch"], remaining[0])
+        remaining[0] -= stamped
+        return {"status": "success", "result": [{"stamped": stamped}]}
+
+    monkeypatch.setattr("utils.schema_tools.run_write_query", write)
+    assert schema_tools.backfill_relationship_timestamps(batch_size=2) == 5
+    assert remaining == [0]
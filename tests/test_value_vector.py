@@ -1,5 +1,6 @@
 # tests/test_value_vector.py
 
+import numpy as np
 import pytest
 from core import value_vector
 
@@ -39,3 +40,42 @@ def test_detect_value_drift():
 def test_apply_value_influence():
     ok = value_vector.apply_value_influence("agent1", "value1")
     assert isinstance(ok, bool) or ok is None
+
+def test_batch_drift_matches_pairwise_calls():
+    rng = np.random.default_rng(0)
+    reference = rng.random(len(value_vector.VALUE_KEYS))
+    agents = rng.random((50, len(value_vector.VALUE_KEYS)))
+    drift = value_vector.drift_from_reference(reference, agents)
+    assert drift.shape == (50,) and drift.dtype == np.float32
+    expected = [value_vector.detect_value_drift(reference, row) for row in agents]
+    assert np.allclose(drift, expected, atol=1e-6)
+    assert np.allclose(value_vector.pairwise_drift(agents, agents), 0, atol=1e-6)
+
+def test_compare_values_logs_only_on_request(monkeypatch):
+    calls = []
+    monkeypatch.setattr("core.value_vector.log_action", lambda *a, **k: calls.append(a))
+    a = {"empathy": 1.0}
+    assert value_vector.compare_values(a, a) == pytest.approx(1.0)
+    assert calls == []
+    value_vector.compare_values(a, a, log=True)
+    assert len(calls) == 1
+
+def test_scan_value_drift_writes_only_flagged(monkeypatch):
+    aligned = value_vector._to_vector(value_vector.default_value_profile).tolist()
+    skewed = [1.0] + [0.0] * (len(value_vector.VALUE_KEYS) - 1)
+    nodes = [{"eid": f"e{i}", "id": f"a{i:02d}", "value_vector": skewed if i % 5 == 0 else aligned,
+              "drifted": i == 3} for i in range(12)]
+    reads, writes = [], []
+
+    def stream(q, p=None, fetch_size=None):
+        reads.append((q, fetch_size))
+        return iter(nodes)
+
+    monkeypatch.setattr("core.value_vector.stream_read_query", stream)
+    monkeypatch.setattr("core.value_vector.run_write_query", lambda q, p=None: writes.append((q, p)))
+    report = value_vector.scan_value_drift(reference=np.array(aligned), page_size=5)
+
+    assert report["scanned"] == 12 and reads == [(reads[0][0], 5)] and "MATCH (n)\n" in reads[0][0]
+    assert [n["id"] for n in report["flagged"]] == ["a00", "a05", "a10"]
+    assert len(writes) == 1 and [r["eid"] for r in writes[0][1]["flagged"]] == ["e0", "e5", "e10"]
+    assert writes[0][1]["cleared"] == ["e3"] and report["cleared"] == 1
@@ -0,0 +1,90 @@
+# tests/test_vector_index.py
+
+import os
+import time
+import numpy as np
+from core import vector_index
+from core.vector_index import VectorIndex
+
+def _random_index(n=50, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    labels = ["Event" if i % 2 else "Dream" for i in range(n)]
+    index = VectorIndex(dim=dim)
+    index.add([f"n{i}" for i in range(n)], vectors, labels)
+    return index, vectors
+
+def test_search_returns_nearest_first():
+    index, vectors = _random_index()
+    hits = index.search(vectors[7], k=3)
+    assert hits[0]["id"] == "n7"
+    assert hits[0]["score"] >= hits[1]["score"] >= hits[2]["score"]
+
+def test_search_label_filter():
+    index, vectors = _random_index()
+    hits = index.search(vectors[7], k=5, labels=["Dream"])
+    assert hits and all(h["label"] == "Dream" for h in hits)
+
+def test_zero_vectors_are_skipped():
+    index = VectorIndex(dim=4)
+    index.add(["a", "b"], [[0, 0, 0, 0], [1, 0, 0, 0]], ["Event", "Event"])
+    assert len(index) == 1
+
+def test_trained_index_recall(monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_TRAIN", 64)
+    index, vectors = _random_index(n=400, dim=16)
+    assert index.centroids is not None
+    index.add(["late"], [vectors[3]], ["Event"])
+    ids = {h["id"] for h in index.search(vectors[3], k=2, nprobe=len(index.centroids))}
+    assert ids == {"n3", "late"}
+
+def test_save_load_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_TRAIN", 64)
+    index, vectors = _random_index(n=200, dim=16)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = VectorIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.search(vectors[11], k=3) == index.search(vectors[11], k=3)
+
+def _fresh_process(monkeypatch, path):
+    monkeypatch.setattr(vector_index, "INDEX_PATH", path)
+    monkeypatch.setattr(vector_index, "_index", None)
+    monkeypatch.setattr(vector_index, "_loaded_mtime", 0.0)
+    monkeypatch.setattr(vector_index, "_pending", {})
+    monkeypatch.setattr(vector_index, "_pending_adds", 0)
+    monkeypatch.setattr(vector_index, "_build_requested_at", 0.0)
+    queued = []
+    monkeypatch.setattr("core.job_queue.enqueue_job", lambda kind, payload: queued.append((kind, payload)))
+    return queued
+
+def test_missing_index_queues_build_instead_of_building(tmp_path, monkeypatch):
+    queued = _fresh_process(monkeypatch, str(tmp_path / "index.npz"))
+    monkeypatch.setattr(vector_index, "build_index_from_graph", lambda *a, **k: 1 / 0)
+    vector_index.index_node("mine", np.ones(1536), "Event")
+    assert vector_index.find_similar(np.ones(1536), k=1)[0]["id"] == "mine"
+    assert queued == [("build_vector_index", {"reason": "missing"})]
+    assert not (tmp_path / "index.npz").exists()
+
+def test_reload_on_newer_build_keeps_local_additions(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    _fresh_process(monkeypatch, path)
+    built = VectorIndex()
+    built.add(["old"], [np.eye(1536)[0]], ["Event"])
+    built.save(path)
+    vector_index.index_node("mine", np.eye(1536)[1], "Event")
+    rebuilt = VectorIndex()
+    rebuilt.add(["other_worker"], [np.eye(1536)[2]], ["Event"])
+    rebuilt.save(path)
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    index = vector_index.get_vector_index()
+    assert {"mine", "other_worker"} <= set(index.ids) and "old" not in index.ids
+    assert list(vector_index._pending) == ["mine"]
+
+def test_pending_additions_are_capped(tmp_path, monkeypatch):
+    _fresh_process(monkeypatch, str(tmp_path / "index.npz"))
+    monkeypatch.setattr(vector_index, "PENDING_MAX", 3)
+    for i in range(5):
+        vector_index.index_node(f"n{i}", np.eye(1536)[i], "Event")
+    assert list(vector_index._pending) == ["n2", "n3", "n4"]
+    assert len(vector_index.get_vector_index()) == 5
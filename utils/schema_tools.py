@@ -1,5 +1,10 @@
 # utils/schema_tools.py — Graph Schema Inspection & Migration
-from core.graph_io import run_read_query, run_write_query
+import logging
+from datetime import datetime
+
+from core.graph_io import (
+    INDEXED_RELATIONSHIPS, run_read_query, run_write_query, schema_statements, stream_read_query
+)
 from core.logging_engine import log_action
 
 LABEL_META_NODE = "SchemaMeta"
@@ -21,14 +26,18 @@ def list_relationship_types() -> list[str]:
     log_action("schema_tools", "list_rels", f"Found relationship types: {rels}")
     return rels
 
-def find_orphan_nodes(label: str) -> list[dict]:
-    """Find nodes of a given type that have no relationships."""
+def stream_orphan_nodes(label: str):
+    """Yield nodes of a given type that have no relationships, one at a time."""
     query = f"""
     MATCH (n:{label})
     WHERE NOT (n)--()
     RETURN n.id AS id, n
     """
-    results = run_read_query(query)
+    yield from stream_read_query(query)
+
+def find_orphan_nodes(label: str) -> list[dict]:
+    """Find nodes of a given type that have no relationships."""
+    results = list(stream_orphan_nodes(label))
     log_action("schema_tools", "find_orphans", f"Found {len(results)} orphan nodes of label {label}")
     return results
 
@@ -44,3 +53,44 @@ def migrate_node_label(old_label: str, new_label: str) -> bool:
     count = result["result"][0]["migrated_count"] if result["status"] == "success" else 0
     log_action("schema_tools", "migrate_label", f"Migrated {count} nodes from {old_label} to {new_label}")
     return result["status"] == "success"
+
+def backfill_relationship_timestamps(rel_types: list[str] = None, batch_size: int = 10000) -> int:
+    """
+    One-off migration: stamp INDEXED_RELATIONSHIPS edges created before graph_io stamped them,
+    in batches so no single transaction holds every edge. New edges never need it.
+    """
+    stamped = 0
+    stamp = datetime.utcnow().isoformat()
+    for rel_type in rel_types or INDEXED_RELATIONSHIPS:
+        while True:
+            result = run_write_query(f"""
+            MATCH ()-[r:{rel_type}]->()
+            WHERE r.timestamp IS NULL
+            WITH r LIMIT $batch
+            SET r.timestamp = $stamp
+            RETURN count(r) AS stamped
+            """, {"batch": batch_size, "stamp": stamp})
+            if result["status"] != "success":
+                break
+            count = result["result"][0]["stamped"] if result["result"] else 0
+            stamped += count
+            if count < batch_size:
+                break
+    log_action("schema_tools", "backfill_rel_timestamps", f"Stamped {stamped} relationships")
+    return stamped
+
+def bootstrap_schema(labels: list[str] = None) -> dict:
+    """Create id/timestamp constraints and indexes for every engine label (idempotent, run at startup)."""
+    applied, failed = 0, []
+    try:
+        for statement in schema_statements(labels):
+            result = run_write_query(statement)
+            if result["status"] == "success":
+                applied += 1
+            else:
+                failed.append(statement)
+    except Exception as e:
+        logging.error(f"Schema bootstrap failed: {e}")
+        return {"status": "error", "message": str(e)}
+    log_action("schema_tools", "bootstrap", f"Applied {applied} schema statements, {len(failed)} failed")
+    return {"status": "success" if not failed else "partial", "applied": applied, "failed": failed}
@@ -0,0 +1,15 @@
+# worker.py — Entry Point for the Background Job Worker Pool (Gevent)
+import gevent.monkey
+gevent.monkey.patch_all()
+
+import argparse
+
+from core.job_queue import run_worker, JOB_WORKER_CONCURRENCY, JOB_POLL_INTERVAL
+
+# Run alongside the web process: python worker.py --concurrency 4
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run queued dream/audit/imagination/simulation jobs.")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL)
+    args = parser.parse_args()
+    run_worker(concurrency=args.concurrency, poll_interval=args.poll_interval)